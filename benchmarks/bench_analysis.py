@@ -0,0 +1,56 @@
+"""
+how many saved games a minute batch analysis (see rotating_chess.analysis) gets through,
+with each number of workers.
+
+writes random games (see game.random_script) as saves into a temporary directory, then
+analyses all of them once per worker count, into a fresh output each time.
+
+    uv run python benchmarks/bench_analysis.py --games 16 --workers 1 2 4
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rotating_chess.analysis import analyse_directory
+from rotating_chess.game import Game, random_script
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--plies", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--angles", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saves = Path(tmp) / "saves"
+        saves.mkdir()
+        for seed in range(args.games):
+            game = Game()
+            for action in random_script(args.plies, random.Random(seed)):
+                if not game.apply(action):
+                    raise RuntimeError(f"illegal action {action}")
+            save = saves / f"rotchess_save_{seed}.txt"
+            save.write_text(game.nav.get_game_save())
+
+        for workers in args.workers:
+            output = Path(tmp) / f"analysis_{workers}.jsonl"
+            start = time.perf_counter()
+            analysed = analyse_directory(
+                saves, output, workers, args.chunksize, args.depth, args.angles
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{workers} workers: {analysed} games in {elapsed:.1f}s "
+                f"({60 * analysed / elapsed:,.1f} games/min)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+building and querying an archive of many games.
+
+games are synthetic (random pieces nudged, turned and captured from the normal board,
+without checking legality) since playing 100k real games would take far longer than
+archiving them. then times opening the archive and random access to games, metadata
+and single turns, against what the same access costs with one save file per game.
+
+    uv run python benchmarks/bench_archive.py --games 100000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rotating_chess.archive import Archive, ArchiveWriter
+from rotating_chess.game import Game
+from rotating_chess.history import encode_game_save, parse_game_save
+from rotating_chess.pieces import Board
+
+
+def synthetic_game(start: Board, rng: random.Random, max_turns: int) -> list[Board]:
+    boards = [start]
+    for _ in range(rng.randrange(max_turns)):
+        board = list(boards[-1])
+        i = rng.randrange(len(board))
+        state = board[i]
+        if rng.random() < 0.5:
+            board[i] = state._replace(angle=rng.uniform(-3.14, 3.14))
+        else:
+            board[i] = state._replace(
+                x=state.x + rng.choice([-50, 0, 50]), y=state.y + rng.choice([-50, 50])
+            )
+            if rng.random() < 0.2 and len(board) > 2:
+                del board[rng.choice([j for j in range(len(board)) if j != i])]
+        boards.append(tuple(board))
+    return boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--max-turns", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start_board = Game().nav.get_line_boards()[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "games.rca"
+        start = time.perf_counter()
+        turns = 0
+        with ArchiveWriter(path) as writer:
+            for i in range(args.games):
+                boards = synthetic_game(start_board, rng, args.max_turns)
+                turns += len(boards)
+                writer.add(boards, {"white": f"p{i % 997}", "black": f"p{i % 991}"})
+        built = time.perf_counter() - start
+        size = path.stat().st_size
+        print(
+            f"built {args.games:,} games ({turns:,} turns) in {built:.1f}s, "
+            f"{size / 2**20:,.1f}MiB ({size / turns:.0f} bytes/turn)"
+        )
+
+        start = time.perf_counter()
+        archive = Archive(path)
+        print(f"opened in {1e6 * (time.perf_counter() - start):.0f}µs")
+        games = [rng.randrange(len(archive)) for _ in range(args.queries)]
+        turns_of = [rng.randrange(archive.turns(g)) for g in games]
+
+        def each(f) -> float:
+            start = time.perf_counter()
+            for game, turn in zip(games, turns_of):
+                f(game, turn)
+            return 1e6 * (time.perf_counter() - start) / len(games)
+
+        print(f"turn count:   {each(lambda g, t: archive.turns(g)):7.1f}µs")
+        print(f"metadata:     {each(lambda g, t: archive.metadata(g)):7.1f}µs")
+        print(f"random turn:  {each(lambda g, t: archive.board(g, t)):7.1f}µs")
+        print(f"whole game:   {each(lambda g, t: archive.boards(g)):7.1f}µs")
+        start = time.perf_counter()
+        found = sum(archive.metadata(g)["white"] == "p1" for g in range(len(archive)))
+        print(
+            f"scanning every game's metadata: {time.perf_counter() - start:.2f}s "
+            f"({found} games by p1)"
+        )
+
+        # the same random turns with one save file per game
+        saves = Path(tmp) / "saves"
+        saves.mkdir()
+        games, turns_of = games[:200], turns_of[:200]
+        for game in set(games):
+            (saves / f"{game}.txt").write_text(encode_game_save(archive.boards(game)))
+        archive.close()
+        read = lambda g, t: parse_game_save((saves / f"{g}.txt").read_text())[t]
+        print(f"random turn, from a save file: {each(read):7.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
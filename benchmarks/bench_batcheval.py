@@ -0,0 +1,84 @@
+"""
+batch evaluation (see rotating_chess.batcheval) in boards per second, by batch size,
+vs engine.evaluate and counting Piece's movable points, one board at a time.
+
+boards come from random games (see game.random_script), cycled to fill each batch.
+packing them into arrays is timed apart from evaluating them, since a search could
+keep its boards packed.
+
+    uv run python benchmarks/bench_batcheval.py
+    uv run python benchmarks/bench_batcheval.py --sizes 1 100 10000 --games 50
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from rotating_chess import batcheval
+from rotating_chess.engine import Weights, evaluate
+from rotating_chess.game import Game, random_script
+from rotating_chess.pieces import Piece, Side
+
+
+def timed(f, at_least: float = 0.2) -> float:
+    """seconds per call of f, calling it for at least at_least seconds"""
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < at_least or calls == 0:
+        f()
+        calls += 1
+    return elapsed / calls
+
+
+def mobility(board) -> int:
+    """white's movable points less black's, one piece at a time"""
+    total = 0
+    for state in board:
+        piece = Piece.from_state(state, None, None)
+        piece.init()
+        points = len(set(piece.get_movable_points()))
+        total += points if state.side == Side.WHITE else -points
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000]
+    )
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=40)
+    args = parser.parse_args()
+
+    if not batcheval.HAVE_NUMPY:
+        sys.exit("batch evaluation needs numpy")
+
+    boards = []
+    for seed in range(args.games):
+        game = Game()
+        for action in random_script(args.plies, random.Random(seed)):
+            game.apply(action)
+        boards += game.nav.get_line_boards()
+    weights = Weights(mobility=0.05)
+
+    per_board = timed(lambda: [evaluate(board, Side.WHITE) for board in boards])
+    print(f"engine.evaluate (material only): {len(boards) / per_board:,.0f} boards/s")
+    per_board = timed(lambda: [mobility(board) for board in boards])
+    print(
+        f"Piece mobility, one board at a time: {len(boards) / per_board:,.0f} boards/s"
+    )
+    for size in args.sizes:
+        batch_boards = list(itertools.islice(itertools.cycle(boards), size))
+        packing = timed(lambda: batcheval.pack(batch_boards))
+        batch = batcheval.pack(batch_boards)
+        evaluating = timed(lambda: batcheval.evaluate(batch, weights, threat=0.1))
+        print(
+            f"batch of {size}: {size / evaluating:,.0f} boards/s evaluated "
+            f"(material, mobility, threats), {size / packing:,.0f} boards/s packed"
+        )
+
+
+if __name__ == "__main__":
+    main()
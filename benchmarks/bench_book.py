@@ -0,0 +1,81 @@
+"""
+building and probing an opening book (see rotating_chess.book), and what it saves the
+engine in the opening.
+
+plays random games (see game.random_script), builds a book of their first turns,
+then times probing every position in it, and the engine picking an opening move with
+and without the book.
+
+    uv run python benchmarks/bench_book.py --games 500 --turns 8
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rotating_chess.analysis import plies_of
+from rotating_chess.book import Book, build
+from rotating_chess.engine import Engine
+from rotating_chess.game import Game, random_script
+from rotating_chess.pieces import Side
+from rotating_chess.plies import start_board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--angles", type=int, default=4)
+    args = parser.parse_args()
+
+    games = []
+    for seed in range(args.games):
+        game = Game()
+        for action in random_script(args.turns, random.Random(seed)):
+            if not game.apply(action):
+                raise RuntimeError(f"illegal action {action}")
+        games.append(game.nav.get_line_boards())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.rcb"
+        start = time.perf_counter()
+        positions = build(games, path, args.turns)
+        elapsed = time.perf_counter() - start
+        print(
+            f"built {positions} positions from {args.games} games in {elapsed:.2f}s, "
+            f"{path.stat().st_size / 1024:,.0f}KiB"
+        )
+
+        with Book(path) as book:
+            boards = [
+                (line[start], side)
+                for line in games
+                for start, _, side in plies_of(line)
+                if start < args.turns
+            ]
+            start = time.perf_counter()
+            found = sum(bool(book.probe(board, side)) for board, side in boards)
+            elapsed = time.perf_counter() - start
+            print(
+                f"probed {len(boards)} positions ({found} in the book) "
+                f"in {elapsed:.3f}s ({1e6 * elapsed / len(boards):.1f}us each)"
+            )
+
+            for name, engine in [
+                ("search", Engine(angles=args.angles, max_depth=args.depth)),
+                ("book", Engine(angles=args.angles, max_depth=args.depth, book=book)),
+            ]:
+                start = time.perf_counter()
+                best = engine.best(start_board(), Side.WHITE)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{name}: opening move at depth {best.depth} "
+                    f"in {1e3 * elapsed:.1f}ms ({engine.nodes} nodes)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Pieces.canmove (the reference, one point at a time) vs the vectorized kernel
+(Pieces.canmove_many, see canmove.py) on random midgames: per piece, all its movable
+points at once, and whole-board legal move generation.
+
+    uv run python benchmarks/bench_canmove.py --games 20
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from rotating_chess import widgets
+from rotating_chess.canmove import HAVE_NUMPY
+from rotating_chess.game import Game, random_script
+
+
+def midgames(games: int, plies: int) -> list[Game]:
+    played = []
+    for seed in range(games):
+        game = Game()
+        for action in random_script(plies, random.Random(seed)):
+            game.apply(action)
+        played.append(game)
+    return played
+
+
+def per_piece(games: list[Game], repeat: int, vectorized: bool) -> tuple[float, int]:
+    """seconds to check every movable point of every piece, and how many points"""
+    elapsed = 0.0
+    points_checked = 0
+    for game in games:
+        for idx, piece in enumerate(game.pieces.pieces):
+            game.select(idx)
+            points = piece.get_movable_points()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                if vectorized:
+                    game.pieces.canmove_many(piece, points)
+                else:
+                    [game.pieces.canmove(piece, *point) for point in points]
+            elapsed += (time.perf_counter() - start) / repeat
+            points_checked += len(points)
+            game.deselect()
+    return elapsed, points_checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    if not HAVE_NUMPY:
+        print("numpy isn't installed; nothing to compare")
+        sys.exit(0)
+
+    games = midgames(args.games, args.plies)
+    reference, points = per_piece(games, args.repeat, vectorized=False)
+    vectorized, _ = per_piece(games, args.repeat, vectorized=True)
+    print(
+        f"    per piece: {1e6 * reference / points:.2f}us per point reference, "
+        f"{1e6 * vectorized / points:.2f}us vectorized ({reference / vectorized:.1f}x)"
+    )
+
+    timings = {}
+    for have_numpy in (False, True):
+        widgets.HAVE_NUMPY = have_numpy
+        start = time.perf_counter()
+        for game in games:
+            for _ in range(args.repeat):
+                # fresh centres each time, as after a move
+                game.pieces.rehash()
+                list(game.legal_moves())
+        timings[have_numpy] = (time.perf_counter() - start) / args.repeat / len(games)
+    print(
+        f"  legal moves: {1e3 * timings[False]:.2f}ms per board reference, "
+        f"{1e3 * timings[True]:.2f}ms vectorized ({timings[False] / timings[True]:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+peak memory of loading a big save file, whole vs streamed.
+
+writes a long synthetic game's save to a file, then loads it two ways under tracemalloc:
+reading and decoding the whole thing at once (how saves used to load), and streaming it
+through saveio.import_save_file. the boards themselves are the same either way (and
+mostly shared between turns), so the difference is all in the intermediate text.
+
+    uv run python benchmarks/bench_dropfile.py --turns 20000
+"""
+
+import argparse
+import math
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from rotating_chess.compressjson import json_decompress
+from rotating_chess.game import Game
+from rotating_chess.pieces import PieceState, Rotate, Side, share_board
+from rotating_chess.saveio import import_save_file
+
+
+def load_whole(path: Path) -> list:
+    boards = []
+    prev = ()
+    for move in json_decompress(path.read_text())["save"]:
+        prev = share_board(
+            (
+                PieceState(d["x"], d["y"], d["angle"], Side(d["side"]), d["piece_name"])
+                for d in move
+            ),
+            prev,
+        )
+        boards.append(prev)
+    return boards
+
+
+def load_streamed(path: Path) -> list:
+    task = import_save_file(path)
+    task.join()
+    assert task.succeeded(), task.error
+    return task.result
+
+
+def measure(name: str, load, path: Path) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    boards = load(path)
+    elapsed = time.perf_counter() - start
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:>8}: {len(boards)} turns in {elapsed:.2f}s, "
+        f"peak {peak / 2**20:,.1f}MiB (boards {kept / 2**20:,.1f}MiB)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    game = Game()
+    for _ in range(args.turns):
+        game.apply(Rotate(((rng.randrange(32), rng.uniform(-math.pi, math.pi)),)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "save.txt"
+        path.write_text(game.nav.get_game_save())
+        del game
+        print(f"save file: {path.stat().st_size / 2**20:,.1f}MiB")
+        measure("whole", load_whole, path)
+        measure("streamed", load_streamed, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+floating vs fixed point (settings.FIXED_POINT): how long canmove takes on every
+movable point of random midgames, how much of it the two disagree on, and how big
+the games' archive encodings are.
+
+    uv run python benchmarks/bench_fixed.py --games 20
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess import settings
+from rotating_chess.archive import encode_game
+from rotating_chess.game import Game, random_script
+
+
+def midgame(plies: int, seed: int) -> Game:
+    game = Game()
+    for action in random_script(plies, random.Random(seed)):
+        game.apply(action)
+    return game
+
+
+def canmove_all(game: Game, repeat: int) -> tuple[float, list[bool]]:
+    """seconds per canmove, and every result"""
+    results = []
+    elapsed = 0.0
+    for idx, piece in enumerate(game.pieces.pieces):
+        game.select(idx)
+        points = piece.get_movable_points()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            ok = [game.pieces.canmove(piece, *point) for point in points]
+        elapsed += time.perf_counter() - start
+        results += ok
+        game.deselect()
+    return elapsed / repeat / max(len(results), 1), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.FIXED_POINT = True
+    games = [midgame(args.plies, seed) for seed in range(args.games)]
+    for fixed_point in (False, True):
+        settings.FIXED_POINT = fixed_point
+        timings, results = [], []
+        for game in games:
+            per_call, ok = canmove_all(game, args.repeat)
+            timings.append(per_call)
+            results.append(ok)
+        if fixed_point:
+            disagree = sum(
+                a != b
+                for prev, now in zip(float_results, results)
+                for a, b in zip(prev, now)
+            )
+        else:
+            float_results = results
+            disagree = 0
+        turns = sum(len(game.nav) for game in games)
+        size = sum(len(encode_game(game.nav.get_line_boards())) for game in games)
+        print(
+            f"{'fixed' if fixed_point else 'float':>5}: "
+            f"canmove {1e6 * sum(timings) / len(timings):.1f}us, "
+            f"{disagree} of {sum(map(len, results))} disagree with float"
+        )
+    settings.FIXED_POINT = False
+    unsnapped = [
+        [
+            tuple(s._replace(x=s.x + 1e-9) for s in board)
+            for board in game.nav.get_line_boards()
+        ]
+        for game in games
+    ]
+    loose = sum(len(encode_game(boards)) for boards in unsnapped)
+    print(
+        f"archive: {size / turns:.1f} bytes per turn on the grid, "
+        f"{loose / turns:.1f} off it"
+    )
+
+
+if __name__ == "__main__":
+    main()
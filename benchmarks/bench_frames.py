@@ -0,0 +1,145 @@
+"""
+whole frames (event handling and drawing) of scripted scenarios, without a window
+(see headless.py) or the 60 fps cap, timed per phase: events, the board, each widget,
+and presenting.
+
+scenarios:
+    idle      the normal board, nothing happening
+    selected  the queen selected, nothing else happening (compare with idle: its points,
+              hit circles and guide lines are drawn once, then reused)
+    rotate    the queen selected, and the rotation selector dragged round and round
+    scrub     clicking back through a long game's history, then forward again
+    import    a long save file dropped on the window, until it's loaded
+    hints     the normal board, with hints on: a worker process searching the whole time
+              (compare with idle: frame times should stay flat)
+
+    uv run python benchmarks/bench_frames.py --frames 600
+    uv run python benchmarks/bench_frames.py --scenario rotate --frames 2000
+"""
+
+import argparse
+import math
+import random
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+from pygame.event import Event
+
+from bench_archive import synthetic_game
+from rotating_chess import headless
+from rotating_chess.game import random_script
+from rotating_chess.gamestate import GameState
+from rotating_chess.history import encode_game_save
+from rotating_chess.widgets import MOUSE_HELD
+
+# a frame's input: events, and where the mouse is
+Frame = tuple[list[Event], tuple[int, int]]
+
+
+def click(x: int, y: int) -> list[Event]:
+    return [
+        Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1),
+        Event(pygame.MOUSEBUTTONUP, pos=(x, y), button=1),
+    ]
+
+
+def idle(gs: GameState, frames: int) -> Iterator[Frame]:
+    for _ in range(frames):
+        yield [], (300, 200)
+
+
+def selected(gs: GameState, frames: int) -> Iterator[Frame]:
+    # select the queen, d1
+    yield click(175, 375), (175, 375)
+    for _ in range(frames - 1):
+        yield [], (300, 200)
+
+
+def rotate(gs: GameState, frames: int) -> Iterator[Frame]:
+    # select the queen, d1
+    yield click(175, 375), (175, 375)
+    # grab the rotation selector (movesel), then drag it around
+    center_x, center_y = 500, 200
+    x, y = center_x, center_y - 60
+    yield [Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1)], (x, y)
+    for frame in range(frames - 3):
+        angle = 2 * math.pi * frame / 240
+        x = round(center_x + 60 * math.sin(angle))
+        y = round(center_y - 60 * math.cos(angle))
+        yield [Event(MOUSE_HELD)], (x, y)
+    yield [Event(pygame.MOUSEBUTTONUP, pos=(x, y), button=1)], (x, y)
+
+
+def scrub(gs: GameState, frames: int, plies: int) -> Iterator[Frame]:
+    for action in random_script(plies, random.Random(0)):
+        gs.game.apply(action)
+    gs.nav.update_state(gs)
+    prev = gs.widgets.nav_prev_btn.get_rect().center
+    next = gs.widgets.nav_next_btn.get_rect().center
+    for frame in range(frames):
+        # back to the start, then forward to the end, and again
+        x, y = prev if frame // len(gs.nav) % 2 == 0 else next
+        yield click(x, y), (x, y)
+
+
+def hints(gs: GameState, frames: int) -> Iterator[Frame]:
+    yield [Event(pygame.KEYDOWN, key=pygame.K_h)], (300, 200)
+    for _ in range(frames - 1):
+        yield [], (300, 200)
+
+
+def drop_save(gs: GameState, frames: int, path: Path) -> Iterator[Frame]:
+    yield [Event(pygame.DROPFILE, file=str(path))], (300, 200)
+    for _ in range(frames - 1):
+        task = gs.widgets.imp_save.task
+        if task is not None and task.done and len(gs.nav) > 1:
+            return
+        yield [], (300, 200)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenario",
+        choices=["idle", "selected", "rotate", "scrub", "import", "hints", "all"],
+        default="all",
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--plies", type=int, default=100, help="of the game to scrub")
+    parser.add_argument(
+        "--turns", type=int, default=20_000, help="of the save to import"
+    )
+    args = parser.parse_args()
+
+    screen = headless.init()
+    with tempfile.TemporaryDirectory() as tmp:
+        save = Path(tmp) / "save.txt"
+        scenarios = {
+            "idle": lambda gs: idle(gs, args.frames),
+            "selected": lambda gs: selected(gs, args.frames),
+            "rotate": lambda gs: rotate(gs, args.frames),
+            "scrub": lambda gs: scrub(gs, args.frames, args.plies),
+            "import": lambda gs: drop_save(gs, 100 * args.frames, save),
+            "hints": lambda gs: hints(gs, args.frames),
+        }
+        for name, scenario in scenarios.items():
+            if args.scenario not in ("all", name):
+                continue
+            gs = headless.game_state()
+            if name == "import":
+                rng = random.Random(0)
+                boards = synthetic_game(gs.nav.get_curr_board(), rng, 2 * args.turns)
+                save.write_text(encode_game_save(boards))
+            timer = headless.FrameTimer()
+            for events, (x, y) in scenario(gs):
+                headless.run_frame(screen, gs, events, x, y, timer)
+            gs.widgets.hint.close()
+            print(f"{name}: {timer.report()}")
+            if name == "import":
+                print(f"  loaded {len(gs.nav)} turns")
+
+
+if __name__ == "__main__":
+    main()
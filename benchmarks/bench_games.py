@@ -0,0 +1,49 @@
+"""
+how many isolated headless games one core can host.
+
+creates many Games side by side, then plays the same random (legal) game in all
+of them round-robin, validating every move, like a worker serving lots of concurrent
+games would.
+
+    uv run python benchmarks/bench_games.py --games 1000 --plies 40
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess.game import Game, random_script
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    script = random_script(args.plies, random.Random(args.seed))
+
+    start = time.perf_counter()
+    games = [Game() for _ in range(args.games)]
+    created = time.perf_counter() - start
+    print(
+        f"created {args.games} games in {created:.3f}s "
+        f"({args.games / created:,.0f} games/s)"
+    )
+
+    start = time.perf_counter()
+    for action in script:
+        for game in games:
+            if not game.apply(action):
+                raise RuntimeError(f"illegal action {action}")
+    played = time.perf_counter() - start
+    actions = len(script) * args.games
+    print(
+        f"applied {actions} actions ({len(script)} per game) in {played:.3f}s: "
+        f"{actions / played:,.0f} actions/s, {args.games / played:,.1f} games/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
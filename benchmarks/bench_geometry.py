@@ -0,0 +1,105 @@
+"""
+how the rules, point generation and history scale with the board's size (see
+rotating_chess.geometry): for each size, square boards of that many files and ranks,
+random games (see game.random_script) from the normal board, then
+    points    building every piece (Piece.init) and its movable points
+    canmove   every legal move of a board: Pieces.canmove one point at a time, and
+              vectorized (canmove.py) if numpy's installed
+    history   encoding and parsing the games' saves, per turn
+the normal board has 4 pieces per file, so bigger boards have more pieces, each with
+more points (rays run until they leave the board).
+
+    uv run python benchmarks/bench_geometry.py
+    uv run python benchmarks/bench_geometry.py --sizes 8 16 24 --games 5
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess import widgets
+from rotating_chess.canmove import HAVE_NUMPY
+from rotating_chess.game import Game, random_script
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.history import encode_game_save, parse_game_save
+from rotating_chess.pieces import Piece
+from rotating_chess.plies import board_geometry
+
+
+def timed(f, at_least: float = 0.2) -> float:
+    """seconds per call of f, calling it for at least at_least seconds"""
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < at_least or calls == 0:
+        f()
+        calls += 1
+    return elapsed / calls
+
+
+def movable_points(board) -> int:
+    total = 0
+    for state in board:
+        piece = Piece.from_state(state, None, None)
+        piece.init()
+        total += len(piece.get_movable_points())
+    return total
+
+
+def legal_moves(games: list[Game], vectorized: bool) -> None:
+    widgets.HAVE_NUMPY = vectorized
+    try:
+        for game in games:
+            # fresh centres each time, as after a move
+            game.pieces.rehash()
+            list(game.legal_moves())
+    finally:
+        widgets.HAVE_NUMPY = HAVE_NUMPY
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 24])
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--plies", type=int, default=40)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with board_geometry(BoardGeometry(size, size)):
+            games = []
+            for seed in range(args.games):
+                game = Game()
+                for action in random_script(args.plies, random.Random(seed)):
+                    game.apply(action)
+                games.append(game)
+            boards = [game.nav.get_curr_board() for game in games]
+            pieces = sum(map(len, boards))
+            print(f"{size}x{size}: {pieces / len(boards):.0f} pieces a board")
+
+            points = sum(map(movable_points, boards))
+            elapsed = timed(lambda: [movable_points(board) for board in boards])
+            print(
+                f"  points: {points / pieces:.1f} a piece, "
+                f"{1e6 * elapsed / pieces:.1f}us a piece"
+            )
+
+            elapsed = timed(lambda: legal_moves(games, vectorized=False))
+            line = f"  canmove: {1e3 * elapsed / len(games):.2f}ms a board"
+            if HAVE_NUMPY:
+                vectorized = timed(lambda: legal_moves(games, vectorized=True))
+                line += f", {1e3 * vectorized / len(games):.2f}ms vectorized"
+            print(line)
+
+            lines = [game.nav.get_line_boards() for game in games]
+            turns = sum(map(len, lines))
+            saves = [encode_game_save(line) for line in lines]
+            encoding = timed(lambda: [encode_game_save(line) for line in lines])
+            parsing = timed(lambda: [parse_game_save(save) for save in saves])
+            print(
+                f"  history: {sum(map(len, saves)) / turns:.0f} characters a turn, "
+                f"{1e3 * encoding / turns:.3f}ms a turn encoded, "
+                f"{1e3 * parsing / turns:.3f}ms parsed"
+            )
+
+
+if __name__ == "__main__":
+    main()
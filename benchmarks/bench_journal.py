@@ -0,0 +1,77 @@
+"""
+what autosaving costs per turn, as the game gets longer.
+
+plays rotations (the cheapest turns there are) into games of growing length and times
+the next --turns turns three ways: with no autosave, with the journal, and with a full
+save written after every turn (the naive way to autosave).
+the journal's cost should stay flat (but for a compaction every compact_every turns);
+the full save's grows with the game.
+
+    uv run python benchmarks/bench_journal.py --lengths 100 1000 5000
+"""
+
+import argparse
+import math
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rotating_chess.game import Game
+from rotating_chess.journal import Journal, write_atomic
+from rotating_chess.pieces import Rotate
+
+
+def rotations(n: int, rng: random.Random) -> list[Rotate]:
+    return [
+        Rotate(((rng.randrange(32), rng.uniform(-math.pi, math.pi)),)) for _ in range(n)
+    ]
+
+
+def timed(game: Game, actions: list[Rotate]) -> float:
+    """seconds per turn to apply actions"""
+    start = time.perf_counter()
+    for action in actions:
+        game.apply(action)
+    return (time.perf_counter() - start) / len(actions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'length':>8} {'no autosave':>12} {'journal':>12} {'full save':>12}  (per turn)"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for length in args.lengths:
+            prefix = rotations(length, rng)
+            tail = rotations(args.turns, rng)
+            results = []
+            for mode in ("none", "journal", "full"):
+                game = Game()
+                for action in prefix:
+                    game.apply(action)
+                journal = None
+                if mode == "journal":
+                    journal = Journal(game, Path(tmp), name=f"bench{length}")
+                    journal.start()
+                elif mode == "full":
+                    path = Path(tmp) / f"full{length}.txt"
+                    game.nav.subscribe(
+                        lambda _, game=game, path=path: write_atomic(
+                            path, game.nav.get_game_save()
+                        )
+                    )
+                results.append(timed(game, tail))
+                if journal is not None:
+                    journal.close()
+            print(f"{length:>8} " + " ".join(f"{1e6 * r:>10,.0f}µs" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+parsing and encoding single boards in notation (see rotating_chess.notation), in
+boards per second, vs a one-board game save (history.encode_game_save) for the same.
+
+boards come from random games (see game.random_script), snapped to the fixed-point
+grids so they round trip.
+
+    uv run python benchmarks/bench_notation.py
+    uv run python benchmarks/bench_notation.py --games 50 --plies 80
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess import fixed
+from rotating_chess.game import Game, random_script
+from rotating_chess.history import encode_game_save, parse_game_save
+from rotating_chess.notation import encode_position, parse_position
+
+
+def timed(f, at_least: float = 0.2) -> float:
+    """seconds per call of f, calling it for at least at_least seconds"""
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < at_least or calls == 0:
+        f()
+        calls += 1
+    return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=40)
+    args = parser.parse_args()
+
+    boards = []
+    for seed in range(args.games):
+        game = Game()
+        for action in random_script(args.plies, random.Random(seed)):
+            game.apply(action)
+        boards += [
+            tuple(fixed.snap_state(state) for state in board)
+            for board in game.nav.get_line_boards()
+        ]
+
+    positions = [encode_position(board) for board in boards]
+    saves = [encode_game_save([board]) for board in boards]
+    assert [parse_position(text) for text in positions] == boards
+    size = sum(map(len, positions)) / len(boards)
+    print(f"notation: {size:.0f} characters a board")
+    per_board = timed(lambda: [encode_position(board) for board in boards])
+    print(f"  encode: {len(boards) / per_board:,.0f} boards/s")
+    per_board = timed(lambda: [parse_position(text) for text in positions])
+    print(f"  parse: {len(boards) / per_board:,.0f} boards/s")
+
+    size = sum(map(len, saves)) / len(boards)
+    print(f"one-board game save: {size:.0f} characters a board")
+    per_board = timed(lambda: [encode_game_save([board]) for board in boards])
+    print(f"  encode: {len(boards) / per_board:,.0f} boards/s")
+    per_board = timed(lambda: [parse_game_save(save) for save in saves])
+    print(f"  parse: {len(boards) / per_board:,.0f} boards/s")
+
+
+if __name__ == "__main__":
+    main()
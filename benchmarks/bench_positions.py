@@ -0,0 +1,64 @@
+"""
+ingesting and searching a position index of millions of turns.
+
+ingests synthetic games (see bench_archive.py) into a fresh index, then looks up
+positions that are in it, exactly and nearly, and positions that aren't.
+
+    uv run python benchmarks/bench_positions.py --games 70000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from bench_archive import synthetic_game
+from rotating_chess.game import Game
+from rotating_chess.positions import PositionIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=70_000)
+    parser.add_argument("--max-turns", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start_board = Game().nav.get_line_boards()[0]
+    games = [
+        (f"g{i}", synthetic_game(start_board, rng, args.max_turns))
+        for i in range(args.games)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "positions.db"
+        index = PositionIndex(path)
+        start = time.perf_counter()
+        turns = index.ingest(games)
+        elapsed = time.perf_counter() - start
+        print(
+            f"ingested {turns:,} turns in {elapsed:.1f}s ({turns / elapsed:,.0f} turns/s), "
+            f"{path.stat().st_size / 2**20:,.0f}MiB"
+        )
+
+        samples = [rng.choice(rng.choice(games)[1]) for _ in range(args.queries)]
+        missing = [tuple(s._replace(x=s.x + 1000) for s in board) for board in samples]
+        for name, boards, near in (
+            ("exact", samples, False),
+            ("near", samples, True),
+            ("absent", missing, False),
+        ):
+            start = time.perf_counter()
+            found = sum(len(index.find(board, near=near)) for board in boards)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>6}: {1e3 * elapsed / len(boards):.2f}ms per lookup "
+                f"({found / len(boards):.1f} turns found on average)"
+            )
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+how long exporting and importing a long game's save holds up the frame loop.
+
+times, on the calling ("frame") thread, a synchronous get_game_save / load_game_save
+against handing the same work to saveio's worker thread, and while the worker runs,
+how late a simulated 60fps frame loop gets.
+
+    uv run python benchmarks/bench_saveio.py --turns 5000
+"""
+
+import argparse
+import math
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rotating_chess.game import Game
+from rotating_chess.pieces import Rotate
+from rotating_chess.saveio import SaveTask, export_save, import_save
+
+FRAME = 1 / 60
+
+
+def frames_until_done(task: SaveTask) -> tuple[int, float]:
+    """runs empty 60fps frames until task is done. returns (frames, worst frame time)"""
+    frames, worst = 0, 0.0
+    while not task.done:
+        start = time.perf_counter()
+        time.sleep(FRAME)
+        worst = max(worst, time.perf_counter() - start)
+        frames += 1
+    return frames, worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    game = Game()
+    for _ in range(args.turns):
+        game.apply(Rotate(((rng.randrange(32), rng.uniform(-math.pi, math.pi)),)))
+
+    start = time.perf_counter()
+    save = game.nav.get_game_save()
+    print(f"sync export: frame blocked {1e3 * (time.perf_counter() - start):.1f}ms")
+    start = time.perf_counter()
+    if not game.load_game_save(save):
+        raise RuntimeError("the exported save doesn't load")
+    print(f"sync import: frame blocked {1e3 * (time.perf_counter() - start):.1f}ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        task = export_save(game.nav.get_line_boards(), Path(tmp) / "save.txt")
+        blocked = time.perf_counter() - start
+        frames, worst = frames_until_done(task)
+        print(
+            f"threaded export: frame blocked {1e3 * blocked:.1f}ms, "
+            f"done in {frames} frames, worst frame {1e3 * worst:.1f}ms"
+        )
+
+    start = time.perf_counter()
+    task = import_save(lambda: save)
+    blocked = time.perf_counter() - start
+    frames, worst = frames_until_done(task)
+    start = time.perf_counter()
+    game.nav.load_boards(task.result)
+    game.sync()
+    swap = time.perf_counter() - start
+    print(
+        f"threaded import: frame blocked {1e3 * blocked:.1f}ms + {1e3 * swap:.1f}ms swap, "
+        f"done in {frames} frames, worst frame {1e3 * worst:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
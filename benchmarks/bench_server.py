@@ -0,0 +1,96 @@
+"""
+load test for rotating_chess.server with in-process fake clients.
+
+starts a server on localhost, then plays many games at once, each between two
+GameClients over real sockets. every action is validated by the server and has to
+reach the opponent before the next one is played, so this measures round trips too.
+
+    uv run python benchmarks/bench_server.py --games 300 --plies 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from rotating_chess.client import GameClient
+from rotating_chess.game import Game, random_script
+from rotating_chess.pieces import Side, Move, Action
+from rotating_chess.server import GameServer
+
+
+async def play(
+    port: int, game_id: str, script: list[Action], latencies: list[float]
+) -> None:
+    games = {Side.WHITE: Game(), Side.BLACK: Game()}
+    clients = {}
+    for side, game in games.items():
+        clients[side] = await GameClient.connect("127.0.0.1", port)
+        await clients[side].join(game, game_id, side)
+
+    side = Side.BLACK
+    for action in script:
+        if isinstance(action, Move):
+            side = Side.WHITE if side == Side.BLACK else Side.BLACK
+        other = Side.WHITE if side == Side.BLACK else Side.BLACK
+
+        start = time.perf_counter()
+        if not games[side].apply(action):
+            raise RuntimeError(f"illegal action {action}")
+        while len(games[other].nav) < len(games[side].nav):
+            await clients[other].wait()
+        clients[side].poll()
+        latencies.append(time.perf_counter() - start)
+
+    assert (
+        games[Side.WHITE].nav.get_curr_board() == games[Side.BLACK].nav.get_curr_board()
+    )
+    for client in clients.values():
+        await client.close()
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    scripts = [random_script(args.plies, rng) for _ in range(args.scripts)]
+
+    server = GameServer()
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            play(port, f"game{i}", scripts[i % len(scripts)], latencies)
+            for i in range(args.games)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    listener.close()
+
+    latencies.sort()
+    print(
+        f"{args.games} concurrent games, {len(latencies)} actions in {elapsed:.2f}s: "
+        f"{len(latencies) / elapsed:,.0f} actions/s"
+    )
+    print(
+        f"round trip: median {statistics.median(latencies) * 1000:.1f}ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--plies", type=int, default=20)
+    parser.add_argument(
+        "--scripts", type=int, default=10, help="distinct random games to play"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
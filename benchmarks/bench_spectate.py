@@ -0,0 +1,97 @@
+"""
+load test for spectate.SpectatorChannel with thousands of in-process subscribers.
+
+one game is played at a fixed tick rate while subscribers consume its batches.
+most subscribers keep up; some are slow (they read one message every few ticks)
+and some are stalled (they never read). the game loop must not care.
+
+    uv run python benchmarks/bench_spectate.py --subscribers 5000 --ticks 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from rotating_chess.game import Game, random_script
+from rotating_chess.spectate import SpectatorChannel, Subscriber
+
+
+async def consume(sub: Subscriber, every: int, tick: float, stop: asyncio.Event) -> int:
+    """reads one message every `every` ticks (or as fast as possible if 0). returns bytes read."""
+    read = 0
+    while not stop.is_set():
+        if every:
+            await asyncio.sleep(every * tick)
+            data = sub.get_nowait()
+            read += 0 if data is None else len(data)
+        else:
+            read += len(await sub.get())
+    return read
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    script = random_script(args.ticks, rng)
+    game = Game()
+    channel = SpectatorChannel(game.nav, max_queue=args.max_queue)
+
+    stop = asyncio.Event()
+    consumers = []
+    for i in range(args.subscribers):
+        roll = rng.random()
+        every = (
+            0
+            if roll > args.slow + args.stalled
+            else 5 if roll > args.stalled else 10**9
+        )
+        consumers.append(
+            asyncio.create_task(consume(channel.subscribe(), every, args.tick, stop))
+        )
+
+    flush_times = []
+    loop_times = []
+    for action in script:
+        start = time.perf_counter()
+        if not game.apply(action):
+            raise RuntimeError(f"illegal action {action}")
+        flush_start = time.perf_counter()
+        channel.flush()
+        end = time.perf_counter()
+        flush_times.append(end - flush_start)
+        loop_times.append(end - start)
+        await asyncio.sleep(args.tick)
+
+    depths = channel.depths()
+    stop.set()
+    for c in consumers:
+        c.cancel()
+
+    print(
+        f"{args.subscribers} subscribers, {len(script)} turns: flush median "
+        f"{statistics.median(flush_times) * 1000:.2f}ms, max {max(flush_times) * 1000:.2f}ms "
+        f"({statistics.median(flush_times) / args.subscribers * 1e6:.2f}us/subscriber)"
+    )
+    print(f"game loop per turn (apply + flush): max {max(loop_times) * 1000:.2f}ms")
+    print(
+        f"queues: {depths['queued']} queued, max depth {depths['max_depth']}, "
+        f"mean {depths['mean_depth']:.2f}, {depths['resyncs']} resyncs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=100, help="plies to play")
+    parser.add_argument("--tick", type=float, default=0.01, help="seconds per turn")
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--slow", type=float, default=0.1)
+    parser.add_argument("--stalled", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
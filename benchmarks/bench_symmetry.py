@@ -0,0 +1,56 @@
+"""
+canonical keys (see symmetry.py): what they cost per node and how much they shrink
+a table of positions.
+
+plays random games, and each again mirrored, flipped and both, as a table (e.g. an
+opening book) fed with games from both sides of the board would see them. then
+counts the table's entries keyed by zobrist hash and by canonical key, and times
+each.
+
+    uv run python benchmarks/bench_symmetry.py --games 50
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess import zobrist
+from rotating_chess.game import Game, random_script
+from rotating_chess.symmetry import Symmetry, canonical_key, symmetric_hashes, transform
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--plies", type=int, default=40)
+    args = parser.parse_args()
+
+    boards = []
+    for seed in range(args.games):
+        game = Game()
+        for action in random_script(args.plies, random.Random(seed)):
+            game.apply(action)
+        boards += game.nav.get_line_boards()
+    table = [transform(board, s) for board in boards for s in Symmetry]
+
+    for name, key in (
+        ("zobrist", zobrist.board_hash),
+        ("canonical", canonical_key),
+        ("mirror only", lambda board: canonical_key(board, flip=False)),
+    ):
+        zobrist.piece_hash.cache_clear()
+        symmetric_hashes.cache_clear()
+        start = time.perf_counter()
+        keys = [key(board) for board in table]
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        keys = [key(board) for board in table]
+        warm = time.perf_counter() - start
+        print(
+            f"{name:>11}: {len(set(keys)):6,} entries for {len(table):,} positions, "
+            f"{1e6 * cold / len(table):5.1f}us per key cold, {1e6 * warm / len(table):5.1f}us warm"
+        )
+
+
+if __name__ == "__main__":
+    main()
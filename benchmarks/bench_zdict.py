@@ -0,0 +1,78 @@
+"""
+how much the preset dictionary shrinks saves, and what it costs in speed.
+
+encodes and decodes games of several lengths, from the normal board and from chess960,
+as save version 1.0.0 (plain zlib) and as the current version (zlib with a preset
+dictionary). the games are random, seeded differently from the dictionary's training.
+
+    uv run python benchmarks/bench_zdict.py --games 20
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess.game import Game
+from rotating_chess.history import SAVE_VERSION, encode_game_save, parse_game_save
+
+
+def play(plies: int, chess960: bool, rng: random.Random) -> list:
+    game = Game()
+    if chess960:
+        game.pieces.load_chess_960(None, None)
+        game.nav.load_boards([tuple(p.to_state() for p in game.pieces.pieces)])
+        game.sync()
+    for _ in range(plies):
+        move = game.random_move(rng)
+        if move is None:
+            break
+        game.apply(move)
+    return game.nav.get_line_boards()
+
+
+def timed(f, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, nargs="+", default=[0, 2, 10, 40])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    print(
+        f"{'board':>8} {'plies':>5} {'1.0.0 chars':>12} {SAVE_VERSION + ' chars':>12} "
+        f"{'ratio':>6} {'encode':>16} {'decode':>16}"
+    )
+    for chess960 in (False, True):
+        for plies in args.plies:
+            games = [play(plies, chess960, rng) for _ in range(args.games)]
+            sizes, encodes, decodes = {}, {}, {}
+            for version in ("1.0.0", SAVE_VERSION):
+                saves = [encode_game_save(b, save_version=version) for b in games]
+                sizes[version] = sum(map(len, saves)) / len(saves)
+                encodes[version] = timed(
+                    lambda: [encode_game_save(b, save_version=version) for b in games],
+                    args.repeat,
+                ) / len(games)
+                decodes[version] = timed(
+                    lambda: [parse_game_save(s) for s in saves], args.repeat
+                ) / len(games)
+            print(
+                f"{'960' if chess960 else 'normal':>8} {plies:>5} "
+                f"{sizes['1.0.0']:>12,.0f} {sizes[SAVE_VERSION]:>12,.0f} "
+                f"{sizes['1.0.0'] / sizes[SAVE_VERSION]:>5.2f}x "
+                f"{1e6 * encodes['1.0.0']:>6,.0f}/{1e6 * encodes[SAVE_VERSION]:<6,.0f}µs "
+                f"{1e6 * decodes['1.0.0']:>6,.0f}/{1e6 * decodes[SAVE_VERSION]:<6,.0f}µs"
+            )
+
+
+if __name__ == "__main__":
+    main()
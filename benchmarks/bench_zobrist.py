@@ -0,0 +1,67 @@
+"""
+what keeping position hashes costs per move, next to hashing boards from scratch.
+
+plays random games (see game.random_script) and times, per turn: playing it (which
+updates the hashes), hashing its board from scratch, updating a hash from the turn
+before's (as TurnNavigation does for loaded turns), and a position index key (see
+positions.py) for comparison.
+
+    uv run python benchmarks/bench_zobrist.py --games 20
+"""
+
+import argparse
+import random
+import time
+
+from rotating_chess import zobrist
+from rotating_chess.game import Game, random_script
+from rotating_chess.positions import EXACT, position_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--plies", type=int, default=60)
+    args = parser.parse_args()
+
+    scripts = [
+        random_script(args.plies, random.Random(seed)) for seed in range(args.games)
+    ]
+    played = 0.0
+    lines = []
+    for script in scripts:
+        game = Game()
+        start = time.perf_counter()
+        for action in script:
+            game.apply(action)
+        played += time.perf_counter() - start
+        lines.append(game.nav.get_line_boards())
+    turns = sum(map(len, scripts))
+    boards = [board for line in lines for board in line]
+
+    def per_turn(name: str, f) -> None:
+        zobrist.piece_hash.cache_clear()
+        start = time.perf_counter()
+        f()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>16}: {1e6 * elapsed / len(boards):8.2f}us per turn")
+
+    print(f"{'playing a turn':>16}: {1e6 * played / turns:8.2f}us per turn")
+    per_turn("from scratch", lambda: [zobrist.board_hash(b) for b in boards])
+
+    def updates() -> None:
+        for line in lines:
+            h = zobrist.board_hash(line[0])
+            for prev, board in zip(line, line[1:]):
+                h = zobrist.update(h, prev, board)
+
+    per_turn("from the last", updates)
+    per_turn(
+        "one new piece",
+        lambda: [zobrist.piece_hash(*b[0]._replace(x=b[0].x + 1)) for b in boards],
+    )
+    per_turn("position_key", lambda: [position_key(b, EXACT) for b in boards])
+
+
+if __name__ == "__main__":
+    main()
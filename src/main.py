@@ -1,15 +1,20 @@
 import os
 import sys, platform
 import asyncio
-import pygame
+import argparse
+from pathlib import Path
 
-from pygame.event import Event
-from pygame.locals import QUIT
+import pygame
 
 from rotating_chess import widgets
 from rotating_chess.gamestate import GameState
-from rotating_chess.widgets import MOUSE_HELD
+from rotating_chess.frame import update, draw
 from rotating_chess import settings
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.client import GameClient
+from rotating_chess.journal import Journal
+from rotating_chess.recording import Recorder
+from rotating_chess.pieces import Side
 
 if sys.platform == "emscripten":
     platform.console.log(platform.document.getElementById("loading_notice"))
@@ -20,70 +25,96 @@ if sys.platform == "emscripten":
     )
 
 
-def update(gs: GameState):
-    widgets.Button.one_clicked = False
-    x, y = pygame.mouse.get_pos()
-
-    if pygame.mouse.get_pressed()[0]:
-        pygame.event.post(Event(MOUSE_HELD))
-
-    for event in pygame.event.get():
-        for widget in gs.widgets.__dict__.values():
-            widget.handle_event(event, gs, x, y)
-
-        if event.type == QUIT:
-            gs.playing = False
-
-
-def draw(screen: pygame.Surface, gs: GameState):
-    """
-    Draw things to the window. Called once per frame.
-    """
-    # draw board tiles
-    screen.fill(settings.BOARD_COLOR)
-
-    for i in range(0, 400, 100):
-        for j in range(0, 400, 100):
-            pygame.draw.rect(screen, settings.BACKGROUND_COLOR, (i, j, 50, 50))
-
-    for i in range(50, 450, 100):
-        for j in range(50, 450, 100):
-            pygame.draw.rect(screen, settings.BACKGROUND_COLOR, (i, j, 50, 50))
-
-    # draw "cover" for pieces in case they leak over to the selection panel
-    # TODO: this doesn't actually do anything anymore. need to get
-    # LayeredUpdates working and make all these widgets.
-    # ie only thing in this function should be screen.fill board color and draw all widgets
-    pygame.draw.rect(screen, settings.BOARD_COLOR, (8 * 50, 0, 4 * 50, 8 * 50))
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rotating Chess")
+    parser.add_argument(
+        "--connect",
+        metavar="HOST:PORT",
+        help="play a game hosted by `python -m rotating_chess.server` instead of hot-seat",
+    )
+    parser.add_argument("--game", default="lobby", help="id of the hosted game to join")
+    parser.add_argument(
+        "--side", choices=["white", "black"], help="side to play (default: any)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true", help="spectate the hosted game instead"
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record input to PATH, to replay with `python -m rotating_chess.recording`",
+    )
+    parser.add_argument(
+        "--board",
+        metavar="FILESxRANKS",
+        type=BoardGeometry.parse,
+        help="play on a bigger board, e.g. 16x16 (for stress testing). doesn't autosave",
+    )
+    # pygbag may pass its own arguments
+    return parser.parse_known_args()[0]
 
-    # draw widgets
-    for widget in gs.widgets.__dict__.values():
-        widget.draw(screen, gs)
 
-    pygame.display.update()
+async def connect(gs: GameState, args: argparse.Namespace) -> GameClient:
+    host, port = args.connect.rsplit(":", 1)
+    client = await GameClient.connect(host, int(port))
+    if args.watch:
+        await client.watch(gs.game, args.game)
+    else:
+        side = {"white": Side.WHITE, "black": Side.BLACK, None: None}[args.side]
+        await client.join(gs.game, args.game, side)
+    return client
 
 
 async def main():
+    args = parse_args()
+    if args.board is not None:
+        settings.BOARD = args.board
     pygame.init()
 
     pygame.display.set_caption("Rotating Chess")
     if sys.platform == "emscripten":
-        screen = pygame.display.set_mode((600, 400))
+        screen = pygame.display.set_mode(settings.BOARD.window_size())
     else:
         pygame.display.set_icon(pygame.image.load("assets/favicon.png"))
 
-        # screen = pygame.display.set_mode((600, 400), flags=0, vsync=1)
-        screen = pygame.display.set_mode((600, 400), flags=pygame.SCALED, vsync=1)
+        # screen = pygame.display.set_mode(settings.BOARD.window_size(), flags=0, vsync=1)
+        screen = pygame.display.set_mode(
+            settings.BOARD.window_size(), flags=pygame.SCALED, vsync=1
+        )
 
     gs: GameState = GameState()
+    client = None if args.connect is None else await connect(gs, args)
+    journal = None
+    recorder = None if args.record is None else Recorder(args.record)
+    # recordings replay onto a new game, so don't recover one
+    if (
+        client is None
+        and recorder is None
+        and args.board is None
+        and settings.AUTOSAVE
+        and sys.platform != "emscripten"
+    ):
+        journal = Journal(gs.game, Path(settings.AUTOSAVE_DIR))
+        journal.recover()
+        journal.start()
     clock = pygame.time.Clock()
     while gs.playing:
-        update(gs)
+        update(gs, recorder)
+        if client is not None and client.poll():
+            # the opponent moved. drop whatever we had selected
+            gs.widgets.movesel.hide(gs)
         draw(screen, gs)
 
         clock.tick(60)
         await asyncio.sleep(0)  # Let other tasks run
 
+    if journal is not None:
+        journal.close()
+    if recorder is not None:
+        recorder.close()
+    gs.widgets.hint.close()
+
 
 # async code such that pygbag can compile to wasm
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,224 @@
+"""
+analyses a directory of game saves: evaluations, blunders and missed captures, as jsonl.
+
+every save (rotchess_save_*.txt, as ExportSave writes them) is read and decoded a chunk
+at a time (see saveio.read_save_file), then walked turn by turn on the board model.
+its turns are grouped into plies (a move, and the same side's rotation right after, if
+any, see plies.py), and each ply's played line is compared with the engine's best:
+    best            the best score the engine finds for the mover, depth plies deep
+    played          the score of the board the mover actually left, just as deep
+    loss            how much worse played was than best (never below 0: the engine
+                    only tries a few angles, so players sometimes beat it)
+    blunder         loss is at least BLUNDER
+    missed_capture  the mover didn't capture, but the best ply did, and by at least
+                    MISSED_CAPTURE
+scores are for the mover, in pawns (see engine.evaluate). each turn's board also gets
+a static evaluation, for white.
+
+each save becomes one line of output, written as soon as it's done:
+    {"save": name, "turns": n, "evals": [...], "plies": [...],
+     "blunders": n, "missed_captures": n, "seconds": s}
+or {"save": name, "error": "..."} if it couldn't be read. games are spread over a
+process pool, a few at a time (--chunksize). rerunning with the same output picks up
+where the last run stopped: saves already there are skipped (and a line cut short by
+a crash is dropped).
+
+    uv run python -m rotating_chess.analysis game_saves/ -o analysis.jsonl
+    uv run python -m rotating_chess.analysis game_saves/ -o analysis.jsonl --workers 16 --depth 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from rotating_chess.engine import Engine
+from rotating_chess.pieces import Board, Side
+from rotating_chess.plies import is_rotation, mover, other
+from rotating_chess.saveio import read_save_file
+
+PATTERN = "rotchess_save_*.txt"
+# in pawns, lost compared with the best ply
+BLUNDER = 2.0
+MISSED_CAPTURE = 1.0
+
+
+def plies_of(boards: list[Board]) -> Iterator[tuple[int, int, Side]]:
+    """
+    (first turn, last turn, the side that played it) of each ply of a game: a move,
+    and the same side's rotation right after, if any. turns that change nothing are
+    skipped.
+    """
+    turn = 0
+    while turn + 1 < len(boards):
+        side = mover(boards[turn], boards[turn + 1])
+        if side is None:
+            turn += 1
+            continue
+        end = turn + 1
+        if (
+            end + 1 < len(boards)
+            and not is_rotation(boards[turn], boards[end])
+            and is_rotation(boards[end], boards[end + 1])
+            and mover(boards[end], boards[end + 1]) == side
+        ):
+            end += 1
+        yield turn, end, side
+        turn = end
+
+
+def analyse_game(boards: list[Board], engine: Engine, depth: int) -> dict:
+    """
+    the analysis of one game's boards, as described above (without the save's name).
+    engine searches depth plies deep (at least 1)
+    """
+    plies = []
+    for start, end, side in plies_of(boards):
+        before, after = boards[start], boards[end]
+        best = engine.best(before, side)
+        played = -engine.value(after, other(side), depth - 1)
+        record = {"from": start, "to": end, "side": side.name.lower()}
+        if best is not None:
+            loss = max(0.0, best.score - played)
+            best_captures = False
+            if len(after) >= len(before):
+                child, _ = engine.plies.play(
+                    before, best.ply.piece, best.ply.x, best.ply.y
+                )
+                best_captures = len(child) < len(before)
+            record |= {
+                "best": round(best.score, 3),
+                "best_ply": best.ply.name(),
+                "played": round(played, 3),
+                "loss": round(loss, 3),
+                "blunder": loss >= BLUNDER,
+                "missed_capture": best_captures and loss >= MISSED_CAPTURE,
+            }
+        plies.append(record)
+    return {
+        "turns": len(boards),
+        "evals": [round(engine.evaluate(board, Side.WHITE), 3) for board in boards],
+        "plies": plies,
+        "blunders": sum(bool(ply.get("blunder")) for ply in plies),
+        "missed_captures": sum(bool(ply.get("missed_capture")) for ply in plies),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def engine_for(depth: int, angles: int) -> Engine:
+    """one engine per worker (and settings), reused for every game it analyses"""
+    return Engine(angles=angles, max_depth=depth)
+
+
+def analyse_file(path: Path, root: Path, depth: int = 2, angles: int = 0) -> dict:
+    """the output line for the save at path, named relative to root"""
+    name = path.relative_to(root).as_posix()
+    start = time.perf_counter()
+    try:
+        boards = read_save_file(path)
+    except Exception as e:
+        return {"save": name, "error": f"{type(e).__name__}: {e}"}
+    result = analyse_game(boards, engine_for(depth, angles), depth)
+    return {"save": name, **result, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def done_saves(output: Path) -> set[str]:
+    """
+    the saves output already has. drops a last line cut short (e.g. by a crash), so
+    appending to output carries on cleanly
+    """
+    if not output.exists():
+        return set()
+    data = output.read_bytes()
+    end = data.rfind(b"\n") + 1
+    if end != len(data):
+        with open(output, "r+b") as f:
+            f.truncate(end)
+    done = set()
+    for line in data[:end].splitlines():
+        try:
+            done.add(json.loads(line)["save"])
+        except (ValueError, KeyError):
+            continue
+    return done
+
+
+def analyse_directory(
+    directory: Path,
+    output: Path,
+    workers: int | None = None,
+    chunksize: int = 4,
+    depth: int = 2,
+    angles: int = 0,
+    pattern: str = PATTERN,
+) -> int:
+    """
+    analyses every save under directory that output doesn't have yet, appending them
+    to it. workers=1 runs in this process. returns how many were analysed.
+    """
+    done = done_saves(output)
+    paths = [
+        path
+        for path in sorted(directory.rglob(pattern))
+        if path.relative_to(directory).as_posix() not in done
+    ]
+    work = functools.partial(analyse_file, root=directory, depth=depth, angles=angles)
+    start = time.perf_counter()
+    with open(output, "a") as out:
+        pool = None if workers == 1 else multiprocessing.Pool(workers)
+        try:
+            results = (
+                map(work, paths)
+                if pool is None
+                else pool.imap_unordered(work, paths, chunksize)
+            )
+            for count, result in enumerate(results, 1):
+                out.write(json.dumps(result, separators=(",", ":")) + "\n")
+                out.flush()
+                if count % 10 == 0 or count == len(paths):
+                    minutes = (time.perf_counter() - start) / 60
+                    print(
+                        f"{count}/{len(paths)} games "
+                        f"({count / minutes:,.1f} games/min, {len(done)} done before)"
+                    )
+        finally:
+            if pool is not None:
+                pool.terminate()
+    return len(paths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="analyses a directory of game saves, writing jsonl"
+    )
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=Path("analysis.jsonl"))
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="1: no process pool"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=4, help="games handed to a worker at a time"
+    )
+    parser.add_argument("--depth", type=int, default=2, help="plies to search")
+    parser.add_argument(
+        "--angles", type=int, default=0, help="rotation angles the engine tries"
+    )
+    parser.add_argument("--pattern", default=PATTERN)
+    args = parser.parse_args()
+
+    analysed = analyse_directory(
+        args.directory,
+        args.output,
+        args.workers,
+        args.chunksize,
+        args.depth,
+        args.angles,
+        args.pattern,
+    )
+    print(f"analysed {analysed} games into {args.output}")
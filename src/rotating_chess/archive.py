@@ -0,0 +1,343 @@
+"""
+packs many games into one indexed file, so any game (or any turn of one) can be read
+without reading, or decoding, the rest.
+
+layout (little endian throughout):
+    header    magic, format version, game count, index offset
+    games     one after another, see below
+    metadata  one json object per game (players, where it came from, ...)
+    index     one fixed-size entry per game: its offset, size and turn count,
+              and its metadata's offset and size
+
+so finding game i is one read of the index, straight from the mmap'd file.
+
+a game is a table of its turns' offsets followed by the turns, each either a whole
+board (every KEYFRAME_EVERY turns) or what changed since the turn before: which pieces
+are gone and the pieces that are new or different. one turn usually changes one or two
+pieces, so most are a few dozen bytes. reading turn t decodes at most KEYFRAME_EVERY turns.
+a turn whose pieces are all on the fixed-point grid (see fixed.py) stores them as
+integers, in less than half the space.
+
+    python -m rotating_chess.archive pack games.rca game_saves/*.txt
+    python -m rotating_chess.archive extract games.rca 12 > save.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+from rotating_chess import fixed
+from rotating_chess.history import encode_game_save, parse_game_save
+from rotating_chess.pieces import Board, PieceState, Side
+
+MAGIC = b"RCARCHIV"
+FORMAT_VERSION = 1
+# magic, format version, game count, index offset
+HEADER = struct.Struct("<8sIIQ")
+# game offset, game size, turns, metadata offset, metadata size
+INDEX_ENTRY = struct.Struct("<QIIQI")
+# x, y, angle, side, kind (index into PIECE_KINDS)
+PIECE = struct.Struct("<dddBB")
+# the same, in fixed-point units
+FIXED_PIECE = struct.Struct("<iiHBB")
+# (in a delta) index in the new board
+CHANGE = struct.Struct("<H")
+COUNT = struct.Struct("<H")
+OFFSET = struct.Struct("<I")
+PIECE_KINDS = ("pawn", "knight", "bishop", "rook", "queen", "king")
+KIND_IDX = {kind: idx for idx, kind in enumerate(PIECE_KINDS)}
+KEYFRAME, DELTA = 0, 1
+# set on a turn's kind when its pieces are FIXED_PIECEs
+FIXED = 0x80
+KEYFRAME_EVERY = 32
+
+
+def encode_piece(state: PieceState) -> bytes:
+    return PIECE.pack(
+        state.x, state.y, state.angle, state.side.value, KIND_IDX[state.piece_name]
+    )
+
+
+def encode_fixed_piece(state: PieceState) -> bytes:
+    """encode_piece, for a piece on the fixed-point grid"""
+    return FIXED_PIECE.pack(
+        fixed.to_units(state.x),
+        fixed.to_units(state.y),
+        fixed.angle_to_units(state.angle),
+        state.side.value,
+        KIND_IDX[state.piece_name],
+    )
+
+
+def decode_piece(buf, offset: int) -> PieceState:
+    x, y, angle, side, kind = PIECE.unpack_from(buf, offset)
+    return PieceState(x, y, angle, Side(side), PIECE_KINDS[kind])
+
+
+def decode_fixed_piece(buf, offset: int) -> PieceState:
+    x, y, angle, side, kind = FIXED_PIECE.unpack_from(buf, offset)
+    return PieceState(
+        fixed.from_units(x),
+        fixed.from_units(y),
+        fixed.angle_from_units(angle),
+        Side(side),
+        PIECE_KINDS[kind],
+    )
+
+
+def encode_turn(board: Board, prev: Board | None) -> bytes:
+    """board as a keyframe (if prev is None) or as a delta from prev"""
+    if prev is None:
+        if all(map(fixed.is_snapped, board)):
+            return (
+                bytes([KEYFRAME | FIXED])
+                + COUNT.pack(len(board))
+                + b"".join(map(encode_fixed_piece, board))
+            )
+        return (
+            bytes([KEYFRAME])
+            + COUNT.pack(len(board))
+            + b"".join(map(encode_piece, board))
+        )
+
+    # which of prev's pieces carry over, in order. pieces are only ever removed
+    # (captures, promotions) or changed in place, and new ones appended. (if a board
+    # doesn't look like that, it just makes for a bigger delta.)
+    kept: list[PieceState] = []
+    mask = bytearray((len(prev) + 7) // 8)
+    i = 0
+    for j, state in enumerate(prev):
+        gone = i >= len(board) or (
+            state != board[i] and j + 1 < len(prev) and prev[j + 1] == board[i]
+        )
+        if not gone:
+            mask[j // 8] |= 1 << (j % 8)
+            kept.append(state)
+            i += 1
+
+    changed = [
+        (i, state)
+        for i, state in enumerate(board)
+        if i >= len(kept) or kept[i] != state
+    ]
+    kind, encode = DELTA, encode_piece
+    if all(fixed.is_snapped(state) for _, state in changed):
+        kind, encode = DELTA | FIXED, encode_fixed_piece
+    changes = [CHANGE.pack(i) + encode(state) for i, state in changed]
+    return b"".join(
+        [bytes([kind]), COUNT.pack(len(board)), mask, COUNT.pack(len(changes))]
+        + changes
+    )
+
+
+def decode_turn(buf, offset: int, prev: Board | None) -> Board:
+    kind = buf[offset]
+    piece, decode = PIECE, decode_piece
+    if kind & FIXED:
+        kind &= ~FIXED
+        piece, decode = FIXED_PIECE, decode_fixed_piece
+    (length,) = COUNT.unpack_from(buf, offset + 1)
+    offset += 1 + COUNT.size
+    if kind == KEYFRAME:
+        return tuple(decode(buf, offset + k * piece.size) for k in range(length))
+
+    assert prev is not None
+    mask = buf[offset : offset + (len(prev) + 7) // 8]
+    offset += len(mask)
+    board: list[PieceState | None] = [
+        state for j, state in enumerate(prev) if mask[j // 8] >> (j % 8) & 1
+    ]
+    del board[length:]
+    board.extend([None] * (length - len(board)))
+    (changes,) = COUNT.unpack_from(buf, offset)
+    offset += COUNT.size
+    for _ in range(changes):
+        (i,) = CHANGE.unpack_from(buf, offset)
+        board[i] = decode(buf, offset + CHANGE.size)
+        offset += CHANGE.size + piece.size
+    return tuple(board)  # type: ignore
+
+
+def encode_game(boards: list[Board]) -> bytes:
+    turns = [
+        encode_turn(board, None if t % KEYFRAME_EVERY == 0 else boards[t - 1])
+        for t, board in enumerate(boards)
+    ]
+    offsets = []
+    offset = OFFSET.size * len(turns)
+    for turn in turns:
+        offsets.append(OFFSET.pack(offset))
+        offset += len(turn)
+    return b"".join(offsets + turns)
+
+
+class ArchiveWriter:
+    """
+    writes an archive, one game at a time. use as a context manager, or call close().
+
+    >>> import tempfile
+    >>> from rotating_chess.game import Game
+    >>> path = Path(tempfile.mkdtemp()) / "games.rca"
+    >>> with ArchiveWriter(path) as w:
+    ...     w.add(Game().nav.get_line_boards(), {"white": "alice", "black": "bob"})
+    0
+    >>> with Archive(path) as a:
+    ...     len(a), a.turns(0), a.metadata(0)["white"], a.board(0, 0)[0].piece_name
+    (1, 1, 'alice', 'pawn')
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.__file = open(path, "wb")
+        self.__file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+        # (offset, size, turns) per game
+        self.__games: list[tuple[int, int, int]] = []
+        self.__metadata: list[bytes] = []
+
+    def add(self, boards: list[Board], metadata: dict | None = None) -> int:
+        """adds a game (its boards, one per turn). returns its index in the archive."""
+        if len(boards) == 0:
+            raise ValueError("a game has at least one turn")
+        data = encode_game(boards)
+        self.__games.append((self.__file.tell(), len(data), len(boards)))
+        self.__file.write(data)
+        self.__metadata.append(
+            json.dumps(metadata or {}, separators=(",", ":")).encode("utf-8")
+        )
+        return len(self.__games) - 1
+
+    def add_save(self, save: str, metadata: dict | None = None) -> int:
+        """adds a game from its game save. raises on an invalid save."""
+        return self.add(parse_game_save(save), metadata)
+
+    def close(self) -> None:
+        if self.__file.closed:
+            return
+        index = []
+        for (offset, size, turns), metadata in zip(self.__games, self.__metadata):
+            index.append(
+                INDEX_ENTRY.pack(offset, size, turns, self.__file.tell(), len(metadata))
+            )
+            self.__file.write(metadata)
+        index_offset = self.__file.tell()
+        self.__file.write(b"".join(index))
+        self.__file.seek(0)
+        self.__file.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, len(self.__games), index_offset)
+        )
+        self.__file.close()
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Archive:
+    """
+    reads an archive through mmap. nothing is read until it's asked for,
+    so opening even a huge archive is instant.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.__count, self.__index = HEADER.unpack_from(self.__mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't a game archive")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} is archive version {version}, not {FORMAT_VERSION}"
+            )
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __entry(self, game: int) -> tuple[int, int, int, int, int]:
+        if not 0 <= game < self.__count:
+            raise IndexError(f"no game {game} in an archive of {self.__count}")
+        return INDEX_ENTRY.unpack_from(
+            self.__mmap, self.__index + game * INDEX_ENTRY.size
+        )
+
+    def turns(self, game: int) -> int:
+        return self.__entry(game)[2]
+
+    def metadata(self, game: int) -> dict:
+        *_, offset, size = self.__entry(game)
+        return json.loads(self.__mmap[offset : offset + size])
+
+    def board(self, game: int, turn: int) -> Board:
+        """the board of one turn of one game"""
+        offset, _, turns, *_ = self.__entry(game)
+        if not 0 <= turn < turns:
+            raise IndexError(f"no turn {turn} in a game of {turns}")
+        board = None
+        for t in range(turn - turn % KEYFRAME_EVERY, turn + 1):
+            (turn_offset,) = OFFSET.unpack_from(self.__mmap, offset + t * OFFSET.size)
+            board = decode_turn(self.__mmap, offset + turn_offset, board)
+        assert board is not None
+        return board
+
+    def boards(self, game: int) -> list[Board]:
+        """every turn of one game, e.g. for TurnNavigation.load_boards"""
+        offset, _, turns, *_ = self.__entry(game)
+        boards: list[Board] = []
+        for t in range(turns):
+            (turn_offset,) = OFFSET.unpack_from(self.__mmap, offset + t * OFFSET.size)
+            boards.append(
+                decode_turn(
+                    self.__mmap, offset + turn_offset, boards[-1] if boards else None
+                )
+            )
+        return boards
+
+    def game_save(self, game: int) -> str:
+        return encode_game_save(self.boards(game))
+
+    def close(self) -> None:
+        self.__mmap.close()
+
+    def __enter__(self) -> Archive:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def pack(out: Path, saves: Iterable[Path]) -> None:
+    with ArchiveWriter(out) as writer:
+        for path in saves:
+            try:
+                writer.add_save(path.read_text(), {"file": path.name})
+            except Exception as e:
+                print(f"skipping {path}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="packs game saves into an archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="pack save files into an archive")
+    pack_parser.add_argument("archive", type=Path)
+    pack_parser.add_argument("saves", type=Path, nargs="+")
+    list_parser = commands.add_parser("list", help="list the games in an archive")
+    list_parser.add_argument("archive", type=Path)
+    extract_parser = commands.add_parser("extract", help="print one game's save")
+    extract_parser.add_argument("archive", type=Path)
+    extract_parser.add_argument("game", type=int)
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        pack(args.archive, args.saves)
+    elif args.command == "list":
+        with Archive(args.archive) as archive:
+            for game in range(len(archive)):
+                print(game, archive.turns(game), json.dumps(archive.metadata(game)))
+    else:
+        with Archive(args.archive) as archive:
+            print(archive.game_save(args.game))
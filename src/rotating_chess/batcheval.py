@@ -0,0 +1,312 @@
+"""
+evaluates many boards at once, vectorized with numpy: for searches and analyses that
+score thousands of leaves at a time.
+
+pack() puts a batch of boards into (boards, pieces) arrays: kind (an index into
+archive.PIECE_KINDS, -1 past a board's last piece), side (1 white, -1 black, 0 no
+piece), x, y and angle. the terms, all for white (negate them for black):
+    material  what engine.evaluate counts: piece values, and a little for pieces near
+              the centre. WIN (or -WIN) once a king's gone
+    mobility  how many more movable points (see Piece.get_movable_points) white's
+              pieces have than black's: every point of their DistsAngles up to the
+              first off the board, counted once where capture and move points are
+              the same points. blocking and own pieces aren't checked, so it's cheap
+    threats   the value (KING_THREAT for a king) of black's pieces that one of
+              white's capture points overlaps, less the same for white's, each
+              piece counted once however many threaten it. also without blocking
+
+every piece's DistsAngles are in one table (RAYS), so every ray of every piece of
+every board is one array operation; boards go CHUNK at a time to bound memory. points
+are found with the same float operations as Piece's, so mobility counts exactly the
+points Piece does (but floats only: settings.FIXED_POINT's snapping isn't copied).
+
+numpy is a dependency, but optional here as in canmove.py: without it HAVE_NUMPY is
+False and there's no batch evaluation; engine.evaluate does one board at a time.
+
+    uv run python benchmarks/bench_batcheval.py
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from rotating_chess import settings
+from rotating_chess.archive import KIND_IDX, PIECE_KINDS
+from rotating_chess.engine import CENTRE_REACH, WIN, Weights
+from rotating_chess.geometry import TILE, BoardGeometry
+from rotating_chess.pieces import Board, Side
+
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# as in Piece.should_draw_point
+MARGIN = settings.HITCIRCLE_RADIUS
+# a threatened king, in pawns. more than any other piece
+KING_THREAT = 10.0
+# boards evaluated at a time. bounds the (boards, pieces, rays, points) arrays, and
+# keeps them small enough to stay in cache
+CHUNK = 16
+
+DIAGONAL = 50 * math.sqrt(2)
+KNIGHT = math.sqrt(50**2 + 100**2)
+# (base angle, first distance, step, points, whether they're capture points) of each
+# of a kind's DistsAngles, as in Piece.__init_movement. None points is endless.
+# a DistsAngle that's both a move and a capture one is here once
+Ray = tuple[float, float, float, int | None, bool]
+LEVEL: list[Ray] = [
+    (0, 50, 50, None, True),
+    (0, -50, -50, None, True),
+    (math.pi / 2, 50, 50, None, True),
+    (math.pi / 2, -50, -50, None, True),
+]
+DIAGONALS: list[Ray] = [
+    (math.pi / 4, DIAGONAL, DIAGONAL, None, True),
+    (math.pi / 4, -DIAGONAL, -DIAGONAL, None, True),
+    (math.pi / -4, DIAGONAL, DIAGONAL, None, True),
+    (math.pi / -4, -DIAGONAL, -DIAGONAL, None, True),
+]
+# fmt: off
+RAYS: dict[str, list[Ray]] = {
+    "pawn": [
+        (math.pi / -2, 50, 50, 2, False),
+        (3 * math.pi / -4, DIAGONAL, DIAGONAL, 1, True),
+        (math.pi / -4, DIAGONAL, DIAGONAL, 1, True),
+    ],
+    "knight": [
+        (rad, KNIGHT, KNIGHT, 1, True)
+        for rad in [
+            0.4636476090008061, -0.4636476090008061, -1.1071487177940904,
+            -2.0344439357957027, -2.677945044588987, 2.677945044588987,
+            2.0344439357957027, 1.1071487177940904,
+        ]
+    ],
+    "bishop": DIAGONALS,
+    "rook": LEVEL,
+    "queen": LEVEL + DIAGONALS,
+    # (Piece lists 3pi/2 and 7pi/4 as well, the same points as -pi/2 and -pi/4)
+    "king": [(rad, 50, 50, 1, True) for rad in [math.pi / -2, 0, math.pi / 2, math.pi]]
+    + [
+        (rad + math.pi / 4, DIAGONAL, DIAGONAL, 1, True)
+        for rad in [math.pi / -2, 0, math.pi / 2, math.pi]
+    ],
+}
+# fmt: on
+MAX_RAYS = max(len(rays) for rays in RAYS.values())
+
+
+def ray_points(geometry: BoardGeometry) -> int:
+    """the most points an endless DistsAngle has on geometry's board, from anywhere"""
+    size = max(geometry.width, geometry.height) + 2 * MARGIN
+    return math.ceil(size * math.sqrt(2) / TILE) + 1
+
+
+@functools.lru_cache(maxsize=None)
+def ray_table(
+    geometry: BoardGeometry,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    RAYS as (kinds, MAX_RAYS) arrays of base angles, first distances, steps and
+    whether they're capture points, and a (kinds, MAX_RAYS, ray_points(geometry))
+    array of distances, nan where a ray has no point
+    """
+    shape = len(PIECE_KINDS), MAX_RAYS
+    angles, starts, steps = np.zeros(shape), np.ones(shape), np.ones(shape)
+    captures = np.zeros(shape, dtype=bool)
+    endless = ray_points(geometry)
+    distances = np.full((*shape, endless), np.nan)
+    for kind, rays in RAYS.items():
+        k = KIND_IDX[kind]
+        for r, (angle, start, step, points, capture) in enumerate(rays):
+            angles[k, r], starts[k, r], steps[k, r] = angle, start, step
+            captures[k, r] = capture
+            # as itertools.count counts: adding step every time
+            distance = start
+            for p in range(endless if points is None else points):
+                distances[k, r, p] = distance
+                distance += step
+    return angles, starts, steps, captures, distances
+
+
+class Batch(NamedTuple):
+    # (boards, pieces) each
+    kind: np.ndarray
+    side: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    angle: np.ndarray
+
+    def __len__(self) -> int:
+        return self.kind.shape[0]
+
+    def chunk(self, start: int, stop: int) -> Batch:
+        return Batch(*(array[start:stop] for array in self))
+
+
+class Terms(NamedTuple):
+    # (boards,) each, for white
+    material: np.ndarray
+    mobility: np.ndarray
+    threats: np.ndarray
+
+
+def pack(boards: Sequence[Board]) -> Batch:
+    """boards, as arrays as wide as the most pieces any of them has"""
+    width = max((len(board) for board in boards), default=0)
+    kind = np.full((len(boards), width), -1, dtype=np.int8)
+    side = np.zeros((len(boards), width), dtype=np.int8)
+    xya = np.zeros((3, len(boards), width))
+    for n, board in enumerate(boards):
+        pieces = len(board)
+        kind[n, :pieces] = [KIND_IDX[state.piece_name] for state in board]
+        side[n, :pieces] = [1 if state.side == Side.WHITE else -1 for state in board]
+        xya[:, n, :pieces] = [
+            [state.x for state in board],
+            [state.y for state in board],
+            [state.angle for state in board],
+        ]
+    return Batch(kind, side, *xya)
+
+
+def points(batch: Batch) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    every piece's every (boards, pieces, MAX_RAYS, ray_points) point x and y, and
+    which of them Piece has: the ones up to its rays' first off settings.BOARD
+    """
+    geometry = settings.BOARD
+    ray_angles, _, _, _, ray_distances = ray_table(geometry)
+    kind = np.maximum(batch.kind, 0)
+    # as DistsAngle.get_point and Piece.__point, to the bit
+    angle = ray_angles[kind] - batch.angle[..., None]
+    distances = ray_distances[kind]
+    x = batch.x[..., None, None] + distances * np.cos(angle)[..., None]
+    y = batch.y[..., None, None] + distances * np.sin(angle)[..., None]
+    with np.errstate(invalid="ignore"):
+        on_board = (
+            (x >= -MARGIN)
+            & (x <= geometry.width + MARGIN)
+            & (y >= -MARGIN)
+            & (y <= geometry.height + MARGIN)
+        )
+    on_board &= (batch.side != 0)[..., None, None]
+    return x, y, np.logical_and.accumulate(on_board, axis=-1)
+
+
+def piece_mobility(batch: Batch) -> np.ndarray:
+    """how many movable points each piece has, as (boards, pieces)"""
+    return np.concatenate(
+        [
+            points(batch.chunk(start, start + CHUNK))[2].sum(axis=(2, 3))
+            for start in range(0, len(batch), CHUNK)
+        ]
+        or [np.zeros(batch.kind.shape, dtype=int)]
+    )
+
+
+def piece_values(batch: Batch, weights: Weights) -> np.ndarray:
+    values = np.array([weights.value(kind) for kind in PIECE_KINDS] + [0.0])
+    return values[batch.kind]
+
+
+def material(batch: Batch, weights: Weights = Weights()) -> np.ndarray:
+    """the material term, as engine.evaluate counts it"""
+    centre_x, centre_y = settings.BOARD.centre
+    distance = np.hypot(batch.x - centre_x, batch.y - centre_y)
+    value = piece_values(batch, weights) + weights.centre * np.maximum(
+        0.0, 1 - distance / CENTRE_REACH
+    )
+    score = (value * batch.side).sum(axis=1)
+    kings = batch.kind == KIND_IDX["king"]
+    score[~(kings & (batch.side == -1)).any(axis=1)] = WIN
+    score[~(kings & (batch.side == 1)).any(axis=1)] = -WIN
+    return score
+
+
+def threatened(batch: Batch, counts: np.ndarray | None = None) -> np.ndarray:
+    """
+    whether a capture point of one of the other side's pieces overlaps each piece,
+    as (boards, pieces). counts: each ray's points on the board, if already known
+    """
+    if counts is None:
+        counts = points(batch)[2].sum(axis=-1)
+    ray_angles, ray_starts, ray_steps, ray_captures, _ = ray_table(settings.BOARD)
+    kind = np.maximum(batch.kind, 0)
+    angle = ray_angles[kind] - batch.angle[..., None]
+    capture = ray_captures[kind] & (counts > 0)
+    # (boards, attackers, rays, targets): each target's offset from each attacker,
+    # across each of its rays. a target that far from a ray's line isn't near any
+    # of its points, and most aren't, so the rest only looks at the ones that are
+    dx = batch.x[:, None, None, :] - batch.x[:, :, None, None]
+    dy = batch.y[:, None, None, :] - batch.y[:, :, None, None]
+    cos, sin = np.cos(angle), np.sin(angle)
+    reach = settings.HITCIRCLE_RADIUS * 2
+    # in single precision, which is twice as fast, so with a little slack
+    across = dx.astype(np.float32) * sin[..., None].astype(np.float32)
+    across -= dy.astype(np.float32) * cos[..., None].astype(np.float32)
+    enemies = batch.side[:, :, None] * batch.side[:, None, :] < 0
+    near = (np.abs(across) < reach + 0.01) & capture[..., None]
+    near &= enemies[:, :, None, :]
+    b, a, r, t = np.nonzero(near)
+
+    dx, dy = dx[b, a, 0, t], dy[b, a, 0, t]
+    cos, sin = cos[b, a, r], sin[b, a, r]
+    along = dx * cos + dy * sin
+    # the ray's point nearest the target (points are evenly spaced)
+    starts, steps = ray_starts[kind[b, a], r], ray_steps[kind[b, a], r]
+    nearest = np.minimum(
+        np.maximum(np.rint((along - starts) / steps), 0), counts[b, a, r] - 1
+    )
+    gap = (starts + nearest * steps - along) ** 2 + (dx * sin - dy * cos) ** 2
+    # as Piece.piece_collides
+    hit = gap < reach**2
+    threatened = np.zeros(batch.kind.shape, dtype=bool)
+    threatened[b[hit], t[hit]] = True
+    return threatened
+
+
+def terms(batch: Batch, weights: Weights = Weights()) -> Terms:
+    """every board's terms, weighted only in material (see the module docstring)"""
+    mobility, threats = [], []
+    threat_values = piece_values(batch, weights)
+    threat_values[batch.kind == KIND_IDX["king"]] = KING_THREAT
+    for start in range(0, len(batch), CHUNK):
+        chunk = batch.chunk(start, start + CHUNK)
+        _, _, on_board = points(chunk)
+        mobility.append((on_board.sum(axis=(2, 3)) * chunk.side).sum(axis=1))
+        # a white piece threatened counts against white
+        values = threat_values[start : start + CHUNK] * -chunk.side
+        counts = on_board.sum(axis=-1)
+        threats.append((threatened(chunk, counts) * values).sum(axis=1))
+    empty = [np.zeros(len(batch))]
+    return Terms(
+        material(batch, weights),
+        np.concatenate(mobility or empty),
+        np.concatenate(threats or empty),
+    )
+
+
+def evaluate(
+    batch: Batch, weights: Weights = Weights(), threat: float = 0.0
+) -> np.ndarray:
+    """
+    how good each board is for white, in pawns: material, weights.mobility per
+    movable point more than black and threat per pawn of threats. a won (or lost)
+    board is WIN (or -WIN) whatever else it has
+
+    >>> from rotating_chess.plies import start_board
+    >>> evaluate(pack([start_board()]), Weights(mobility=0.1), threat=0.5).tolist()
+    [0.0]
+    """
+    result = terms(batch, weights)
+    score = (
+        result.material + weights.mobility * result.mobility + threat * result.threats
+    )
+    decided = np.abs(result.material) >= WIN
+    score[decided] = result.material[decided]
+    return score
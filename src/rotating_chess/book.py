@@ -0,0 +1,326 @@
+"""
+an opening book: the moves played from early positions across many games, so an
+engine can play them straight away rather than search.
+
+building one reads game saves and, for each ply (see analysis.plies_of) in the first
+--turns turns, records the move (and the mover's rotation of the moved piece, if any)
+under its position: how many games played it, and how they went for the mover (1 a
+win, 0.5 neither king taken, 0 a loss). positions are keyed by
+symmetry.canonical_to_move, so the mirrored position, or the flipped one with the
+other side to move, share an entry, and moves are stored transformed to match, in
+fixed-point units (see fixed.py).
+
+layout (little endian throughout):
+    header  magic, format version, slot count (a power of two), moves offset
+    slots   a hash table of positions, by key: key, first move, move count.
+            empty slots have no moves. open addressing, probing linearly, and at
+            most half full, so a probe reads a slot or two
+    moves   each position's, most played (then best scoring) first: from x, y, to
+            x, y, rotation angle (NO_ROTATION if none), games, mean score
+
+the file is mmap'd, so opening a book is instant and probing one is a hash, a slot
+read or two and its moves, however many positions it has.
+
+    uv run python -m rotating_chess.book build book.rcb game_saves/ --turns 16
+    uv run python -m rotating_chess.book probe book.rcb game_saves/some_save.txt --turn 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from rotating_chess import fixed
+from rotating_chess.analysis import PATTERN, plies_of
+from rotating_chess.engine import has_king
+from rotating_chess.pieces import Board, PieceState, Side
+from rotating_chess.plies import Ply, PlyGenerator, is_rotation, other
+from rotating_chess.saveio import read_save_file
+from rotating_chess.symmetry import (
+    Symmetry,
+    canonical_to_move,
+    transform_unit_values,
+    transform_units,
+)
+
+MAGIC = b"RCOPBOOK"
+FORMAT_VERSION = 1
+# magic, format version, slot count, moves offset
+HEADER = struct.Struct("<8sIIQ")
+# key, first move, move count
+SLOT = struct.Struct("<QIH")
+# from x, y, to x, y, rotation angle, games, mean score
+MOVE = struct.Struct("<iiiiiIf")
+NO_ROTATION = -1
+# more moves than a slot can count are dropped, least played first
+MAX_MOVES = (1 << 16) - 1
+
+
+class BookMove(NamedTuple):
+    # in fixed-point units
+    from_x: int
+    from_y: int
+    to_x: int
+    to_y: int
+    # what the moved piece then rotates to, in angle units, if it does
+    angle: int | None
+    games: int
+    # for the mover, per game
+    score: float
+
+
+def played_move(
+    before: Board, moved: Board, after: Board, side: Side
+) -> tuple[PieceState, PieceState, float | None] | None:
+    """
+    the piece that moved from before to moved, where it went, and what it then
+    rotated to by after (None if it didn't). None if the ply isn't a move of one piece
+    """
+    if is_rotation(before, moved):
+        return None
+    was, now = set(before), set(moved)
+    gone = [state for state in before if state.side == side and state not in now]
+    new = [state for state in moved if state.side == side and state not in was]
+    if len(gone) != 1 or len(new) != 1:
+        return None
+    angle = None
+    turned = next(
+        (s for s in after if s.side == side and s.x == new[0].x and s.y == new[0].y),
+        None,
+    )
+    if turned is not None and turned.angle != new[0].angle:
+        angle = turned.angle
+    return gone[0], new[0], angle
+
+
+def score_for(board: Board, side: Side) -> float:
+    """how a game that ended on board went for side"""
+    if not has_king(board, side):
+        return 0.0
+    if not has_king(board, other(side)):
+        return 1.0
+    return 0.5
+
+
+def mine(
+    boards: list[Board], turns: int
+) -> Iterator[tuple[int, tuple[int, int, int, int, int], float]]:
+    """
+    (position key, move in canonical units, score for the mover) of each move played
+    in a game's first turns turns
+    """
+    for start, end, side in plies_of(boards):
+        if start >= turns:
+            break
+        move = played_move(boards[start], boards[start + 1], boards[end], side)
+        if move is None:
+            continue
+        key, symmetry = canonical_to_move(boards[start], side)
+        was, now, angle = move
+        *_, from_x, from_y, _ = transform_units(was, symmetry)
+        *_, to_x, to_y, _ = transform_units(now, symmetry)
+        rotation = NO_ROTATION
+        if angle is not None:
+            rotation = transform_units(now._replace(angle=angle), symmetry)[4]
+        yield key, (from_x, from_y, to_x, to_y, rotation), score_for(boards[-1], side)
+
+
+def build(games: Iterable[list[Board]], path: Path, turns: int = 16) -> int:
+    """writes the book of games' first turns turns to path. returns how many positions"""
+    # key -> move -> [games, total score]
+    positions: dict[int, dict[tuple[int, int, int, int, int], list[float]]] = {}
+    for boards in games:
+        for key, move, score in mine(boards, turns):
+            stats = positions.setdefault(key, {}).setdefault(move, [0, 0.0])
+            stats[0] += 1
+            stats[1] += score
+
+    slots = 2
+    while slots < 2 * len(positions):
+        slots *= 2
+    table = [SLOT.pack(0, 0, 0)] * slots
+    moves = bytearray()
+    count = 0
+    for key, played in positions.items():
+        ranked = sorted(
+            played.items(), key=lambda item: (-item[1][0], -item[1][1] / item[1][0])
+        )[:MAX_MOVES]
+        slot = key & (slots - 1)
+        while table[slot] != SLOT.pack(0, 0, 0):
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = SLOT.pack(key, count, len(ranked))
+        for move, (times, total) in ranked:
+            moves += MOVE.pack(*move, int(times), total / times)
+        count += len(ranked)
+
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, slots, HEADER.size + slots * SLOT.size)
+        )
+        f.write(b"".join(table))
+        f.write(moves)
+    return len(positions)
+
+
+class Book:
+    """
+    reads a book through mmap
+
+    >>> import tempfile
+    >>> from rotating_chess.plies import start_board
+    >>> board = start_board()
+    >>> moved = board[:9] + (board[9]._replace(y=225),) + board[10:]  # e2 -> e4
+    >>> path = Path(tempfile.mkdtemp()) / "book.rcb"
+    >>> build([[board, moved]], path)
+    1
+    >>> with Book(path) as book:
+    ...     [(fixed.from_units(m.to_x), fixed.from_units(m.to_y), m.games) for m in book.probe(board, Side.WHITE)]
+    [(225.0, 225.0, 1)]
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.__slots, self.__moves = HEADER.unpack_from(self.__mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't an opening book")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} is book version {version}, not {FORMAT_VERSION}")
+
+    def lookup(self, key: int) -> list[BookMove]:
+        """the moves stored under a position key, as stored (canonical)"""
+        slot = key & (self.__slots - 1)
+        while True:
+            stored, first, count = SLOT.unpack_from(
+                self.__mmap, HEADER.size + slot * SLOT.size
+            )
+            if count == 0:
+                return []
+            if stored == key:
+                break
+            slot = (slot + 1) & (self.__slots - 1)
+        moves = []
+        for n in range(first, first + count):
+            from_x, from_y, to_x, to_y, angle, games, score = MOVE.unpack_from(
+                self.__mmap, self.__moves + n * MOVE.size
+            )
+            if angle == NO_ROTATION:
+                angle = None
+            moves.append(BookMove(from_x, from_y, to_x, to_y, angle, games, score))
+        return moves
+
+    def probe(self, board: Board, side: Side) -> list[BookMove]:
+        """side's moves from board, most played first, in board's own units"""
+        key, symmetry = canonical_to_move(board, side)
+        # every symmetry is its own inverse
+        return [untransform(move, symmetry) for move in self.lookup(key)]
+
+    def choose(
+        self, board: Board, side: Side, plies: PlyGenerator, min_games: int = 1
+    ) -> tuple[Ply, Board] | None:
+        """
+        the most played move from board (played by at least min_games games) that's
+        a ply plies finds, and the board it leads to
+        """
+        moves = [move for move in self.probe(board, side) if move.games >= min_games]
+        if not moves:
+            return None
+        plies.load(board)
+        legal = plies.moves(side)
+        for move in moves:
+            for idx, n, x, y in legal:
+                state = board[idx]
+                if (
+                    fixed.to_units(state.x) == move.from_x
+                    and fixed.to_units(state.y) == move.from_y
+                    and fixed.to_units(x) == move.to_x
+                    and fixed.to_units(y) == move.to_y
+                ):
+                    child, moved = plies.play(board, idx, x, y)
+                    if move.angle is None:
+                        return Ply(idx, n, x, y, moved), child
+                    angle = fixed.angle_from_units(move.angle)
+                    rotated = child[moved]._replace(angle=angle)
+                    return (
+                        Ply(idx, n, x, y, moved, angle),
+                        child[:moved] + (rotated,) + child[moved + 1 :],
+                    )
+        return None
+
+    def close(self) -> None:
+        self.__mmap.close()
+
+    def __enter__(self) -> Book:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def untransform(move: BookMove, symmetry: Symmetry) -> BookMove:
+    from_x, from_y, _ = transform_unit_values(move.from_x, move.from_y, 0, symmetry)
+    to_x, to_y, angle = transform_unit_values(
+        move.to_x, move.to_y, move.angle or 0, symmetry
+    )
+    return move._replace(
+        from_x=from_x,
+        from_y=from_y,
+        to_x=to_x,
+        to_y=to_y,
+        angle=None if move.angle is None else angle,
+    )
+
+
+def read_saves(paths: Iterable[Path]) -> Iterator[list[Board]]:
+    """the boards of every readable save"""
+    for path in paths:
+        try:
+            yield read_save_file(path)
+        except Exception as e:
+            print(f"skipping {path}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="builds and probes opening books")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="build a book from game saves")
+    build_parser.add_argument("book", type=Path)
+    build_parser.add_argument(
+        "saves", type=Path, nargs="+", help="save files, or directories of them"
+    )
+    build_parser.add_argument(
+        "--turns", type=int, default=16, help="how many turns of each game to mine"
+    )
+    probe_parser = commands.add_parser("probe", help="a save's position's book moves")
+    probe_parser.add_argument("book", type=Path)
+    probe_parser.add_argument("save", type=Path)
+    probe_parser.add_argument("--turn", type=int, default=-1)
+    probe_parser.add_argument("--side", choices=["white", "black"], default="white")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        paths = [
+            found
+            for path in args.saves
+            for found in (sorted(path.rglob(PATTERN)) if path.is_dir() else [path])
+        ]
+        positions = build(read_saves(paths), args.book, args.turns)
+        print(f"{positions} positions from {len(paths)} saves into {args.book}")
+    else:
+        board = read_save_file(args.save)[args.turn]
+        with Book(args.book) as book:
+            for move in book.probe(board, Side[args.side.upper()]):
+                rotation = (
+                    ""
+                    if move.angle is None
+                    else f", rotating to {fixed.angle_from_units(move.angle):.2f}"
+                )
+                print(
+                    f"({fixed.from_units(move.from_x)}, {fixed.from_units(move.from_y)})"
+                    f" -> ({fixed.from_units(move.to_x)}, {fixed.from_units(move.to_y)})"
+                    f"{rotation}: {move.games} games, scoring {move.score:.2f}"
+                )
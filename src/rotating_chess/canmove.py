@@ -0,0 +1,60 @@
+"""
+Pieces.canmove for many points at once, vectorized with numpy.
+
+Pieces.canmove checks one point at a time, looping over every piece in python, so
+finding all of a piece's legal moves is (points x pieces) python-level distance
+checks. canmove_points does the same checks, in the same order and with the same
+float operations (so with the very same results) as whole-array operations over
+every (piece, point) pair at once. Pieces keeps its pieces' centres in an array for
+it, so a board's array is only built once however many moves are checked.
+
+numpy is a dependency, but optional here (the browser build doesn't have it). without
+it, HAVE_NUMPY is False and Pieces.canmove_many falls back to Pieces.canmove, which
+stays the reference.
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def canmove_points(
+    start: tuple[float, float],
+    can_jump: bool,
+    same_side: np.ndarray,
+    centres: np.ndarray,
+    points: np.ndarray,
+    radius: float,
+) -> np.ndarray:
+    """
+    for each of points (an (n, 2) array), whether a piece at start may move there,
+    by the rules of Pieces.canmove. centres are the other pieces' (an (m, 2) array),
+    same_side whether each is on the moving piece's side. radius is the hitcircle's.
+    """
+    start_x, start_y = start
+    end_x, end_y = points[:, 0], points[:, 1]
+    # (pieces, points) from here on
+    x, y = centres[:, 0:1], centres[:, 1:2]
+
+    # pieces overlapping each endpoint. one of our own there means no
+    overlapping = (end_x - x) ** 2 + (end_y - y) ** 2 < (radius * 2) ** 2
+    ok = ~(overlapping & same_side[:, None]).any(axis=0)
+    if can_jump:
+        return ok
+
+    # pieces in the way: in front of us, not past the end (and its hitcircle), and
+    # within two hitcircles of the line there. capturing at the end is fine.
+    u_x, u_y = end_x - start_x, end_y - start_y
+    v_x, v_y = x - start_x, y - start_y
+    with np.errstate(divide="ignore", invalid="ignore"):
+        length = np.sqrt(u_x**2 + u_y**2)
+        comp = (u_x * v_x + u_y * v_y) / length
+        in_range = (0 < comp) & (comp < np.sqrt(u_x**2 + u_y**2) + radius)
+        near_line = np.abs(u_x * v_y - v_x * u_y) / length < 2 * radius
+    in_the_way = in_range & near_line & ~overlapping
+    return ok & ~in_the_way.any(axis=0)
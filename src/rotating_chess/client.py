@@ -0,0 +1,171 @@
+"""
+plays a Game hosted by rotating_chess.server.
+
+local turns are sent to the server as they're recorded; the server's deltas are
+applied to the local game by poll(), which is cheap enough to call every frame.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from rotating_chess.debug import dprint
+from rotating_chess.game import Game
+from rotating_chess.history import TurnNode
+from rotating_chess.pieces import Side, Move, action_from_JSON, action_to_JSON
+from rotating_chess.spectate import encode
+
+
+def same_action(a, b) -> bool:
+    """whether two actions are the same, ignoring float noise in points and angles"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, Move):
+        return a.piece == b.piece and abs(a.x - b.x) < 1e-6 and abs(a.y - b.y) < 1e-6
+    return len(a.rotations) == len(b.rotations) and all(
+        i == j and abs(x - y) < 1e-9 for (i, x), (j, y) in zip(a.rotations, b.rotations)
+    )
+
+
+class GameClient:
+    """a connection to a server, playing one of its games."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.__reader = reader
+        self.__writer = writer
+        self.__inbox: asyncio.Queue[dict] = asyncio.Queue()
+        self.__reader_task: asyncio.Task | None = None
+        self.game: Game | None = None
+        # true while we're applying the server's turns, so we don't echo them back
+        self.__applying = False
+        self.rejections = 0
+
+    @staticmethod
+    async def connect(host: str, port: int) -> GameClient:
+        reader, writer = await asyncio.open_connection(host, port)
+        return GameClient(reader, writer)
+
+    async def join(self, game: Game, game_id: str, side: Side | None) -> None:
+        """
+        joins game_id on the server, loading it into game. waits for the welcome.
+        raises RuntimeError if the server turns us away, e.g. if side is taken.
+        """
+        await self.__enter(
+            game,
+            {
+                "op": "join",
+                "game": game_id,
+                "side": None if side is None else side.value,
+            },
+        )
+
+    async def watch(self, game: Game, game_id: str) -> None:
+        """spectates game_id on the server, loading it into game. waits for the welcome."""
+        await self.__enter(game, {"op": "watch", "game": game_id})
+
+    async def __enter(self, game: Game, request: dict) -> None:
+        self.__writer.write(encode(request))
+        await self.__writer.drain()
+        while True:
+            msg = json.loads(await self.__reader.readline())
+            if msg["op"] == "welcome":
+                break
+            if msg["op"] == "reject":
+                raise RuntimeError(f"server rejected {request['op']}: {msg['reason']}")
+        self.game = game
+        self.__welcome(msg)
+        if request["op"] == "join":
+            # spectators can't act, so they don't send their turns
+            game.nav.subscribe(self.__on_turn)
+        self.__reader_task = asyncio.create_task(self.__read())
+
+    async def __read(self) -> None:
+        while line := await self.__reader.readline():
+            self.__inbox.put_nowait(json.loads(line))
+
+    async def close(self) -> None:
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+        self.__writer.close()
+
+    def __on_turn(self, node: TurnNode) -> None:
+        """sends turns we make locally to the server"""
+        if self.__applying or node.action is None:
+            return
+        assert node.parent is not None
+        self.__writer.write(
+            encode(
+                {
+                    "op": "act",
+                    "turn": node.parent.depth,
+                    "action": action_to_JSON(node.action),
+                }
+            )
+        )
+
+    def __welcome(self, msg: dict) -> None:
+        assert self.game is not None
+        self.__applying = True
+        try:
+            loaded = self.game.load_game_save(msg["save"])
+        finally:
+            self.__applying = False
+        if not loaded:
+            # resyncing would only get the same save again
+            raise RuntimeError("server sent an invalid save")
+
+    def poll(self) -> bool:
+        """applies everything the server has sent so far. returns whether the board changed."""
+        changed = False
+        while not self.__inbox.empty():
+            changed |= self.__handle(self.__inbox.get_nowait())
+        return changed
+
+    async def wait(self) -> bool:
+        """like poll, but first waits for the server to send something."""
+        changed = self.__handle(await self.__inbox.get())
+        return self.poll() or changed
+
+    def __handle(self, msg: dict) -> bool:
+        assert self.game is not None
+        if msg["op"] == "welcome":
+            self.__welcome(msg)
+            return True
+        if msg["op"] == "delta":
+            return self.__delta(msg["turn"], action_from_JSON(msg["action"]))
+        if msg["op"] == "deltas":
+            changed = False
+            for turn, action in enumerate(msg["actions"], start=msg["turn"]):
+                changed |= self.__delta(turn, action_from_JSON(action))
+            return changed
+        if msg["op"] == "reject":
+            dprint(f"server rejected: {msg['reason']}")
+            self.rejections += 1
+            self.__writer.write(encode({"op": "sync"}))
+        return False
+
+    def __delta(self, turn: int, action) -> bool:
+        assert self.game is not None
+        nav = self.game.nav
+        if turn < len(nav) and same_action(nav.get_action(turn), action):
+            # our own turn coming back
+            return False
+        if turn != len(nav):
+            # we've diverged from the server. it's authoritative
+            self.__writer.write(encode({"op": "sync"}))
+            return False
+
+        if not nav.last_noop():
+            nav.last()
+            self.game.sync()
+        self.__applying = True
+        try:
+            ok = self.game.apply(action)
+        finally:
+            self.__applying = False
+        if not ok:
+            self.__writer.write(encode({"op": "sync"}))
+        return ok
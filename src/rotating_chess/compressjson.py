@@ -1,4 +1,10 @@
 import zlib, json, base64
+import codecs
+import itertools
+import re
+from collections.abc import Iterable, Iterator
+
+from rotating_chess.zdicts import ZDICTS, by_id
 
 
 def json_compress(j):
@@ -13,9 +19,24 @@ def json_compress(j):
     ...
     TypeError: Object of type set is not JSON serializable
     """
-    return base64.b64encode(zlib.compress(json.dumps(j).encode("utf-8"))).decode(
-        "utf-8"
-    )
+    return text_compress(json.dumps(j))
+
+
+def text_compress(s: str, zdict: bytes | None = None) -> str:
+    """
+    compresses already-encoded json, the second half of json_compress.
+    with a preset dictionary (see zdicts.py) if given, which decompressing picks
+    by itself as long as it's one of zdicts.ZDICTS.
+
+    >>> text_compress('{"hello": "world!"}') == json_compress({"hello": "world!"})
+    True
+    """
+    if zdict is None:
+        data = zlib.compress(s.encode("utf-8"))
+    else:
+        compressor = zlib.compressobj(zdict=zdict)
+        data = compressor.compress(s.encode("utf-8")) + compressor.flush()
+    return base64.b64encode(data).decode("utf-8")
 
 
 def json_decompress(s: str):
@@ -25,4 +46,80 @@ def json_decompress(s: str):
     >>> json_decompress(json_compress({"hello": "world!"}))
     {'hello': 'world!'}
     """
-    return json.loads(zlib.decompress(base64.b64decode(s)))
+    return json.loads(text_decompress(s))
+
+
+def text_decompress(s: str) -> str:
+    """
+    decompresses a string compressed by json_compress, without decoding the json.
+
+    >>> text_decompress(json_compress({"hello": "world!"}))
+    '{"hello": "world!"}'
+    """
+    return "".join(iter_text_decompress([s]))
+
+
+# how much text iter_text_decompress inflates at a time
+INFLATE_CHUNK = 1 << 16
+NOT_BASE64 = re.compile(r"[^A-Za-z0-9+/=]")
+ZDICTS_BY_ID = by_id(ZDICTS.values())
+# the zlib header flag saying a preset dictionary's id follows
+FDICT = 0x20
+
+
+def decompressor_for(head: bytes):
+    """
+    a decompressobj for zlib data starting with head (its first 6 bytes, or all of it),
+    with the preset dictionary the header asks for, if any.
+    """
+    if len(head) >= 6 and head[1] & FDICT:
+        dict_id = int.from_bytes(head[2:6], "big")
+        if dict_id not in ZDICTS_BY_ID:
+            raise ValueError(f"unknown preset dictionary {dict_id:#x}")
+        return zlib.decompressobj(zdict=ZDICTS_BY_ID[dict_id])
+    return zlib.decompressobj()
+
+
+def iter_text_decompress(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    text_decompress, for a string that comes in chunks (e.g. read from a file).
+    holds at most a chunk and INFLATE_CHUNK of text in memory at once, however big
+    the whole thing is. raises ValueError if it's cut short.
+
+    >>> s = json_compress({"hello": "world!"})
+    >>> "".join(iter_text_decompress([s[:5], s[5:7], s[7:]]))
+    '{"hello": "world!"}'
+    """
+    # made once we've seen the header, which says which dictionary we need
+    inflater = None
+    head = b""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    leftover = ""
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is not None:
+            # like b64decode, ignore anything that isn't base64 (e.g. newlines)
+            chunk = leftover + NOT_BASE64.sub("", chunk)
+            usable = len(chunk) - len(chunk) % 4
+            leftover = chunk[usable:]
+            data = base64.b64decode(chunk[:usable])
+        else:
+            data = b""
+        if inflater is None:
+            head += data
+            if len(head) < 6 and chunk is not None:
+                continue
+            inflater = decompressor_for(head)
+            data = head
+        while data:
+            text = utf8.decode(inflater.decompress(data, INFLATE_CHUNK))
+            data = inflater.unconsumed_tail
+            if text:
+                yield text
+    if leftover:
+        raise ValueError("base64 ended mid-quad")
+    assert inflater is not None
+    text = utf8.decode(inflater.flush(), final=True)
+    if text:
+        yield text
+    if not inflater.eof:
+        raise ValueError("compressed data ended early")
@@ -0,0 +1,229 @@
+"""
+a small search engine: evaluates boards and searches plies (see plies.py) for the best.
+
+evaluate() scores a board for one side, in pawns: material, plus a little for pieces
+near the centre, plus (if weighted, since it means finding every move of both sides)
+how many more plies that side has than the other. losing the king loses the game.
+
+Engine.search is iterative deepening negamax with alpha-beta pruning, captures first.
+it yields a Suggestion every time its best ply changes, and once each depth is done,
+so a caller can show something right away and better plies as they're found. it checks
+should_stop every few nodes, so stale searches end quickly. with an opening book (see
+book.py) that has a move for the board, it plays that instead, without searching.
+
+>>> from rotating_chess.plies import start_board
+>>> engine = Engine(max_depth=1)
+>>> best = list(engine.search(start_board(), Side.WHITE))[-1]
+>>> best.depth, best.complete
+(1, True)
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+from rotating_chess import settings
+from rotating_chess.pieces import Board, Side
+from rotating_chess.plies import Generator, Ply, PlyGenerator, angle_set, fastest, other
+
+# book uses this module. this block and __future__'s annotations fixes type checking
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rotating_chess.book import Book
+
+# further than this from the board's centre gets no centre bonus (the normal board's
+# corners are ~283 away)
+CENTRE_REACH = 300
+# a won game, in pawns. more than any material
+WIN = 10_000.0
+# how many nodes go by between should_stop checks
+STOP_EVERY = 64
+
+
+class Weights(NamedTuple):
+    """what evaluate() counts, and how much. per piece values are in pawns"""
+
+    pawn: float = 1.0
+    knight: float = 3.0
+    bishop: float = 3.0
+    rook: float = 5.0
+    queen: float = 9.0
+    # per piece, for being right at the centre, down to none CENTRE_REACH away
+    centre: float = 0.1
+    # per ply more than the other side
+    mobility: float = 0.0
+
+    def value(self, piece_name: str) -> float:
+        return 0.0 if piece_name == "king" else getattr(self, piece_name)
+
+
+def has_king(board: Board, side: Side) -> bool:
+    return any(s.piece_name == "king" and s.side == side for s in board)
+
+
+def evaluate(
+    board: Board,
+    side: Side,
+    weights: Weights = Weights(),
+    plies: PlyGenerator | None = None,
+) -> float:
+    """
+    how good board is for side, in pawns. plies is only needed (and only used) with
+    weights.mobility
+    """
+    if not has_king(board, side):
+        return -WIN
+    if not has_king(board, other(side)):
+        return WIN
+    score = 0.0
+    centre_x, centre_y = settings.BOARD.centre
+    for state in board:
+        distance = math.hypot(state.x - centre_x, state.y - centre_y)
+        value = weights.value(state.piece_name) + weights.centre * max(
+            0.0, 1 - distance / CENTRE_REACH
+        )
+        score += value if state.side == side else -value
+    if weights.mobility and plies is not None:
+        mobility = plies.count(board, side) - plies.count(board, other(side))
+        score += weights.mobility * mobility
+    return score
+
+
+class Suggestion(NamedTuple):
+    # how deep the search that found it went (0: it's the opening book's)
+    depth: int
+    ply: Ply
+    # for the side to move, in pawns
+    score: float
+    # nodes searched so far, and for how long
+    nodes: int
+    seconds: float
+    # whether the whole depth was searched, rather than only some of it so far
+    complete: bool
+
+
+class Stopped(Exception):
+    pass
+
+
+class Engine:
+    def __init__(
+        self,
+        weights: Weights = Weights(),
+        angles: int = 4,
+        max_depth: int = 3,
+        generator: Generator | None = None,
+        book: Book | None = None,
+    ) -> None:
+        """angles: how many rotation angles plies use. generator: see plies.py"""
+        self.weights = weights
+        self.max_depth = max_depth
+        self.book = book
+        self.__plies = PlyGenerator(
+            fastest() if generator is None else generator, angle_set(angles)
+        )
+        self.__should_stop: Callable[[], bool] = lambda: False
+        self.nodes = 0
+
+    @property
+    def plies(self) -> PlyGenerator:
+        return self.__plies
+
+    def evaluate(self, board: Board, side: Side) -> float:
+        return evaluate(board, side, self.weights, self.__plies)
+
+    def value(self, board: Board, side: Side, depth: int) -> float:
+        """how good board is for side, to move, searched depth plies deep"""
+        self.__should_stop = lambda: False
+        return self.__negamax(board, side, depth, -math.inf, math.inf)
+
+    def search(
+        self,
+        board: Board,
+        side: Side,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> Iterator[Suggestion]:
+        """
+        suggestions for side on board, better and deeper as they go. ends after
+        max_depth, when should_stop() (checked every STOP_EVERY nodes), or right away
+        if side has no plies, or if the book has a move.
+        """
+        self.__should_stop = should_stop
+        self.nodes = 0
+        start = time.perf_counter()
+        if self.book is not None:
+            found = self.book.choose(board, side, self.__plies)
+            if found is not None:
+                ply, child = found
+                score = self.evaluate(child, side)
+                yield Suggestion(0, ply, score, 0, time.perf_counter() - start, True)
+                return
+        children = self.__ordered(board, side)
+        try:
+            for depth in range(1, self.max_depth + 1):
+                best: tuple[Ply, float] | None = None
+                alpha = -math.inf
+                for ply, child in children:
+                    score = -self.__negamax(
+                        child, other(side), depth - 1, -math.inf, -alpha
+                    )
+                    if best is None or score > best[1]:
+                        best = ply, score
+                        alpha = score
+                        yield Suggestion(
+                            depth,
+                            ply,
+                            score,
+                            self.nodes,
+                            time.perf_counter() - start,
+                            False,
+                        )
+                if best is None:
+                    return
+                yield Suggestion(
+                    depth, *best, self.nodes, time.perf_counter() - start, True
+                )
+                # search the best first next time around: it prunes the most
+                children.sort(key=lambda pair: pair[0] != best[0])
+                if abs(best[1]) >= WIN:
+                    return
+        except Stopped:
+            return
+
+    def best(self, board: Board, side: Side) -> Suggestion | None:
+        """the deepest suggestion search() makes"""
+        suggestion = None
+        for suggestion in self.search(board, side):
+            pass
+        return suggestion
+
+    def __ordered(self, board: Board, side: Side) -> list[tuple[Ply, Board]]:
+        """side's plies from board, and what they lead to. captures (fewer pieces) first"""
+        return sorted(self.__plies.children(board, side), key=lambda pair: len(pair[1]))
+
+    def __negamax(
+        self, board: Board, side: Side, depth: int, alpha: float, beta: float
+    ) -> float:
+        self.nodes += 1
+        if self.nodes % STOP_EVERY == 0 and self.__should_stop():
+            raise Stopped
+        if not has_king(board, side):
+            # the sooner the better (or the later the better, for the loser)
+            return -WIN - depth
+        if depth == 0:
+            return self.evaluate(board, side)
+
+        best = -math.inf
+        for _, child in self.__ordered(board, side):
+            score = -self.__negamax(child, other(side), depth - 1, -beta, -alpha)
+            if score > best:
+                best = score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+        # no plies at all: nothing to do but sit there
+        return self.evaluate(board, side) if best == -math.inf else best
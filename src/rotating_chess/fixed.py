@@ -0,0 +1,82 @@
+"""
+fixed-point positions and angles, for settings.FIXED_POINT.
+
+positions are whole sub-pixels (1/SUBPIXELS of a pixel) and angles whole units
+(1/ANGLE_UNITS of a turn). pieces still hold floats, but with FIXED_POINT on, every
+position and angle a piece takes is snapped to those grids first. so the same move
+made two different ways lands on exactly the same float, and boards compare, hash and
+deduplicate exactly. to_units and angle_to_units give the integers back, exactly,
+for integer-only code (like Pieces.canmove's) and compact storage.
+
+SUBPIXELS is a power of two, so snapped positions are exact floats (e.g. 175.0,
+245.703125) and print short. angles are multiples of 2pi/ANGLE_UNITS, normalized to
+(-pi, pi]; those aren't short, but they are always the very same floats.
+
+>>> snap(175.0000001), snap(24.999999999999986)
+(175.0, 25.0)
+>>> snap_angle(math.pi) == snap_angle(-math.pi) == math.pi
+True
+>>> angle_from_units(angle_to_units(1.0)) == snap_angle(1.0)
+True
+"""
+
+from __future__ import annotations
+
+import math
+
+# pieces uses this module. this block and __future__'s annotations fixes type checking
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rotating_chess.pieces import PieceState
+
+SUBPIXELS = 256
+ANGLE_UNITS = 1 << 16
+ANGLE_UNIT = 2 * math.pi / ANGLE_UNITS
+
+
+def to_units(v: float) -> int:
+    return round(v * SUBPIXELS)
+
+
+def from_units(units: int) -> float:
+    return units / SUBPIXELS
+
+
+def snap(v: float) -> float:
+    """v, rounded to the nearest sub-pixel"""
+    return from_units(to_units(v))
+
+
+def angle_to_units(angle: float) -> int:
+    """angle (in radians), in units in [0, ANGLE_UNITS)"""
+    return round(angle / ANGLE_UNIT) % ANGLE_UNITS
+
+
+def angle_from_units(units: int) -> float:
+    """the angle, in radians in (-pi, pi] (like atan2's), of some units"""
+    units %= ANGLE_UNITS
+    if units > ANGLE_UNITS // 2:
+        units -= ANGLE_UNITS
+    return units * ANGLE_UNIT
+
+
+def snap_angle(angle: float) -> float:
+    """angle (in radians), rounded to the nearest unit"""
+    return angle_from_units(angle_to_units(angle))
+
+
+def snap_state(state: PieceState) -> PieceState:
+    snapped = state._replace(
+        x=snap(state.x), y=snap(state.y), angle=snap_angle(state.angle)
+    )
+    # keep the very same object if it was already snapped, so boards stay shared
+    return state if snapped == state else snapped
+
+
+def is_snapped(state: PieceState) -> bool:
+    return (
+        snap(state.x) == state.x
+        and snap(state.y) == state.y
+        and snap_angle(state.angle) == state.angle
+    )
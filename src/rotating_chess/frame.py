@@ -0,0 +1,106 @@
+"""
+one frame of the game: handling its input, then drawing it.
+
+main.py runs these in its loop. they're split up (and out of main.py, which opens a
+window as it starts) so headless.py can drive the very same code with scripted input,
+timing each part.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pygame
+from pygame.event import Event
+from pygame.locals import QUIT
+
+from rotating_chess import settings
+from rotating_chess.geometry import PANEL_HEIGHT, PANEL_WIDTH, TILE
+from rotating_chess.widgets import MOUSE_HELD, SAVE_IO_DONE
+
+# gamestate is a circular import
+# this block and __future__'s annotations fixes type checking
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rotating_chess.gamestate import GameState
+    from rotating_chess.recording import Recorder
+
+# pygame only knows our own events as "UserEvent"
+EVENT_NAMES = {MOUSE_HELD: "MouseHeld", SAVE_IO_DONE: "SaveIODone"}
+
+
+def update(gs: GameState, recorder: Recorder | None = None):
+    if pygame.mouse.get_pressed()[0]:
+        pygame.event.post(Event(MOUSE_HELD))
+
+    events = pygame.event.get()
+    x, y = pygame.mouse.get_pos()
+    if recorder is not None:
+        recorder.record(events, x, y)
+    handle_events(gs, events, x, y)
+
+
+def event_name(event: Event) -> str:
+    return EVENT_NAMES.get(event.type) or pygame.event.event_name(event.type)
+
+
+def handle_events(
+    gs: GameState,
+    events: list[Event],
+    x: int,
+    y: int,
+    timings: dict[str, list[float]] | None = None,
+):
+    """
+    has every widget handle events, with the mouse at x, y.
+    if timings is given, adds how long each event took to timings[its name].
+    """
+    gs.one_clicked = False
+
+    for event in events:
+        start = time.perf_counter()
+        for widget in gs.widgets.__dict__.values():
+            widget.handle_event(event, gs, x, y)
+
+        if event.type == QUIT:
+            gs.playing = False
+        if timings is not None:
+            timings.setdefault(event_name(event), []).append(
+                time.perf_counter() - start
+            )
+
+
+def draw(screen: pygame.Surface, gs: GameState):
+    """
+    Draw things to the window. Called once per frame.
+    """
+    draw_board(screen)
+    # draw widgets
+    for widget in gs.widgets.__dict__.values():
+        widget.draw(screen, gs)
+
+    pygame.display.update()
+
+
+def draw_board(screen: pygame.Surface):
+    # draw board tiles
+    screen.fill(settings.BOARD_COLOR)
+
+    board = settings.BOARD
+    # light tiles where file and rank (counting from the top) are both even or odd
+    for file in range(board.files):
+        for row in range(file % 2, board.ranks, 2):
+            pygame.draw.rect(
+                screen,
+                settings.BACKGROUND_COLOR,
+                (file * TILE, row * TILE, TILE, TILE),
+            )
+
+    # draw "cover" for pieces in case they leak over to the selection panel
+    # TODO: this doesn't actually do anything anymore. need to get
+    # LayeredUpdates working and make all these widgets.
+    # ie only thing in this function should be screen.fill board color and draw all widgets
+    pygame.draw.rect(
+        screen, settings.BOARD_COLOR, (board.width, 0, PANEL_WIDTH, PANEL_HEIGHT)
+    )
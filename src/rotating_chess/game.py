@@ -0,0 +1,216 @@
+import math
+import random
+from collections.abc import Iterator
+
+import pygame
+
+from rotating_chess import settings
+from rotating_chess.pieces import Piece, Side, Move, Rotate, Action
+from rotating_chess.widgets import Pieces
+from rotating_chess.history import TurnNavigation, parse_game_save
+
+# how close a requested move has to be to one of the piece's movable points.
+# points are recomputed on every machine, so they may disagree in the last few bits.
+POINT_TOLERANCE = 1e-6
+
+
+class Game:
+    """
+    everything one game needs and nothing else: the board, its history, and the selection.
+    no display, no assets needed and no shared state, so one process can host as many as it likes.
+
+    the board is addressed by index into `pieces.pieces`, which is also how actions are
+    recorded, so applying the same actions to two games keeps them in sync.
+
+    >>> g = Game()
+    >>> g.move(g.find(225, 325), 225, 225)  # e2 -> e4
+    True
+    >>> len(g.nav)
+    2
+    >>> g.move(g.find(175, 375), 175, 175)  # d1 -> d5, blocked by the d2 pawn
+    False
+    """
+
+    def __init__(
+        self,
+        pieces: list[Piece] | None = None,
+        assets: dict[str, pygame.Surface] | None = None,
+        piece_skin: settings.PieceSkin | None = None,
+    ) -> None:
+        """
+        starts from pieces, or from the normal board if None.
+        use with None assets in testing (or on a server) when we don't care about visual
+        """
+        self.assets = assets
+        self.piece_skin = piece_skin
+        self.pieces: Pieces = Pieces(pieces)
+        if pieces is None:
+            self.pieces.load_normal_board(assets, piece_skin)
+        self.nav: TurnNavigation = TurnNavigation(self.pieces.pieces)
+
+    def find(self, x: float, y: float) -> int:
+        """index of the piece centered at x, y. raises ValueError if there isn't one."""
+        for idx, piece in enumerate(self.pieces.pieces):
+            if (
+                abs(piece.get_x() - x) < POINT_TOLERANCE
+                and abs(piece.get_y() - y) < POINT_TOLERANCE
+            ):
+                return idx
+        raise ValueError(f"no piece at {x}, {y}")
+
+    def select(self, idx: int) -> Piece:
+        """makes the piece at idx the only selected piece, initializing it if needed"""
+        self.deselect()
+        piece = self.pieces.pieces[idx]
+        if piece.needs_init:
+            piece.init()
+        piece.selected = True
+        self.pieces.selected_pieces.append(piece)
+        return piece
+
+    def deselect(self) -> None:
+        for piece in self.pieces.selected_pieces:
+            piece.selected = False
+            piece.stop_previewing()
+        self.pieces.selected_pieces.clear()
+
+    def movable_point(
+        self, piece: Piece, x: float, y: float
+    ) -> tuple[float, float] | None:
+        """the movable point of piece at x, y (within POINT_TOLERANCE), if any"""
+        for point_x, point_y in piece.get_movable_points():
+            if (
+                abs(point_x - x) < POINT_TOLERANCE
+                and abs(point_y - y) < POINT_TOLERANCE
+            ):
+                return point_x, point_y
+        return None
+
+    def can_move(self, idx: int, x: float, y: float) -> bool:
+        """whether the piece at idx may move to x, y. leaves nothing selected."""
+        if not 0 <= idx < len(self.pieces.pieces):
+            return False
+        piece = self.select(idx)
+        point = self.movable_point(piece, x, y)
+        ok = point is not None and self.pieces.canmove(piece, *point)
+        self.deselect()
+        return ok
+
+    def move(self, idx: int, x: float, y: float) -> bool:
+        """
+        moves the piece at idx to x, y and records the turn, if that's a legal move.
+        returns whether it was.
+        """
+        if not 0 <= idx < len(self.pieces.pieces) or not (
+            math.isfinite(x) and math.isfinite(y)
+        ):
+            return False
+        piece = self.select(idx)
+        point = self.movable_point(piece, x, y)
+        if point is None or not self.pieces.canmove(piece, *point):
+            self.deselect()
+            return False
+
+        self.pieces.move(piece, *point, None)
+        if piece not in self.pieces.pieces and self.assets is not None:
+            # promoted. Pieces.move only knows about assets through a GameState,
+            # so give the new queen (always appended last) its image.
+            self.pieces.pieces[-1] = Piece.from_state(
+                self.pieces.pieces[-1].to_state(), self.assets, self.piece_skin
+            )
+        self.nav.record_turn(
+            self.pieces.pieces, Move(idx, *point), self.pieces.zobrist()
+        )
+        return True
+
+    def rotate(self, rotations: tuple[tuple[int, float], ...]) -> bool:
+        """
+        rotates each (index, angle in radians) piece and records the turn.
+        returns False, changing nothing, if any index or angle is invalid.
+        """
+        if len(rotations) == 0 or not all(
+            0 <= idx < len(self.pieces.pieces) and math.isfinite(angle)
+            for idx, angle in rotations
+        ):
+            return False
+        self.deselect()
+        for idx, angle in rotations:
+            piece = self.pieces.pieces[idx]
+            if piece.needs_init:
+                piece.init()
+            self.pieces.rotate(piece, angle)
+        self.nav.record_turn(
+            self.pieces.pieces, Rotate(tuple(rotations)), self.pieces.zobrist()
+        )
+        return True
+
+    def sync(self) -> None:
+        """rebuilds the board from the history's current turn, e.g. after navigating it"""
+        self.deselect()
+        self.pieces.pieces = self.nav.get_curr_turn(self.assets, self.piece_skin)
+
+    def load_game_save(self, s: str) -> bool:
+        """replaces the whole history with a game save. returns False (changing nothing) if it's invalid."""
+        try:
+            boards = parse_game_save(s)
+            assert len(boards) > 0
+        except:
+            return False
+        self.nav.load_boards(boards)
+        self.sync()
+        return True
+
+    def apply(self, action: Action) -> bool:
+        """plays an action, as recorded by TurnNavigation. returns whether it was legal."""
+        if isinstance(action, Move):
+            return self.move(*action)
+        return self.rotate(action.rotations)
+
+    def legal_moves(self, side: Side | None = None) -> Iterator[Move]:
+        """every legal move (of side, if given) from the current board"""
+        for idx, piece in enumerate(self.pieces.pieces):
+            if side is not None and piece.get_side() != side:
+                continue
+            self.select(idx)
+            points = piece.get_movable_points()
+            points = [
+                point
+                for point, ok in zip(points, self.pieces.canmove_many(piece, points))
+                if ok
+            ]
+            self.deselect()
+            for point_x, point_y in points:
+                yield Move(idx, point_x, point_y)
+
+    def random_move(self, rng: random.Random, side: Side | None = None) -> Move | None:
+        moves = list(self.legal_moves(side))
+        return rng.choice(moves) if moves else None
+
+
+def random_script(
+    plies: int, rng: random.Random, rotate_chance: float = 0.5
+) -> list[Action]:
+    """
+    a random game from the normal board, for benchmarks and load tests.
+    sides alternate; every ply is a legal move, followed by a rotation of one of the
+    mover's pieces rotate_chance of the time.
+    """
+    game = Game()
+    script: list[Action] = []
+    for ply in range(plies):
+        side = Side.WHITE if ply % 2 == 0 else Side.BLACK
+        move = game.random_move(rng, side)
+        if move is None:
+            break
+        script.append(move)
+        game.apply(move)
+        if rng.random() < rotate_chance:
+            own = [
+                idx
+                for idx, piece in enumerate(game.pieces.pieces)
+                if piece.get_side() == side
+            ]
+            rotation = Rotate(((rng.choice(own), rng.uniform(-math.pi, math.pi)),))
+            script.append(rotation)
+            game.apply(rotation)
+    return script
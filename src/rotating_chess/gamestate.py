@@ -1,5 +1,6 @@
+from __future__ import annotations
+
 import os
-import copy
 from enum import Enum
 
 from pygame.math import Vector2
@@ -8,8 +9,10 @@ from rotating_chess.debug import dprint
 from rotating_chess.pieces import *
 from rotating_chess.widgets import *
 from rotating_chess import settings
-from rotating_chess.compressjson import json_compress, json_decompress
 from rotating_chess.locations import at
+from rotating_chess.history import TurnNavigation, TurnNode, parse_game_save
+from rotating_chess.game import Game
+from rotating_chess.notation import parse_position
 
 
 class Screen(Enum):
@@ -22,8 +25,16 @@ class Screen(Enum):
 #    low pieces
 #    low timer
 class GameState:
+    """
+    a Game plus everything needed to show it in a window: assets, fonts and widgets.
+    the game itself is self.game; self.nav and self.widgets.pieces are its history and board.
+    """
+
     def __init__(self) -> None:
         self.playing: bool = True
+        # if one button is clicked, we should prevent buttons "under" it from being clicked.
+        # reset every frame.
+        self.one_clicked: bool = False
 
         # loading assets
         self.assets: dict[str, pygame.Surface] = dict()
@@ -34,11 +45,16 @@ class GameState:
         # text = font.render('the creator of this game said they wanted to show you something cool.', True, (0,0,0), wraplength=MAP_WIDTH - 20)
 
         self.piece_skin: settings.PieceSkin = settings.SKIN
+        self.game = Game(None, self.assets, self.piece_skin)
         # invariant: forall Piece in selected_pieces, Piece.selected
         # invariant: forall Piece not in selected_pieces, not Piece.selected
 
         # fmt: off
         f_width, p_width, n_width, l_width = 58, 37, 41, 54
+        # the panel's left edge
+        left = settings.BOARD.width
+        # and its bottom edge, the window's (see BoardGeometry.window_size)
+        bottom = settings.BOARD.window_size()[1]
         class Widgets:
             """
             we essentially create a typed dict. 
@@ -46,34 +62,33 @@ class GameState:
             e.g. `gs.widgets.pieces` instead of `gs.pieces`.
             """
             def __init__(wself):
-                wself.pieces = Pieces()
-                wself.movesel = MoveSelector(center=(500, 200), radius=80)
-                wself.cancel_rot = CancelRot(self.assets["cross_white"], 500 - 28, 300)
-                wself.confirm_rot = ConfirmRot(self.assets["check_white"], 500 - 28, 50)
-                wself.nav_first_btn = NavFirst(self.assets["nav_first"], 400 + 3, 300)
-                wself.nav_prev_btn = NavPrev(self.assets["nav_prev"], 400 + 4 + f_width, 300)
-                wself.nav_next_btn = NavNext(self.assets["nav_next"], 400 + 5 + f_width + p_width, 300)
-                wself.nav_last_btn = NavLast(self.assets["nav_last"], 400 + 6 + f_width + p_width + n_width, 300)
-                wself.nav_prog = NavProgressBar(400, 600, 200)
-                wself.exp_save = ExportSave(self.assets["download"], 415, 10, self.font)
-                wself.imp_save = ImportSave(self.assets["upload"], 540, 10, self.font)
+                wself.pieces = self.game.pieces
+                wself.hint = HintOverlay(self.game.nav)
+                wself.movesel = MoveSelector(center=(left + 100, 200), radius=80)
+                wself.cancel_rot = CancelRot(self.assets["cross_white"], left + 100 - 28, 300)
+                wself.confirm_rot = ConfirmRot(self.assets["check_white"], left + 100 - 28, 50)
+                wself.nav_first_btn = NavFirst(self.assets["nav_first"], left + 3, 300)
+                wself.nav_prev_btn = NavPrev(self.assets["nav_prev"], left + 4 + f_width, 300)
+                wself.nav_next_btn = NavNext(self.assets["nav_next"], left + 5 + f_width + p_width, 300)
+                wself.nav_last_btn = NavLast(self.assets["nav_last"], left + 6 + f_width + p_width + n_width, 300)
+                wself.nav_prog = NavProgressBar(bottom, left + 200, 200)
+                wself.exp_save = ExportSave(self.assets["download"], left + 15, 10, self.font)
+                wself.imp_save = ImportSave(self.assets["upload"], left + 140, 10, self.font)
             __dict__: dict[str, Widget]
         self.widgets = Widgets()
 
         # self.widgets.pieces.load_chess_960(self.assets, self.piece_skin)
-        self.widgets.pieces.load_normal_board(self.assets, self.piece_skin)
-
-        # for testing: (remember to comment out load_normal above)
-        # self.widgets.pieces = Pieces([
-        #     Piece(*at("a7")-Vector2(0,10), math.radians(180), Side.BLACK, self.assets[f"piece_pawnB{self.piece_skin.value}"], "pawn"),
-        #     Piece(*at("b7")-Vector2(10,10), math.radians(180), Side.BLACK, self.assets[f"piece_pawnB{self.piece_skin.value}"], "pawn"),
-        #     Piece(*at("a8")-Vector2(0,0), math.radians(180), Side.BLACK, self.assets[f"piece_rookB{self.piece_skin.value}"], "rook"),
-        #     Piece(*at("b8")-Vector2(10,0), math.radians(180), Side.BLACK, self.assets[f"piece_knightB{self.piece_skin.value}"], "knight"),
-        #     Piece(*at("a1/b2")-Vector2(5,5), 0, Side.WHITE, self.assets[f"piece_queenW{self.piece_skin.value}"], "queen"),
-        # ])
+        # self.game.nav = TurnNavigation(self.widgets.pieces.pieces)
+
+        # for testing: (remember to replace the Game above, before the widgets are made)
+        # (pieces in notation, see notation.py)
+        # self.game = Game([
+        #     Piece.from_state(state, self.assets, self.piece_skin)
+        #     for state in parse_position("pa7+0-10 pb7-10-10 ra8 nb8-10+0 Qa1/b2-5-5")
+        # ], self.assets, self.piece_skin)
         # fmt: on
 
-        self.nav: TurnNavigation = TurnNavigation(self.widgets.pieces.pieces)
+        self.nav: TurnNavigation = self.game.nav
 
     def load_img_assets(self):
         """
@@ -91,117 +106,3 @@ class GameState:
                 pygame.image.load(f"assets/{file}")
             )
         dprint(f"loaded assets:\n{self.assets.keys()}")
-
-
-class TurnNavigation:
-    """used to keep track of previous turns and has an API to navigate the board through them"""
-
-    # TODO: hmm. this can be a Widget maybe? because a NavProgbar depends on this now? or not.
-
-    def __init__(self, pieces: list[Piece]) -> None:
-        self.__turns: list[list[Piece]] = [copy.deepcopy(pieces)]
-        self.__curr_turn = 0
-
-    def __len__(self) -> int:
-        return len(self.__turns)
-
-    def get_game_save(self) -> str:
-        return json_compress(
-            {
-                "save_version": "1.0.0",
-                "save": [
-                    [piece.to_JSON_dict() for piece in turn] for turn in self.__turns
-                ],
-            }
-        )
-
-    def load_game_save(self, s: str, gs: GameState) -> list[list[Piece]] | None:
-        """
-        tries to load a game save, returning Some reconstructed list of list of pieces,
-        or None if there was an error.
-
-        if let Some ps, then ps is not an alias to any other ps. i.e., mutate as much as you'd like.
-        """
-        # TODO: optimize space by switching to binary format?
-        try:
-            s = s.strip()
-            j = json_decompress(s)
-
-            reconstructed_save: list[list[Piece]] = []
-            save = j["save"]
-            for move in save:
-                reconstructed_save.append([])
-                for piece_dict in move:
-                    side: Side = Side(piece_dict["side"])
-                    reconstructed_save[-1].append(
-                        Piece(
-                            piece_dict["x"],
-                            piece_dict["y"],
-                            piece_dict["angle"],
-                            side,
-                            gs.assets[
-                                f"piece_{piece_dict['piece_name']}{'B' if side == Side.BLACK else 'W'}{gs.piece_skin.value}"
-                            ],
-                            piece_dict["piece_name"],
-                        )
-                    )
-            self.__turns = reconstructed_save
-            self.__curr_turn = len(self) - 1
-            self.update_state(gs)
-            dprint(f"loaded {len(reconstructed_save)} turns")
-            return "yay!"
-            # return copy.deepcopy(reconstructed_save)
-        except:
-            return None
-
-    def record_turn(self, pieces: list[Piece]) -> None:
-        self.__turns = self.__turns[0 : self.__curr_turn + 1]
-        self.__turns.append(copy.deepcopy(pieces))
-        self.__curr_turn += 1
-
-    def update_state(self, gs: GameState):
-        gs.widgets.pieces.pieces = copy.deepcopy(self.__turns[self.__curr_turn])
-
-    def first(self) -> None:
-        """presses first button. may or may not be a noop"""
-        self.__curr_turn = 0
-
-    def first_noop(self) -> bool:
-        """returns True if first is a noop"""
-        return self.__curr_turn == 0
-
-    def prev(self) -> None:
-        """presses prev button. may or may not be a noop"""
-        if not self.prev_noop():
-            self.__curr_turn -= 1
-
-    def prev_noop(self) -> bool:
-        """returns True if prev is a noop"""
-        return self.__curr_turn == 0
-
-    def next(self) -> None:
-        """presses next button. may or may not be a noop"""
-        if not self.next_noop():
-            self.__curr_turn += 1
-
-    def next_noop(self) -> bool:
-        """returns True if next is a noop"""
-        return self.__curr_turn == self.__len__() - 1
-
-    def last(self) -> None:
-        """presses last button. may or may not be a noop"""
-        self.__curr_turn = self.__len__() - 1
-
-    def last_noop(self) -> bool:
-        """returns True if last is a noop"""
-        return self.__curr_turn == self.__len__() - 1
-
-    def go_to(self, turn: int):
-        assert 0 <= turn < self.__len__()
-        self.__curr_turn = turn
-
-    def get_curr_turn(self) -> list[Piece]:
-        return copy.deepcopy(self.__turns[self.__curr_turn])
-
-    def get_curr_turn_idx(self) -> int:
-        return self.__curr_turn
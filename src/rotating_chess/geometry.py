@@ -0,0 +1,92 @@
+"""
+the board's dimensions: how many files and ranks it has.
+
+settings.BOARD is the board everything plays on. every module that needs the board's
+size (locations, promotion, drawing points and tiles, the start boards, symmetries,
+evaluation, notation, ...) reads it when it needs it, so a bigger board is a matter of
+setting it before the game starts, or wrapping headless code in plies.board_geometry.
+the normal board is 8 by 8; bigger ones (16 by 16 and up) stress the rules, rendering
+and history code.
+
+tiles are always TILE pixels: pieces' moves and hit circles are measured in them, so
+a bigger board is more tiles, not smaller ones. algebraic names (locations.at,
+notation.py) only go up to file z.
+
+    uv run python benchmarks/bench_geometry.py --sizes 8 16 24
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+# a tile's width and height, in pixels
+TILE = 50
+# the widgets' panel, right of the board
+PANEL_WIDTH, PANEL_HEIGHT = 200, 400
+# the normal board's back rank. bigger boards repeat its wings, see back_rank
+BACK_RANK = ["rook", "knight", "bishop", "queen", "king", "bishop", "knight", "rook"]
+
+
+class BoardGeometry(NamedTuple):
+    """
+    >>> board = BoardGeometry(16, 12)
+    >>> board.width, board.height
+    (800, 600)
+    >>> board.file_x(0), board.rank_y(1), board.rank_y(12)
+    (25, 575, 25)
+    """
+
+    files: int = 8
+    ranks: int = 8
+
+    @classmethod
+    def parse(cls, text: str) -> BoardGeometry:
+        """files by ranks, e.g. "16x16" """
+        files, _, ranks = text.partition("x")
+        return cls(int(files), int(ranks))
+
+    @property
+    def width(self) -> int:
+        return self.files * TILE
+
+    @property
+    def height(self) -> int:
+        return self.ranks * TILE
+
+    @property
+    def centre(self) -> tuple[float, float]:
+        return self.width / 2, self.height / 2
+
+    def file_x(self, file: int) -> int:
+        """the x of file's tiles' centres. file a is 0"""
+        return file * TILE + TILE // 2
+
+    def rank_y(self, rank: int) -> int:
+        """the y of rank's tiles' centres. rank 1 is white's, at the bottom"""
+        # flipped, because pygame y is top-down
+        return (self.ranks - rank) * TILE + TILE // 2
+
+    def on_board(self, x: float, y: float, margin: float = 0) -> bool:
+        """whether x, y is on the board, or no more than margin off it"""
+        # (not width and height: this is on the hot path of point generation)
+        return (
+            -margin <= x <= self.files * TILE + margin
+            and -margin <= y <= self.ranks * TILE + margin
+        )
+
+    def window_size(self) -> tuple[int, int]:
+        """the board and the panel"""
+        return self.width + PANEL_WIDTH, max(self.height, PANEL_HEIGHT)
+
+    def back_rank(self) -> list[str]:
+        """
+        the normal board's back rank, from file a: rook, knight and bishop out to the
+        queen and king in the middle, over and over on wider boards
+
+        >>> BoardGeometry(12, 12).back_rank()[:6]
+        ['rook', 'knight', 'bishop', 'rook', 'knight', 'queen']
+        """
+        wing = self.files - 2
+        left = [BACK_RANK[i % 3] for i in range(wing // 2)]
+        right = [BACK_RANK[i % 3] for i in range(wing - wing // 2)]
+        return left + ["queen", "king"] + right[::-1]
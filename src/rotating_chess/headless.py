@@ -0,0 +1,124 @@
+"""
+runs the game's frames without a window, as fast as they'll go, timing each part.
+
+SDL's dummy video driver gives a real pygame display surface (so drawing costs what
+it does on screen, minus presenting it) without a window. frames run the same code
+main.py's loop does (see frame.py), but input comes from the caller instead of the
+mouse and keyboard: each frame gets scripted events and a mouse position, plus
+whatever was posted to pygame's event queue (e.g. by save import/export workers).
+
+    screen = init()
+    gs = game_state()
+    timer = FrameTimer()
+    for events, (x, y) in script:
+        run_frame(screen, gs, events, x, y, timer)
+    print(timer.report())
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pygame
+from pygame.event import Event
+
+from rotating_chess import settings
+from rotating_chess.frame import draw, draw_board, handle_events
+from rotating_chess.gamestate import GameState
+
+# where main.py runs from, with the assets/ GameState loads
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+def init() -> pygame.Surface:
+    """starts pygame on the dummy drivers, unless told otherwise, and opens the 'window'"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode(settings.BOARD.window_size())
+
+
+def game_state() -> GameState:
+    """a fresh GameState, with its assets. init() first."""
+    # GameState loads assets relative to where the game runs from
+    cwd = os.getcwd()
+    os.chdir(SRC_DIR)
+    try:
+        return GameState()
+    finally:
+        os.chdir(cwd)
+
+
+class FrameTimer:
+    """seconds spent in each phase of each frame"""
+
+    def __init__(self) -> None:
+        self.frames: list[dict[str, float]] = []
+        # seconds each event took to handle, by event name
+        self.events: dict[str, list[float]] = {}
+
+    def start_frame(self) -> None:
+        self.frames.append({})
+        self.__last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """ends phase, which started when the last one ended"""
+        now = time.perf_counter()
+        frame = self.frames[-1]
+        frame[phase] = frame.get(phase, 0.0) + now - self.__last
+        self.__last = now
+
+    def report(self) -> str:
+        """mean and worst frame, then each phase's and each event's mean and worst, in ms"""
+        if not self.frames:
+            return "no frames"
+        totals = [sum(frame.values()) for frame in self.frames]
+        lines = [
+            f"{len(totals)} frames: {1e3 * statistics.mean(totals):.2f}ms mean, "
+            f"{1e3 * max(totals):.2f}ms worst"
+        ]
+        phases = dict.fromkeys(phase for frame in self.frames for phase in frame)
+        for phase in phases:
+            times = [frame.get(phase, 0.0) for frame in self.frames]
+            lines.append(
+                f"  {phase:>14}: {1e3 * statistics.mean(times):7.3f}ms mean, "
+                f"{1e3 * max(times):7.3f}ms worst"
+            )
+        for name, times in sorted(self.events.items()):
+            lines.append(
+                f"  {name:>14}: {1e3 * statistics.mean(times):7.3f}ms mean, "
+                f"{1e3 * max(times):7.3f}ms worst, {len(times)} handled"
+            )
+        return "\n".join(lines)
+
+
+def run_frame(
+    screen: pygame.Surface,
+    gs: GameState,
+    events: list[Event],
+    x: int,
+    y: int,
+    timer: FrameTimer | None = None,
+) -> None:
+    """
+    one frame: events (and anything queued) handled with the mouse at x, y, then
+    drawn. with a timer, times events, the board, each widget and presenting.
+    """
+    if timer is None:
+        handle_events(gs, events + pygame.event.get(), x, y)
+        draw(screen, gs)
+        return
+
+    timer.start_frame()
+    handle_events(gs, events + pygame.event.get(), x, y, timer.events)
+    timer.lap("events")
+    draw_board(screen)
+    timer.lap("board")
+    for name, widget in gs.widgets.__dict__.items():
+        widget.draw(screen, gs)
+        timer.lap(name)
+    pygame.display.update()
+    timer.lap("present")
@@ -0,0 +1,143 @@
+"""
+thinks about the current board off the frame loop, and suggests plies as it goes.
+
+searching (see engine.py) takes seconds to minutes, far too long for a frame, so
+HintService runs it in a worker. submit() hands the worker an immutable board; the
+worker streams back Suggestions (a better or deeper best ply, every time it finds
+one) through a queue, which poll() drains without ever waiting. each request gets a
+generation number, shared with the worker: submitting or cancelling bumps it, and the
+search checks it every few nodes, so stale work stops within milliseconds and its
+results are thrown away.
+
+the worker is a separate process by default, so it never holds the GIL the frame loop
+needs and frame times stay flat; a thread works too (e.g. in tests), but competes with
+the frame loop. the browser has neither, so there are no hints there.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.process
+import multiprocessing.queues
+import os
+import queue
+import sys
+import threading
+
+from rotating_chess import settings
+from rotating_chess.debug import dprint
+from rotating_chess.engine import Engine, Suggestion, Weights
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.pieces import Board, Side
+from rotating_chess.plies import to_move
+
+AVAILABLE = sys.platform not in ["emscripten", "wasi"]
+
+
+def ponder(
+    requests,
+    results,
+    generation,
+    engine_args: dict,
+    geometry: BoardGeometry,
+    fixed_point: bool,
+) -> None:
+    """
+    the worker: searches each requested board, putting (generation, suggestion) on
+    results, until it gets None. geometry and fixed_point are the game's settings
+    """
+    if multiprocessing.parent_process() is not None:
+        # we're in our own process, which started with the default settings
+        settings.BOARD = geometry
+        settings.FIXED_POINT = fixed_point
+        if hasattr(os, "nice"):
+            # leave the frame loop the cpu it needs
+            os.nice(10)
+    engine = Engine(**engine_args)
+    while True:
+        request = requests.get()
+        # only the latest request matters
+        while request is not None:
+            try:
+                request = requests.get_nowait()
+            except queue.Empty:
+                break
+        if request is None:
+            return
+        number, board, side = request
+        if generation.value != number:
+            continue
+        for suggestion in engine.search(
+            board, side, lambda: generation.value != number
+        ):
+            results.put((number, suggestion))
+
+
+class HintService:
+    def __init__(
+        self,
+        process: bool = True,
+        weights: Weights = Weights(),
+        angles: int = 4,
+        max_depth: int = 3,
+    ) -> None:
+        """process: whether the worker is a process (or else a thread)"""
+        engine_args = {"weights": weights, "angles": angles, "max_depth": max_depth}
+        args = (engine_args, settings.BOARD, settings.FIXED_POINT)
+        self.__best: Suggestion | None = None
+        # the worker's a new interpreter, not a fork of this one (and its display)
+        context = multiprocessing.get_context("spawn")
+        self.__generation = context.Value("q", 0)
+        self.__requests: queue.Queue | multiprocessing.queues.Queue
+        self.__results: queue.Queue | multiprocessing.queues.Queue
+        self.__worker: threading.Thread | multiprocessing.process.BaseProcess
+        if process:
+            self.__requests = context.Queue()
+            self.__results = context.Queue()
+            self.__worker = context.Process(
+                target=ponder,
+                args=(self.__requests, self.__results, self.__generation, *args),
+                daemon=True,
+            )
+        else:
+            self.__requests = queue.Queue()
+            self.__results = queue.Queue()
+            self.__worker = threading.Thread(
+                target=ponder,
+                args=(self.__requests, self.__results, self.__generation, *args),
+                daemon=True,
+            )
+        self.__worker.start()
+
+    def __bump(self) -> int:
+        with self.__generation.get_lock():
+            self.__generation.value += 1
+            return self.__generation.value
+
+    def submit(self, board: Board, side: Side) -> None:
+        """starts thinking about board, for side, dropping whatever came before"""
+        self.__best = None
+        self.__requests.put((self.__bump(), board, side))
+
+    def cancel(self) -> None:
+        """stops thinking, dropping the current best"""
+        self.__best = None
+        self.__bump()
+
+    def poll(self) -> Suggestion | None:
+        """the best suggestion so far for the latest request, if any. never waits"""
+        current = self.__generation.value
+        while True:
+            try:
+                number, suggestion = self.__results.get_nowait()
+            except queue.Empty:
+                break
+            if number == current:
+                self.__best = suggestion
+        return self.__best
+
+    def close(self) -> None:
+        self.cancel()
+        self.__requests.put(None)
+        self.__worker.join(timeout=1)
+        dprint(f"hint worker stopped: {not self.__worker.is_alive()}")
@@ -0,0 +1,493 @@
+from __future__ import annotations
+
+import json
+import re
+import pygame
+from collections.abc import Callable, Iterable, Iterator
+
+from rotating_chess.debug import dprint
+from rotating_chess import settings, fixed, zobrist
+from rotating_chess.pieces import Piece, PieceState, Side, Board, Action, share_board
+from rotating_chess.compressjson import text_compress, iter_text_decompress
+from rotating_chess.zdicts import ZDICTS
+
+# gamestate is a circular import
+# this block and __future__'s annotations fixes type checking
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rotating_chess.gamestate import GameState
+
+
+class TurnNode:
+    """
+    one turn in the variation tree.
+    boards are immutable and share their unchanged PieceStates with the parent's board.
+    """
+
+    # fmt: off
+    __slots__ = ("id", "board", "parent", "action", "children", "depth", "preferred", "zobrist")
+    # fmt: on
+
+    def __init__(
+        self,
+        id: int,
+        board: Board,
+        parent: TurnNode | None,
+        action: Action | None = None,
+    ) -> None:
+        # unique within its TurnNavigation, counting up in order of creation
+        self.id: int = id
+        self.board: Board = board
+        self.parent: TurnNode | None = parent
+        # what turned the parent's board into this one, if we know
+        self.action: Action | None = action
+        self.children: list[TurnNode] = []
+        self.depth: int = 0 if parent is None else parent.depth + 1
+        # the child that the current line continues through
+        self.preferred: TurnNode | None = None
+        # the board's hash (see zobrist.py). None until TurnNavigation.get_zobrist needs it
+        self.zobrist: int | None = None
+
+
+# the version new saves are written as
+SAVE_VERSION = "1.1.0"
+# the preset dictionary (see zdicts.py) each save version is compressed with
+SAVE_ZDICTS: dict[str, int | None] = {"1.0.0": None, "1.1.0": 1}
+# how many turns go by between progress reports
+PROGRESS_EVERY = 64
+# how much of a save is read at a time, in characters
+READ_CHUNK = 1 << 16
+
+
+# what every save written by encode_game_save starts with, up to its first turn
+SAVE_PREFIX = re.compile(
+    r'\s*\{\s*"save_version"\s*:\s*"[^"]*"\s*,\s*"save"\s*:\s*\[\s*'
+)
+WHITESPACE = re.compile(r"\s*")
+
+
+def iter_save_turns(texts: Iterable[str]) -> Iterator[list[dict]]:
+    """
+    decodes the json of a (decompressed) game save one turn at a time, as it comes in.
+    only keeps about a turn and a chunk of texts in memory, and lets other threads
+    run in between turns.
+
+    >>> list(iter_save_turns(['{"save_version": "1.0.0", "sa', 've": [[], [{', '}]]}']))
+    [[], [{}]]
+    """
+    rest = iter(texts)
+    buf = ""
+    prefix = None
+    for text in rest:
+        buf += text
+        prefix = SAVE_PREFIX.match(buf)
+        if prefix is not None or len(buf) > 1024:
+            break
+    if prefix is None:
+        # not laid out like we write saves. fine, just slower
+        yield from json.loads(buf + "".join(rest))["save"]
+        return
+
+    decoder = json.JSONDecoder()
+    idx = prefix.end()
+    while True:
+        space = WHITESPACE.match(buf, idx)
+        assert space is not None  # \s* matches anywhere
+        idx = space.end()
+        if idx == len(buf):
+            more = next(rest, None)
+            if more is None:
+                raise ValueError("save ended early")
+            # drop what we're done with so buf stays about a turn long
+            buf = buf[idx:] + more
+            idx = 0
+        elif buf.startswith("]", idx):
+            break
+        elif buf.startswith(",", idx):
+            idx += 1
+        else:
+            # every turn is a json array, which can't decode until all of it is here
+            try:
+                turn, idx = decoder.raw_decode(buf, idx)
+            except ValueError:
+                more = next(rest, None)
+                if more is None:
+                    raise
+                buf = buf[idx:] + more
+                idx = 0
+                continue
+            yield turn
+
+    if (buf[idx + 1 :] + "".join(rest)).strip() != "}":
+        raise ValueError("unexpected data after the turns")
+
+
+def chunked(s: str, progress: Callable[[float], None] | None = None) -> Iterator[str]:
+    """s in READ_CHUNK sized pieces, calling progress with the fraction done"""
+    for start in range(0, len(s), READ_CHUNK):
+        if progress is not None:
+            progress(start / len(s))
+        yield s[start : start + READ_CHUNK]
+
+
+def parse_game_save(
+    s: str, progress: Callable[[float], None] | None = None
+) -> list[Board]:
+    """
+    decodes a game save into its boards, one per turn. doesn't need any assets,
+    so it's usable headless. raises on an invalid save.
+    calls progress (if given) with the fraction done every so often.
+    """
+    return parse_game_save_stream(chunked(s, progress))
+
+
+def parse_game_save_stream(chunks: Iterable[str]) -> list[Board]:
+    """
+    parse_game_save, for a save that comes in chunks, e.g. read from a file.
+    doesn't hold more than a chunk of the save in memory at a time, whatever its size.
+    """
+    boards: list[Board] = []
+    prev: Board = ()
+    for move in iter_save_turns(iter_text_decompress(chunks)):
+        states: Iterable[PieceState] = (
+            PieceState(
+                piece_dict["x"],
+                piece_dict["y"],
+                piece_dict["angle"],
+                Side(piece_dict["side"]),
+                piece_dict["piece_name"],
+            )
+            for piece_dict in move
+        )
+        if settings.FIXED_POINT:
+            # saves from before (or without) fixed point are snapped as they're loaded
+            states = map(fixed.snap_state, states)
+        prev = share_board(states, prev)
+        boards.append(prev)
+    return boards
+
+
+def encode_game_save(
+    boards: list[Board],
+    progress: Callable[[float], None] | None = None,
+    save_version: str = SAVE_VERSION,
+) -> str:
+    """
+    the game save of a line of boards, the inverse of parse_game_save.
+    calls progress (if given) with the fraction done every so often.
+    older save_versions can still be written, e.g. for older readers.
+    """
+    # encoded turn by turn rather than with one json.dumps of the whole save: the output's
+    # the same, but a thread doing this lets others run in between turns
+    turns = []
+    for turn, board in enumerate(boards):
+        if progress is not None and turn % PROGRESS_EVERY == 0:
+            # most of the work is encoding; compressing it is the rest
+            progress(0.8 * turn / len(boards))
+        turns.append(
+            json.dumps(
+                [
+                    {
+                        "x": state.x,
+                        "y": state.y,
+                        "angle": state.angle,
+                        "side": state.side.value,
+                        "piece_name": state.piece_name,
+                    }
+                    for state in board
+                ]
+            )
+        )
+    zdict = SAVE_ZDICTS[save_version]
+    return text_compress(
+        '{"save_version": "%s", "save": [' % save_version + ", ".join(turns) + "]}",
+        None if zdict is None else ZDICTS[zdict],
+    )
+
+
+class TurnNavigation:
+    """
+    used to keep track of previous turns and has an API to navigate the board through them.
+
+    turns form a tree of variations: recording a turn while looking at an old one starts
+    a side line instead of throwing away the turns after it. the nav buttons walk the
+    "current line", which is the path from the first turn to the current turn and then on
+    through the most recently visited children.
+    """
+
+    # TODO: hmm. this can be a Widget maybe? because a NavProgbar depends on this now? or not.
+
+    def __init__(self, pieces: list[Piece]) -> None:
+        self.__root = TurnNode(0, tuple(p.to_state() for p in pieces), None)
+        self.__line: list[TurnNode] = [self.__root]
+        # every node, by id
+        self.__nodes: list[TurnNode] = [self.__root]
+        self.__curr_turn = 0
+        # called with the new node whenever a turn is recorded
+        self.__turn_listeners: list[Callable[[TurnNode], None]] = []
+        # called whenever all turns are replaced, e.g. by loading a save
+        self.__load_listeners: list[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self.__line)
+
+    def get_game_save(self) -> str:
+        """saves the current line."""
+        return encode_game_save(self.get_line_boards())
+
+    def get_line_boards(self) -> list[Board]:
+        """
+        the boards of the current line. they're immutable, so this is a snapshot
+        that's safe to hand to another thread.
+        """
+        return [node.board for node in self.__line]
+
+    def load_game_save(self, s: str, gs: GameState) -> str | None:
+        """
+        tries to load a game save, replacing all turns (and variations) with it.
+        returns Some, or None if there was an error.
+        """
+        # TODO: optimize space by switching to binary format?
+        try:
+            boards = parse_game_save(s)
+            assert len(boards) > 0
+        except:
+            return None
+
+        self.load_boards(boards)
+        self.update_state(gs)
+        dprint(f"loaded {len(boards)} turns")
+        return "yay!"
+
+    def subscribe(
+        self,
+        on_turn: Callable[[TurnNode], None],
+        on_load: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        calls on_turn(node) after every recorded turn, and on_load() after the turns
+        are replaced wholesale.
+        """
+        self.__turn_listeners.append(on_turn)
+        if on_load is not None:
+            self.__load_listeners.append(on_load)
+
+    def load_boards(self, boards: list[Board]) -> None:
+        """replaces all turns (and variations) with boards, as one line. goes to the last turn."""
+        assert len(boards) > 0
+        self.__root = TurnNode(0, boards[0], None)
+        self.__line = [self.__root]
+        self.__nodes = [self.__root]
+        for board in boards[1:]:
+            node = TurnNode(len(self.__nodes), board, self.__line[-1])
+            self.__nodes.append(node)
+            self.__line[-1].children.append(node)
+            self.__line[-1].preferred = node
+            self.__line.append(node)
+        self.__curr_turn = len(self) - 1
+        for listener in self.__load_listeners:
+            listener()
+
+    def record_turn(
+        self,
+        pieces: list[Piece],
+        action: Action | None = None,
+        zobrist: int | None = None,
+    ) -> None:
+        """
+        records pieces as the turn after the current one, reached by action if given.
+        if we aren't at the end of the current line, this starts (or revisits) a
+        variation; nothing is discarded.
+        zobrist is the board's hash, if known (see Pieces.zobrist).
+        """
+        curr = self.__line[self.__curr_turn]
+        self.record_board(
+            share_board((p.to_state() for p in pieces), curr.board), action, zobrist
+        )
+
+    def record_board(
+        self, board: Board, action: Action | None = None, zobrist: int | None = None
+    ) -> None:
+        """like record_turn, for a board we already have"""
+        curr = self.__line[self.__curr_turn]
+        node = next((c for c in curr.children if c.board == board), None)
+        if node is None:
+            node = TurnNode(len(self.__nodes), board, curr, action)
+            node.zobrist = zobrist
+            self.__nodes.append(node)
+            curr.children.append(node)
+        self.__switch_to(node)
+        for listener in self.__turn_listeners:
+            listener(node)
+
+    def __switch_to(self, node: TurnNode) -> None:
+        """makes node the current turn, rebuilding the current line through it."""
+        assert node.parent is not None
+        node.parent.preferred = node
+        self.__curr_turn = node.depth
+        del self.__line[node.depth :]
+        follow: TurnNode | None = node
+        while follow is not None:
+            self.__line.append(follow)
+            follow = follow.preferred
+
+    def go_to_node(self, node: TurnNode) -> None:
+        """makes node (from any variation) the current turn"""
+        follow = node
+        while follow.parent is not None:
+            follow.parent.preferred = follow
+            follow = follow.parent
+        line: list[TurnNode] = []
+        along: TurnNode | None = self.__root
+        while along is not None:
+            line.append(along)
+            along = along.preferred
+        self.__line = line
+        self.__curr_turn = node.depth
+
+    def get_node(self, id: int) -> TurnNode:
+        return self.__nodes[id]
+
+    def get_curr_node(self) -> TurnNode:
+        return self.__line[self.__curr_turn]
+
+    def get_node_at(self, turn: int) -> TurnNode:
+        """the node of turn on the current line"""
+        return self.__line[turn]
+
+    def get_zobrist(self, node: TurnNode | None = None) -> int:
+        """
+        the hash of node's board (by default, the current turn's). recorded turns
+        usually come with theirs; the rest (e.g. loaded ones) are worked out from
+        their nearest hashed ancestor, only hashing the pieces that changed.
+        """
+        if node is None:
+            node = self.get_curr_node()
+        unhashed: list[TurnNode] = []
+        follow: TurnNode | None = node
+        while follow is not None and follow.zobrist is None:
+            unhashed.append(follow)
+            follow = follow.parent
+        for child in reversed(unhashed):
+            parent = child.parent
+            if parent is None:
+                child.zobrist = zobrist.board_hash(child.board)
+            else:
+                assert parent.zobrist is not None
+                child.zobrist = zobrist.update(
+                    parent.zobrist, parent.board, child.board
+                )
+        assert node.zobrist is not None
+        return node.zobrist
+
+    def repetitions(self, node: TurnNode | None = None) -> int:
+        """
+        how many earlier turns on the way to node (by default, the current turn)
+        had the same position. (by hash, so in theory, though 1 in 2^64, a different one)
+        """
+        if node is None:
+            node = self.get_curr_node()
+        h = self.get_zobrist(node)
+        count = 0
+        follow = node.parent
+        while follow is not None:
+            if self.get_zobrist(follow) == h:
+                count += 1
+            follow = follow.parent
+        return count
+
+    def update_state(self, gs: GameState):
+        gs.widgets.pieces.pieces = self.get_curr_turn(gs.assets, gs.piece_skin)
+
+    def first(self) -> None:
+        """presses first button. may or may not be a noop"""
+        self.__curr_turn = 0
+
+    def first_noop(self) -> bool:
+        """returns True if first is a noop"""
+        return self.__curr_turn == 0
+
+    def prev(self) -> None:
+        """presses prev button. may or may not be a noop"""
+        if not self.prev_noop():
+            self.__curr_turn -= 1
+
+    def prev_noop(self) -> bool:
+        """returns True if prev is a noop"""
+        return self.__curr_turn == 0
+
+    def next(self) -> None:
+        """presses next button. may or may not be a noop"""
+        if not self.next_noop():
+            self.__curr_turn += 1
+
+    def next_noop(self) -> bool:
+        """returns True if next is a noop"""
+        return self.__curr_turn == self.__len__() - 1
+
+    def last(self) -> None:
+        """presses last button. may or may not be a noop"""
+        self.__curr_turn = self.__len__() - 1
+
+    def last_noop(self) -> bool:
+        """returns True if last is a noop"""
+        return self.__curr_turn == self.__len__() - 1
+
+    def go_to(self, turn: int):
+        assert 0 <= turn < self.__len__()
+        self.__curr_turn = turn
+
+    def variation_count(self) -> int:
+        """number of alternatives (including itself) to the current turn"""
+        parent = self.__line[self.__curr_turn].parent
+        return 1 if parent is None else len(parent.children)
+
+    def variation_idx(self) -> int:
+        """index of the current turn among its alternatives"""
+        node = self.__line[self.__curr_turn]
+        return 0 if node.parent is None else node.parent.children.index(node)
+
+    def switch_variation(self, step: int = 1) -> None:
+        """
+        swaps the current turn for one of its alternatives, cycling by step.
+        may or may not be a noop. O(1) board-wise: the other board is already built.
+        """
+        node = self.__line[self.__curr_turn]
+        if node.parent is None:
+            return
+        siblings = node.parent.children
+        self.__switch_to(siblings[(siblings.index(node) + step) % len(siblings)])
+
+    def get_curr_board(self) -> Board:
+        """the current turn's board. immutable, so no need to copy."""
+        return self.__line[self.__curr_turn].board
+
+    def get_curr_turn(
+        self,
+        assets: dict[str, pygame.Surface] | None = None,
+        piece_skin: settings.PieceSkin | None = None,
+    ) -> list[Piece]:
+        """
+        builds fresh pieces for the current turn. mutate them as much as you'd like.
+        use with None params in testing when we don't care about visual
+        """
+        return [
+            Piece.from_state(state, assets, piece_skin)
+            for state in self.get_curr_board()
+        ]
+
+    def get_curr_turn_idx(self) -> int:
+        return self.__curr_turn
+
+    def get_curr_action(self) -> Action | None:
+        """the action that led to the current turn, if known"""
+        return self.get_action(self.__curr_turn)
+
+    def get_action(self, turn: int) -> Action | None:
+        """the action that led to turn (on the current line), if known"""
+        return self.__line[turn].action
+
+    def get_board(self, turn: int) -> Board:
+        """the board of turn (on the current line)"""
+        return self.__line[turn].board
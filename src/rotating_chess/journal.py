@@ -0,0 +1,211 @@
+"""
+autosaves a game as it's played, so a crash loses (almost) nothing.
+
+two files live in the save directory:
+  - NAME.txt, a regular game save (the base), rewritten every so often;
+  - NAME.journal, an append-only log of every turn recorded since the base.
+
+recording a turn appends one short line to the journal, e.g. `[12,["m",9,225.0,225.0]]`
+(which turn it was played from, and its action), so the cost of saving a turn
+doesn't depend on how long the game is. each line is flushed to the os as it's
+written, so only the machine crashing can lose it; fsyncs are batched (every
+fsync_every turns or fsync_interval seconds) and the whole thing is compacted into
+a new base every compact_every turns.
+
+the journal's first line names the base it continues, by hash. a crash mid-compaction
+leaves either the old base with its journal, or the new base with a journal that no
+longer matches it (whose turns are all in the new base anyway), so recovery is always
+consistent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import TextIO
+
+from rotating_chess.debug import dprint
+from rotating_chess.game import Game
+from rotating_chess.history import TurnNode
+from rotating_chess.pieces import PieceState, Side, action_from_JSON, action_to_JSON
+
+JOURNAL_VERSION = 1
+
+
+def base_hash(save: str) -> str:
+    return hashlib.sha1(save.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path: Path, data: str) -> None:
+    """writes data to path so that path is either the old or the new contents, even after a crash"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Journal:
+    """keeps NAME.txt and NAME.journal in directory up to date with game's history."""
+
+    def __init__(
+        self,
+        game: Game,
+        directory: Path,
+        name: str = "autosave",
+        fsync_every: int = 16,
+        fsync_interval: float = 1.0,
+        compact_every: int = 256,
+    ) -> None:
+        """
+        doesn't touch the disk or the game. call recover() and/or start() next.
+        """
+        self.game = game
+        self.base_path = directory / f"{name}.txt"
+        self.journal_path = directory / f"{name}.journal"
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self.__file: TextIO | None = None
+        self.__unsynced = 0
+        self.__last_sync = time.monotonic()
+        self.__journaled = 0
+        # live node id -> the id the node gets when the autosave is recovered.
+        # only nodes in the base or journaled since are in here.
+        self.__ids: dict[int, int] = {}
+
+    def recover(self) -> bool:
+        """
+        loads the last autosave (base and journal) into the game, if there is one.
+        returns whether there was. a torn last line (from a crash mid-write) is ignored.
+        """
+        if not self.base_path.exists():
+            return False
+        base = self.base_path.read_text()
+        if not self.game.load_game_save(base):
+            dprint(f"autosave {self.base_path} is not a valid save")
+            return False
+
+        replayed = 0
+        try:
+            with open(self.journal_path) as f:
+                header = json.loads(f.readline())
+                if header.get("base") != base_hash(base):
+                    # we crashed compacting. the base already has everything
+                    return True
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    try:
+                        ok = self.__replay(entry)
+                    except (KeyError, IndexError, TypeError, ValueError):
+                        ok = False
+                    if not ok:
+                        dprint(f"journal entry {line!r} doesn't apply. stopping there")
+                        break
+                    replayed += 1
+        except (OSError, ValueError):
+            pass
+        dprint(f"recovered {len(self.game.nav)} turns ({replayed} from the journal)")
+        return True
+
+    def __replay(self, entry: list) -> bool:
+        game = self.game
+        parent_id, action = entry[0], entry[1]
+        parent = game.nav.get_node(parent_id)
+        if game.nav.get_curr_node() is not parent:
+            game.nav.go_to_node(parent)
+            game.sync()
+        if action is not None:
+            return game.apply(action_from_JSON(action))
+        game.nav.record_board(
+            tuple(
+                PieceState(x, y, angle, Side(side), name)
+                for x, y, angle, side, name in entry[2]
+            )
+        )
+        game.sync()
+        return True
+
+    def start(self) -> None:
+        """compacts whatever the game is now into a fresh base, then journals every turn."""
+        self.base_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compact()
+        self.game.nav.subscribe(self.on_turn, self.compact)
+
+    def on_turn(self, node: TurnNode) -> None:
+        assert self.__file is not None and node.parent is not None
+        if node.parent.id not in self.__ids:
+            # played from a variation that isn't in the base. start a new base
+            self.compact()
+            return
+        if node.id not in self.__ids:
+            self.__ids[node.id] = len(self.__ids)
+
+        parent_id = self.__ids[node.parent.id]
+        if node.action is not None:
+            entry: list = [parent_id, action_to_JSON(node.action)]
+        else:
+            entry = [
+                parent_id,
+                None,
+                [[s.x, s.y, s.angle, s.side.value, s.piece_name] for s in node.board],
+            ]
+        self.__file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        # cheap, unlike fsync. the line can't sit in python's buffer until the next turn
+        self.__file.flush()
+        self.__journaled += 1
+        self.__unsynced += 1
+
+        if self.__journaled >= self.compact_every:
+            self.compact()
+        elif (
+            self.__unsynced >= self.fsync_every
+            or time.monotonic() - self.__last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """makes sure everything journaled so far is on disk"""
+        if self.__file is None:
+            return
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.__unsynced = 0
+        self.__last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """
+        writes the current line as the new base and starts an empty journal after it.
+        note that variations off the current line aren't in the base.
+        """
+        if self.__file is not None:
+            self.__file.close()
+        save = self.game.nav.get_game_save()
+        header = json.dumps({"journal": JOURNAL_VERSION, "base": base_hash(save)})
+        tmp = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(header + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        write_atomic(self.base_path, save)
+        os.replace(tmp, self.journal_path)
+
+        # a recovered game starts as the base, one line numbered from 0
+        nav = self.game.nav
+        self.__ids = {nav.get_node_at(turn).id: turn for turn in range(len(nav))}
+        self.__file = open(self.journal_path, "a")
+        self.__journaled = 0
+        self.sync()
+
+    def close(self) -> None:
+        self.sync()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
@@ -1,16 +1,16 @@
 from pygame.math import Vector2
 import string
 
+from rotating_chess import settings
+
 
 def rank_to_pos(rank: str) -> float:
     try:
-        rank = int(rank)
+        number = int(rank)
     except ValueError:
         raise ValueError("rank must be coercable to int")
 
-    return (8 * 50) - (
-        rank * 50 - 25
-    )  # the rank pos, with flip because pygame y is top-down
+    return settings.BOARD.rank_y(number)
 
 
 def file_to_pos(file: str) -> float:
@@ -20,7 +20,7 @@ def file_to_pos(file: str) -> float:
     except AssertionError:
         raise ValueError("file must be a valid string value")
 
-    return (ord(file) - ord("a")) * 50 + 25
+    return settings.BOARD.file_x(ord(file) - ord("a"))
 
 
 def at(location: str) -> Vector2:
@@ -40,8 +40,11 @@ def at(location: str) -> Vector2:
     """
     try:
         locations = location.split("/")
-        assert all(len(l) == 2 for l in locations)
+        assert all(len(l) >= 2 for l in locations)
     except AssertionError:
         raise ValueError("must use a valid string value like a1, e4")
-    locations = [Vector2(file_to_pos(l[0]), rank_to_pos(l[1])) for l in locations]
-    return sum(locations, start=Vector2(0, 0)) / len(locations)
+    points = [Vector2(file_to_pos(l[0]), rank_to_pos(l[1:])) for l in locations]
+    total = Vector2(0, 0)
+    for point in points:
+        total += point
+    return total / len(points)
@@ -0,0 +1,142 @@
+"""
+a short text notation for one board, for fixtures, engines and the clipboard.
+
+a board is its pieces, in order (pieces are addressed by index, see game.py),
+separated by spaces. a piece is
+    letter  its kind (p n b r q k, as in FEN), uppercase for white, lowercase black
+    anchor  the square it's nearest, e.g. e4, as locations.at takes it (so "a1/b2" is
+            halfway between the two)
+    offset  (if it's not right on the anchor) how far off it is in pixels, x then y,
+            each signed: +0-10 is 10 pixels up
+    angle   (if it's not facing its side's way: white 0, black 180) @ and degrees
+so the normal board's first pieces are "pa7 Pa2 pb7 Pb2 ...", and a rook pulled a bit
+off a1 and turned a quarter "Ra1+3.5-2@90".
+squares are settings.BOARD's (see geometry.py), so on bigger boards ranks go past 8,
+e.g. "Rp16".
+
+positions and angles are on the fixed-point grids (see fixed.py): parsing snaps them,
+and encoding writes the fewest decimals that get the same grid point back, so a
+snapped board (any board parse_position gives) round trips exactly. encoding anchors
+a piece on its nearest square, so "a1/b2" anchors come back as a square.
+
+>>> board = parse_position("Ke1 pe7+0-10@170.5 Qa1/b2-5-5")
+>>> board[1].x, board[1].y, round(math.degrees(board[1].angle), 3)
+(225.0, 65.0, 170.5)
+>>> encode_position(board)
+'Ke1 pe7+0-10@170.5 Qa2+20+20'
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import re
+from collections.abc import Callable
+
+from rotating_chess import fixed, settings
+from rotating_chess.geometry import TILE, BoardGeometry
+from rotating_chess.pieces import Board, PieceState, Side
+
+LETTERS = {
+    "pawn": "p",
+    "knight": "n",
+    "bishop": "b",
+    "rook": "r",
+    "queen": "q",
+    "king": "k",
+}
+KINDS = {letter: kind for kind, letter in LETTERS.items()}
+FILES = "abcdefghijklmnopqrstuvwxyz"
+DEFAULT_ANGLE = {Side.WHITE: 0, Side.BLACK: fixed.angle_to_units(math.pi)}
+NUMBER = r"\d+(?:\.\d*)?"
+PIECE = re.compile(
+    rf"([pnbrqkPNBRQK])([a-z]\d+(?:/[a-z]\d+)*)"
+    rf"(?:([+-]{NUMBER})([+-]{NUMBER}))?(?:@(-?{NUMBER}))?"
+)
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def anchor_units(anchor: str, geometry: BoardGeometry) -> tuple[int, int]:
+    """a square (or squares, averaged) in units, like locations.at"""
+    squares = anchor.split("/")
+    x = sum(geometry.file_x(ord(square[0]) - ord("a")) for square in squares)
+    y = sum(geometry.rank_y(int(square[1:])) for square in squares)
+    return fixed.to_units(x / len(squares)), fixed.to_units(y / len(squares))
+
+
+def parse_piece(text: str) -> PieceState:
+    match = PIECE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"not a piece: {text!r}")
+    letter, anchor, dx, dy, degrees = match.groups()
+    x, y = anchor_units(anchor, settings.BOARD)
+    if dx is not None:
+        x += fixed.to_units(float(dx))
+        y += fixed.to_units(float(dy))
+    side = Side.WHITE if letter.isupper() else Side.BLACK
+    angle = (
+        DEFAULT_ANGLE[side]
+        if degrees is None
+        else fixed.angle_to_units(math.radians(float(degrees)))
+    )
+    return PieceState(
+        fixed.from_units(x),
+        fixed.from_units(y),
+        fixed.angle_from_units(angle),
+        side,
+        KINDS[letter.lower()],
+    )
+
+
+def parse_position(text: str) -> Board:
+    """a board from its notation. raises ValueError if it isn't one"""
+    return tuple(parse_piece(piece) for piece in text.split())
+
+
+def is_position(text: str) -> bool:
+    """whether text is a board's notation (and not, say, a game save)"""
+    pieces = text.split()
+    return len(pieces) > 0 and all(PIECE.fullmatch(piece) for piece in pieces)
+
+
+def shortest(value: float, units: int, to_units: Callable[[float], int]) -> str:
+    """value with the fewest decimals (up to 4) that's still the same units"""
+    for decimals in range(4):
+        text = f"{value:.{decimals}f}"
+        if to_units(float(text)) == units:
+            return text
+    return f"{value:.4f}"
+
+
+def pixels(units: int) -> str:
+    """units as pixels, signed"""
+    text = shortest(units / fixed.SUBPIXELS, units, fixed.to_units)
+    return text if text.startswith("-") else "+" + text
+
+
+def encode_piece(state: PieceState) -> str:
+    x, y = fixed.to_units(state.x), fixed.to_units(state.y)
+    # the nearest square, or the nearest one on the board's edge
+    file = min(max(round((state.x - TILE // 2) / TILE), 0), len(FILES) - 1)
+    geometry = settings.BOARD
+    rank = max(round((geometry.height + TILE // 2 - state.y) / TILE), 1)
+    anchor_x = geometry.file_x(file) * fixed.SUBPIXELS
+    anchor_y = geometry.rank_y(rank) * fixed.SUBPIXELS
+    letter = LETTERS[state.piece_name]
+    if state.side == Side.WHITE:
+        letter = letter.upper()
+    text = f"{letter}{FILES[file]}{rank}"
+    if (x, y) != (anchor_x, anchor_y):
+        text += pixels(x - anchor_x) + pixels(y - anchor_y)
+    angle = fixed.angle_to_units(state.angle)
+    if angle != DEFAULT_ANGLE[state.side]:
+        degrees = math.degrees(fixed.angle_from_units(angle))
+        text += "@" + shortest(
+            degrees, angle, lambda d: fixed.angle_to_units(math.radians(d))
+        )
+    return text
+
+
+def encode_position(board: Board) -> str:
+    """board's notation, the inverse of parse_position"""
+    return " ".join(encode_piece(state) for state in board)
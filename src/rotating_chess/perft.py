@@ -0,0 +1,178 @@
+"""
+perft: counts every line of play to a fixed depth, to check and time the rules core.
+
+plies are as plies.py finds them: a move, then maybe a rotation of the moved piece to
+one of n evenly spaced angles. sides alternate, starting with white. perft(depth) is
+how many different plies-long lines there are.
+
+an accelerated move generator (see plies.py) should count exactly what the reference
+does; check() compares their divides (the count under each first ply, by Ply.name),
+so a mismatch points at the ply that differs.
+
+    uv run python -m rotating_chess.perft --depth 2
+    uv run python -m rotating_chess.perft --depth 2 --seed 7 --angles 8 --check numpy fixed
+    uv run python -m rotating_chess.perft --depth 3 --position "Ke1 Qd4@45 ke8 pe7"
+    uv run python -m rotating_chess.perft --depth 1 --board 16x16 --check numpy
+
+>>> perft(start_board(), 1, angles=0)
+34
+>>> perft(start_board(), 1, angles=4)  # every move, then 3 rotations or none
+136
+>>> perft(start_board(), 2, angles=0)
+1156
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from rotating_chess import settings
+from rotating_chess.canmove import HAVE_NUMPY
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.notation import encode_position, parse_position
+from rotating_chess.pieces import Board, Side
+from rotating_chess.plies import (
+    GENERATORS,
+    Generator,
+    PlyGenerator,
+    angle_set,
+    fixed_point,
+    other,
+    start_board,
+    vectorized,
+)
+
+
+class Perft:
+    """counts lines of play from boards, with one generator"""
+
+    def __init__(self, generator: Generator, angles: list[float]) -> None:
+        self.__plies = PlyGenerator(generator, angles)
+
+    def count(self, board: Board, side: Side, depth: int) -> int:
+        if depth == 0:
+            return 1
+        if depth == 1:
+            # no need to play the last ply, just count it
+            return self.__plies.count(board, side)
+        return sum(
+            self.count(child, other(side), depth - 1)
+            for _, child in self.__plies.children(board, side)
+        )
+
+    def divide(self, board: Board, side: Side, depth: int) -> dict[str, int]:
+        """the count under each first ply, by its name"""
+        assert depth > 0
+        return {
+            ply.name(): self.count(child, other(side), depth - 1)
+            for ply, child in self.__plies.children(board, side)
+        }
+
+
+def divide(
+    board: Board, depth: int, angles: int = 4, generator: str = "reference"
+) -> dict[str, int]:
+    """Perft.divide, with white to move, angles evenly spaced angles and a named generator"""
+    gen, with_fixed_point = GENERATORS[generator]
+    if gen is vectorized and not HAVE_NUMPY:
+        raise RuntimeError("the numpy generator needs numpy")
+    with fixed_point(with_fixed_point):
+        return Perft(gen, angle_set(angles)).divide(board, Side.WHITE, depth)
+
+
+def perft(
+    board: Board, depth: int, angles: int = 4, generator: str = "reference"
+) -> int:
+    """how many lines of depth plies there are from board, with white to move"""
+    return sum(divide(board, depth, angles, generator).values())
+
+
+def mismatches(
+    expected: dict[str, int], got: dict[str, int]
+) -> list[tuple[str, int | None, int | None]]:
+    """
+    where two divides differ: (first ply, expected count, got count), None where one
+    of them doesn't have that ply at all
+    """
+    return [
+        (name, expected.get(name), got.get(name))
+        for name in sorted(expected.keys() | got.keys())
+        if expected.get(name) != got.get(name)
+    ]
+
+
+def check(
+    board: Board, depth: int, angles: int, generator: str
+) -> list[tuple[str, int | None, int | None]]:
+    """where generator's divide differs from the reference's, see mismatches"""
+    return mismatches(
+        divide(board, depth, angles, "reference"),
+        divide(board, depth, angles, generator),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="counts lines of play to a depth, timing the rules core"
+    )
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument(
+        "--angles", type=int, default=4, help="how many rotation angles (0: none)"
+    )
+    parser.add_argument(
+        "--seed", type=int, help="start from this seed's chess 960 board"
+    )
+    parser.add_argument(
+        "--position", help="start from this board, in notation (see notation.py)"
+    )
+    parser.add_argument(
+        "--board",
+        metavar="FILESxRANKS",
+        type=BoardGeometry.parse,
+        help="play on a bigger board (see geometry.py), e.g. 16x16",
+    )
+    parser.add_argument("--generator", choices=list(GENERATORS), default="reference")
+    parser.add_argument(
+        "--check",
+        nargs="+",
+        choices=list(GENERATORS),
+        help="compare these generators' counts against the reference's",
+    )
+    parser.add_argument(
+        "--divide", action="store_true", help="print the count under each first ply"
+    )
+    args = parser.parse_args()
+
+    if args.board is not None:
+        settings.BOARD = args.board
+    if args.position is not None:
+        board = parse_position(args.position)
+        start = f"board {encode_position(board)}"
+    else:
+        board = start_board(args.seed)
+        start = "normal board" if args.seed is None else f"chess 960 board {args.seed}"
+        if args.board is not None:
+            start += f" ({args.board.files}x{args.board.ranks})"
+    generators = [args.generator] + (args.check or [])
+    if args.check and "reference" not in generators:
+        generators.insert(0, "reference")
+    divides = {}
+    for generator in generators:
+        began = time.perf_counter()
+        divides[generator] = divide(board, args.depth, args.angles, generator)
+        elapsed = time.perf_counter() - began
+        nodes = sum(divides[generator].values())
+        print(
+            f"perft({args.depth}) from the {start}, {args.angles} angles, "
+            f"{generator}: {nodes} in {elapsed:.2f}s ({nodes / elapsed:,.0f} nodes/s)"
+        )
+        if args.divide:
+            for name, count in divides[generator].items():
+                print(f"  {name}: {count}")
+
+    for generator in args.check or []:
+        differs = mismatches(divides["reference"], divides[generator])
+        for name, expected, got in differs:
+            print(f"  {generator} differs at {name}: {got} (reference: {expected})")
+        print(f"{generator}: {'MISMATCH' if differs else 'ok'}")
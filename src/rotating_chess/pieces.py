@@ -6,9 +6,10 @@ import copy
 from enum import Enum
 from itertools import chain
 from collections.abc import Iterable
+from typing import NamedTuple
 
 from rotating_chess.debug import dprint
-from rotating_chess import settings
+from rotating_chess import settings, fixed, geometry, zobrist
 
 
 class Side(Enum):
@@ -16,6 +17,109 @@ class Side(Enum):
     WHITE = 2
 
 
+class PieceState(NamedTuple):
+    """
+    immutable snapshot of a piece: everything needed to rebuild a Piece.
+    boards in the turn history are tuples of these, and unchanged pieces are
+    shared (the very same object) between a turn and the turns after it.
+    """
+
+    x: float
+    y: float
+    angle: float
+    side: Side
+    piece_name: str
+
+
+# a board position. immutable, so it can be shared between turns.
+Board = tuple[PieceState, ...]
+
+
+def piece_image(
+    assets: dict[str, pygame.Surface] | None,
+    piece_skin: settings.PieceSkin | None,
+    side: Side,
+    piece_name: str,
+) -> pygame.Surface | None:
+    """looks up the image for a piece. returns None when headless (no assets or skin)."""
+    if assets is None or piece_skin is None:
+        return None
+    side_str = "B" if side == Side.BLACK else "W"
+    return assets[f"piece_{piece_name}{side_str}{piece_skin.value}"]
+
+
+def share_board(states: Iterable[PieceState], prev: Board) -> Board:
+    """
+    builds a Board from states, reusing the PieceState objects of prev wherever
+    they are equal. this way consecutive turns only cost memory for what changed.
+
+    >>> a = PieceState(25, 75, 0, Side.WHITE, "pawn")
+    >>> b = PieceState(75, 75, 0, Side.WHITE, "pawn")
+    >>> board = share_board([PieceState(25, 75, 0, Side.WHITE, "pawn"), b], (a,))
+    >>> board[0] is a
+    True
+    """
+    interned = {state: state for state in prev}
+    return tuple(interned.get(state, state) for state in states)
+
+
+class Move(NamedTuple):
+    """the action of moving the piece at index `piece` of the board to x, y (capturing and promoting as needed)"""
+
+    piece: int
+    x: float
+    y: float
+
+
+class Rotate(NamedTuple):
+    """the action of rotating pieces, given as (index into the board, new angle in radians) pairs"""
+
+    rotations: tuple[tuple[int, float], ...]
+
+
+# what turns one board into the next.
+Action = Move | Rotate
+
+
+def action_to_JSON(action: Action) -> list:
+    """
+    a compact, json-encodable form of an action.
+
+    >>> action_to_JSON(Move(3, 175.0, 225.0))
+    ['m', 3, 175.0, 225.0]
+    >>> action_from_JSON(action_to_JSON(Rotate(((3, 1.5),))))
+    Rotate(rotations=((3, 1.5),))
+    """
+    if isinstance(action, Move):
+        return ["m", action.piece, action.x, action.y]
+    return ["r", [list(r) for r in action.rotations]]
+
+
+def finite(n) -> float:
+    """float(n), if it's a real number. json allows Infinity and NaN"""
+    f = float(n)
+    if not math.isfinite(f):
+        raise ValueError(f"not a finite number: {n!r}")
+    return f
+
+
+def action_from_JSON(j: list) -> Action:
+    """
+    inverse of action_to_JSON. raises on anything malformed.
+
+    >>> action_from_JSON(["r", [[3, float("inf")]]])
+    Traceback (most recent call last):
+    ...
+    ValueError: not a finite number: inf
+    """
+    if j[0] == "m":
+        _, piece, x, y = j
+        return Move(int(piece), finite(x), finite(y))
+    if j[0] == "r":
+        return Rotate(tuple((int(i), finite(a)) for i, a in j[1]))
+    raise ValueError(f"unknown action {j!r}")
+
+
 class DistsAngle:
     """immutable. represents an angle and some points at given distances to that angle.
 
@@ -78,11 +182,17 @@ class Piece:
         piece_name: str,  # TODO MAKE THIS A ENUM?
     ):
         # TODO: maybe add a self.headless: bool to check if we're in testing to avoid weird inscrutable Nones?
+        if settings.FIXED_POINT:
+            x, y, angle = fixed.snap(x), fixed.snap(y), fixed.snap_angle(angle)
         # coordinates represent the CENTER of the piece.
         self.__x = x
         self.__y = y
         # angle is in radians
         self.__angle = angle
+        # x, y in sub-pixels. kept with settings.FIXED_POINT on, for canmove
+        self.__units: tuple[int, int] | None = None
+        if settings.FIXED_POINT:
+            self.__units = fixed.to_units(x), fixed.to_units(y)
         self.__preview_angle: float | None = None
         self.__side = side
         self.selected = False
@@ -92,6 +202,7 @@ class Piece:
         )
         self.__preview_image: pygame.Surface | None = None
         self.__piece_name: str = piece_name
+        self.__zobrist = zobrist.piece_hash(x, y, angle, side, piece_name)
 
         self.__nonpreview_blit_coords: tuple[int, int]
         if img is not None:
@@ -118,10 +229,34 @@ class Piece:
         # set by __init_move_points
         self.__move_points: list[tuple[float, float]] | None = None
         self.__preview_move_points: list[tuple[float, float]] | None = None
+        # bumped whenever its points, position or (preview) angle change, see
+        # overlay_version
+        self.__overlay_version = 0
 
     def __str__(self):
         return f"Piece(x={self.__x}, y={self.__y}, side={self.__side})"
 
+    def to_state(self) -> PieceState:
+        return PieceState(
+            self.__x, self.__y, self.__angle, self.__side, self.__piece_name
+        )
+
+    @staticmethod
+    def from_state(
+        state: PieceState,
+        assets: dict[str, pygame.Surface] | None,
+        piece_skin: settings.PieceSkin | None,
+    ) -> "Piece":
+        """use with None params in testing when we don't care about visual"""
+        return Piece(
+            state.x,
+            state.y,
+            state.angle,
+            state.side,
+            piece_image(assets, piece_skin, state.side, state.piece_name),
+            state.piece_name,
+        )
+
     def to_JSON_dict(self):
         return {
             "x": self.__x,
@@ -154,6 +289,12 @@ class Piece:
     def get_x(self) -> float:
         return self.__x
 
+    def get_units(self) -> tuple[int, int]:
+        """x, y in sub-pixels (see fixed.py). exact with settings.FIXED_POINT on"""
+        if self.__units is None:
+            return fixed.to_units(self.__x), fixed.to_units(self.__y)
+        return self.__units
+
     def get_y(self) -> float:
         return self.__y
 
@@ -166,15 +307,27 @@ class Piece:
     def get_piece_name(self) -> str:
         return self.__piece_name
 
+    def overlay_version(self) -> int:
+        """
+        changes whenever what's drawn over the board for self when it's selected (its
+        points and guide lines, see Pieces.draw) does
+        """
+        return self.__overlay_version
+
+    def get_zobrist(self) -> int:
+        """the hash of self's state (see zobrist.py). kept up to date as it moves and rotates"""
+        return self.__zobrist
+
     def should_promote(self) -> bool:
-        # board height is 400px, tile height is 50
+        # when it touches the last rank
         if self.__piece_name != "pawn":
             return False
 
         if self.__side == Side.BLACK:
-            return self.__y + settings.HITCIRCLE_RADIUS > 350
+            last_rank = settings.BOARD.height - geometry.TILE
+            return self.__y + settings.HITCIRCLE_RADIUS > last_rank
         if self.__side == Side.WHITE:
-            return self.__y - settings.HITCIRCLE_RADIUS < 50
+            return self.__y - settings.HITCIRCLE_RADIUS < geometry.TILE
 
         return False
 
@@ -185,18 +338,32 @@ class Piece:
         """
         dprint(f"moving {self.__piece_name} xy {self.__x}, {self.__y} to xy {x}, {y}")
 
+        if settings.FIXED_POINT:
+            self.__units = fixed.to_units(x), fixed.to_units(y)
+            x, y = fixed.from_units(self.__units[0]), fixed.from_units(self.__units[1])
+        else:
+            self.__units = None
         self.__x = x
         self.__y = y
+        self.__zobrist = zobrist.piece_hash(*self.to_state())
+        self.__overlay_version += 1
 
-        if self.__actual_image is not None:
+        if not self.needs_init:
             self.update_capture_points()
             self.update_move_points()
+        if self.__actual_image is not None:
             self.__set_nonpreview_blit_rect()
 
     def get_movable_points(self) -> list[tuple[float, float]]:
         assert not self.needs_init
         return self.__capture_points + self.__move_points
 
+    def __point(self, offset_x: float, offset_y: float) -> tuple[float, float]:
+        """the point at an offset from self"""
+        if settings.FIXED_POINT:
+            return fixed.snap(self.__x + offset_x), fixed.snap(self.__y + offset_y)
+        return self.__x + offset_x, self.__y + offset_y
+
     def __init_capture_points(self):
         self.__capture_points = []
         self.__capture_points.clear()
@@ -207,7 +374,7 @@ class Piece:
 
         for cap_DA in self.__capture_DAs:
             for x, y in cap_DA.get_offsets(angle):
-                point = (x + self.__x, y + self.__y)
+                point = self.__point(x, y)
                 if not self.should_draw_point(point[0], point[1]):
                     break
 
@@ -215,6 +382,7 @@ class Piece:
 
     def update_capture_points(self):
         assert not self.needs_init
+        self.__overlay_version += 1
         cap_points = self.__capture_points
         if self.__preview_capture_points is not None:
             cap_points = self.__preview_capture_points
@@ -227,7 +395,7 @@ class Piece:
 
         for cap_DA in self.__capture_DAs:
             for x, y in cap_DA.get_offsets(angle):
-                point = (x + self.__x, y + self.__y)
+                point = self.__point(x, y)
                 if not self.should_draw_point(point[0], point[1]):
                     break
 
@@ -239,7 +407,7 @@ class Piece:
 
         for move_DA in self.__move_DAs:
             for x, y in move_DA.get_offsets(self.__angle):
-                point = (x + self.__x, y + self.__y)
+                point = self.__point(x, y)
                 if not self.should_draw_point(point[0], point[1]):
                     break
 
@@ -247,6 +415,7 @@ class Piece:
 
     def update_move_points(self):
         assert not self.needs_init
+        self.__overlay_version += 1
 
         move_points = self.__move_points
         if self.__preview_move_points is not None:
@@ -259,7 +428,7 @@ class Piece:
 
         for move_DA in self.__move_DAs:
             for x, y in move_DA.get_offsets(angle):
-                point = (x + self.__x, y + self.__y)
+                point = self.__point(x, y)
                 if not self.should_draw_point(point[0], point[1]):
                     break
 
@@ -352,7 +521,8 @@ class Piece:
                     pygame.math.Vector2(x, y) + center
                 )  # point is a point the piece can move to
                 # center = point
-                if abs(x) > 1000 or abs(y) > 1000:
+                # (endless DistsAngles stop just past the edge of the board)
+                if not self.should_draw_point(point[0], point[1]):
                     break
             # draw from center to the furthest points
             pygame.draw.line(
@@ -363,41 +533,39 @@ class Piece:
             )
 
     def should_draw_point(self, x: float, y: float) -> bool:
-        BOARD_SIZE = 50 * 8
-        MARGIN = settings.HITCIRCLE_RADIUS
-        if (
-            x < 0 - MARGIN
-            or x > BOARD_SIZE + MARGIN
-            or y < 0 - MARGIN
-            or y > BOARD_SIZE + MARGIN
-        ):
-            return False
-        return True
+        return settings.BOARD.on_board(x, y, margin=settings.HITCIRCLE_RADIUS)
 
     def set_preview_angle(self, angle: float):
         """angle as radians"""
-        assert self.__default_image is not None
+        if settings.FIXED_POINT:
+            angle = fixed.snap_angle(angle)
         self.__preview_angle = angle
-        self.__preview_image = pygame.transform.rotate(
-            self.__default_image, math.degrees(angle)
-        )
+        self.__overlay_version += 1
+        if self.__default_image is not None:
+            self.__preview_image = pygame.transform.rotate(
+                self.__default_image, math.degrees(angle)
+            )
         if self.__preview_move_points is None and self.__preview_capture_points is None:
             self.__preview_move_points = []
             self.__preview_capture_points = []
 
     def confirm_preview(self):
         assert not self.needs_init
-        assert self.__preview_angle is not None and self.__preview_image is not None
+        assert self.__preview_angle is not None
+        assert (self.__preview_image is None) == (self.__default_image is None)
 
         dprint(
             f"rotating {self.get_x()},{self.get_y()}{self.__piece_name} {self.__angle}rad to {self.__preview_angle}rad"
         )
 
-        self.__actual_image = self.__preview_image
+        if self.__preview_image is not None:
+            self.__actual_image = self.__preview_image
         self.__preview_image = None
 
         self.__angle = self.__preview_angle
         self.__preview_angle = None
+        self.__zobrist = zobrist.piece_hash(*self.to_state())
+        self.__overlay_version += 1
 
         assert self.__preview_move_points is not None
         assert self.__preview_capture_points is not None
@@ -406,21 +574,36 @@ class Piece:
         self.__capture_points = self.__preview_capture_points
         self.__preview_capture_points = None
 
-        self.__set_nonpreview_blit_rect()
+        if self.__actual_image is not None:
+            self.__set_nonpreview_blit_rect()
+
+    def rotate(self, angle: float):
+        """
+        strictly just rotates self to angle (in radians), as if previewing and confirming it.
+        works headless.
+        """
+        assert not self.needs_init
+        self.set_preview_angle(angle)
+        self.update_capture_points()
+        self.update_move_points()
+        self.confirm_preview()
 
     def stop_previewing(self):
+        self.__overlay_version += 1
         self.__preview_angle = None
         self.__preview_image = None
         self.__preview_move_points = None
         self.__preview_capture_points = None
 
-        self.__set_nonpreview_blit_rect()
+        if self.__actual_image is not None:
+            self.__set_nonpreview_blit_rect()
 
     def init(self):
         self.__init_movement()
         self.__init_capture_points()
         self.__init_move_points()
         self.needs_init = False
+        self.__overlay_version += 1
 
     def __init_movement(self):
         """initializes DAs and changes whether the piece can jump from the default"""
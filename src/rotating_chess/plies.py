@@ -0,0 +1,268 @@
+"""
+every ply a side can play from a board, for searching and counting lines of play.
+
+rotation angles are continuous, so plies only rotate to a fixed set of them: n angles
+evenly spaced around the circle, the first pointing straight ahead (see angle_set). a
+ply follows the recommended rules (see the readme): the side to move moves a piece,
+then may rotate it to any of the angles (other than the one it's at).
+
+move generators only decide, for a selected piece and its movable points, which it may
+move to:
+    reference   Pieces.canmove, one point at a time
+    numpy       Pieces.canmove_many, vectorized (see canmove.py)
+    fixed       Pieces.canmove with settings.FIXED_POINT (see fixed.py)
+the board's moves and captures are always Pieces.move's, so every generator should
+find exactly the same plies (perft.py checks that they do).
+
+>>> plies = PlyGenerator(reference, angle_set(4))
+>>> ply, board = next(plies.children(start_board(), Side.WHITE))
+>>> ply.name(), ply.actions()
+('1/0', [Move(piece=1, x=75.0, y=275.0)])
+"""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import random
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+from rotating_chess import fixed, settings
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.canmove import HAVE_NUMPY
+from rotating_chess.history import TurnNode
+from rotating_chess.pieces import Action, Board, Move, Piece, PieceState, Rotate, Side
+from rotating_chess.widgets import Pieces
+
+# how many boards' pieces a PlyGenerator keeps around to reuse
+LOADED_BOARDS = 16
+
+# (selected pieces, the selected piece, its movable points) -> whether it may move to each
+Generator = Callable[[Pieces, Piece, list[tuple[float, float]]], list[bool]]
+
+
+def reference(
+    pieces: Pieces, piece: Piece, points: list[tuple[float, float]]
+) -> list[bool]:
+    return [pieces.canmove(piece, *point) for point in points]
+
+
+def vectorized(
+    pieces: Pieces, piece: Piece, points: list[tuple[float, float]]
+) -> list[bool]:
+    return pieces.canmove_many(piece, points)
+
+
+# name -> (generator, whether it runs with settings.FIXED_POINT)
+GENERATORS: dict[str, tuple[Generator, bool]] = {
+    "reference": (reference, False),
+    "numpy": (vectorized, False),
+    "fixed": (reference, True),
+}
+
+
+def fastest() -> Generator:
+    """the fastest generator that doesn't need settings changed"""
+    return vectorized if HAVE_NUMPY else reference
+
+
+@contextlib.contextmanager
+def fixed_point(enabled: bool) -> Iterator[None]:
+    before = settings.FIXED_POINT
+    settings.FIXED_POINT = enabled
+    try:
+        yield
+    finally:
+        settings.FIXED_POINT = before
+
+
+@contextlib.contextmanager
+def board_geometry(geometry: BoardGeometry) -> Iterator[None]:
+    """plays on geometry's board (see geometry.py) instead of settings.BOARD"""
+    before = settings.BOARD
+    settings.BOARD = geometry
+    try:
+        yield
+    finally:
+        settings.BOARD = before
+
+
+def start_board(seed: int | None = None) -> Board:
+    """
+    the normal board, or with a seed, that seed's chess 960 board. on settings.BOARD
+    """
+    pieces = Pieces()
+    if seed is None:
+        pieces.load_normal_board(None, None)
+    else:
+        # load_chess_960 shuffles with the global generator. leave it as it was
+        state = random.getstate()
+        random.seed(seed)
+        pieces.load_chess_960(None, None)
+        random.setstate(state)
+    return tuple(piece.to_state() for piece in pieces.pieces)
+
+
+def angle_set(n: int) -> list[float]:
+    """n angles, evenly spaced around the circle, in radians"""
+    return [math.remainder(2 * math.pi * k / n, 2 * math.pi) for k in range(n)]
+
+
+def other(side: Side) -> Side:
+    return Side.BLACK if side == Side.WHITE else Side.WHITE
+
+
+def mover(before: Board, after: Board) -> Side | None:
+    """the side that made the turn from before to after, if anything moved or turned"""
+    unchanged = set(before)
+    changed = next((state for state in after if state not in unchanged), None)
+    return None if changed is None else changed.side
+
+
+def to_move(node: TurnNode) -> Side:
+    """
+    whose turn it is after node: the side that didn't make the last turn (white's, at
+    the start). found by what changed, since loaded turns don't know their actions
+    """
+    if node.parent is None:
+        return Side.WHITE
+    side = mover(node.parent.board, node.board)
+    if side is None:
+        # nothing moved or turned: look further back
+        return to_move(node.parent)
+    return other(side)
+
+
+def is_rotation(before: Board, after: Board) -> bool:
+    """whether after is before with only angles changed"""
+    return len(before) == len(after) and all(
+        a.x == b.x and a.y == b.y for a, b in zip(before, after)
+    )
+
+
+class Ply(NamedTuple):
+    # index of the piece that moves
+    piece: int
+    # which of its movable points it moves to
+    point: int
+    x: float
+    y: float
+    # its index after moving (captures and promotion shift pieces around)
+    moved: int
+    # what it then rotates to, if it does
+    angle: float | None = None
+
+    def name(self) -> str:
+        """
+        e.g. "12/3", or "12/3@90" if it rotates. not by x, y: fixed point moves to
+        (very slightly) different ones
+        """
+        name = f"{self.piece}/{self.point}"
+        if self.angle is None:
+            return name
+        return f"{name}@{math.degrees(self.angle):.0f}"
+
+    def actions(self) -> list[Action]:
+        """the turns that play it, as recorded by TurnNavigation"""
+        actions: list[Action] = [Move(self.piece, self.x, self.y)]
+        if self.angle is not None:
+            actions.append(Rotate(((self.moved, self.angle),)))
+        return actions
+
+
+class PlyGenerator:
+    """finds plies (and the boards they lead to) with one generator"""
+
+    def __init__(self, generator: Generator, angles: list[float]) -> None:
+        self.__generator = generator
+        self.__angles = angles
+        self.__pieces = Pieces()
+        # by id(board): (board, its pieces, each piece's state by id(piece)). searches
+        # come back to the same few boards over and over, so their pieces are reused
+        self.__loaded: dict[int, tuple[Board, list[Piece], dict[int, PieceState]]] = {}
+
+    def __load(self, board: Board) -> tuple[list[Piece], dict[int, PieceState]]:
+        loaded = self.__loaded.get(id(board))
+        # (holding on to the board means its id can't be reused while it's here)
+        if loaded is None or loaded[0] is not board:
+            pieces = [Piece.from_state(state, None, None) for state in board]
+            loaded = board, pieces, {id(p): s for p, s in zip(pieces, board)}
+            self.__loaded[id(board)] = loaded
+            if len(self.__loaded) > LOADED_BOARDS:
+                del self.__loaded[next(iter(self.__loaded))]
+        self.__pieces.pieces = loaded[1]
+        return loaded[1], loaded[2]
+
+    def load(self, board: Board) -> list[Piece]:
+        """pieces for board, to check moves on. don't change them: they're reused"""
+        return self.__load(board)[0]
+
+    def moves(self, side: Side) -> list[tuple[int, int, float, float]]:
+        """
+        (index, which of its movable points, x, y) of every legal move of side on the
+        loaded board
+        """
+        moves = []
+        for idx, piece in enumerate(self.__pieces.pieces):
+            if piece.get_side() != side:
+                continue
+            if piece.needs_init:
+                piece.init()
+            self.__pieces.selected_pieces.append(piece)
+            points = piece.get_movable_points()
+            oks = self.__generator(self.__pieces, piece, points)
+            self.__pieces.selected_pieces.pop()
+            # capture points are often move points too. they're the same move
+            seen = set()
+            for n, (point, ok) in enumerate(zip(points, oks)):
+                if ok and point not in seen:
+                    seen.add(point)
+                    moves.append((idx, n, *point))
+        return moves
+
+    def rotations(self, angle: float) -> list[float]:
+        """the angles a piece at angle may rotate to"""
+        units = fixed.angle_to_units(angle)
+        return [a for a in self.__angles if fixed.angle_to_units(a) != units]
+
+    def play(self, board: Board, idx: int, x: float, y: float) -> tuple[Board, int]:
+        """board after moving the piece at idx to x, y, and where that piece is now"""
+        loaded, states = self.__load(board)
+        # Pieces.move only changes the piece it moves (and which pieces there are), so
+        # that's the only one that needs to be new
+        piece = Piece.from_state(board[idx], None, None)
+        pieces = loaded.copy()
+        pieces[idx] = piece
+        self.__pieces.pieces = pieces
+        self.__pieces.selected_pieces.append(piece)
+        self.__pieces.move(piece, x, y, None)
+        # promoted pieces are replaced by a queen, appended last
+        moved = next((i for i, p in enumerate(pieces) if p is piece), len(pieces) - 1)
+        # the rest keep their states
+        child = tuple(states.get(id(p)) or p.to_state() for p in pieces)
+        return child, moved
+
+    def children(self, board: Board, side: Side) -> Iterator[tuple[Ply, Board]]:
+        """every ply of side from board, and the board it leads to"""
+        self.load(board)
+        for idx, n, x, y in self.moves(side):
+            child, moved = self.play(board, idx, x, y)
+            yield Ply(idx, n, x, y, moved), child
+            for angle in self.rotations(child[moved].angle):
+                rotated = child[moved]._replace(angle=angle)
+                yield (
+                    Ply(idx, n, x, y, moved, angle),
+                    child[:moved] + (rotated,) + child[moved + 1 :],
+                )
+
+    def count(self, board: Board, side: Side) -> int:
+        """
+        how many plies side has from board. only finds the moves: moving (or
+        promoting) doesn't change a piece's angle, so there's no need to play them
+        """
+        pieces = self.load(board)
+        return sum(
+            1 + len(self.rotations(pieces[idx].get_angle()))
+            for idx, _, _, _ in self.moves(side)
+        )
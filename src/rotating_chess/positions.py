@@ -0,0 +1,210 @@
+"""
+finds the games (and turns) that reached a position, across any number of saves.
+
+positions aren't on a grid, so they're looked up by key: every piece's kind, side,
+and position and angle rounded to a grid, sorted, and hashed to 64 bits. each turn is
+stored under two keys:
+    exact   1 pixel and 1 degree. the same position, give or take float noise.
+    near    a tile and 45 degrees. the same pieces on the same squares, facing
+            roughly the same ways.
+(pieces right on the edge of a cell may round either way, so "near" can miss a
+position that's barely across one.)
+
+the index is a sqlite file with both keys indexed, so a lookup is a couple of b-tree
+searches however many turns are in it.
+
+    python -m rotating_chess.positions ingest positions.db game_saves/*.txt
+    python -m rotating_chess.positions ingest positions.db --archive games.rca
+    python -m rotating_chess.positions find positions.db game_saves/some_save.txt --turn 10 --near
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import sqlite3
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+from rotating_chess.archive import KIND_IDX, Archive
+from rotating_chess.history import parse_game_save
+from rotating_chess.pieces import Board, PieceState
+
+# a grid point is a tile's center. (a tile's 50 pixels wide)
+GRID_ORIGIN = 25.0
+# (pixels, degrees) per cell
+EXACT = (1.0, 1.0)
+NEAR = (50.0, 45.0)
+# how many games are inserted per transaction
+BATCH = 1000
+# kind, side, x, y, angle
+CELL = struct.Struct("<BBiih")
+
+SCHEMA = """
+create table if not exists games (
+    id integer primary key,
+    source text not null,
+    turns integer not null
+);
+create table if not exists positions (
+    exact integer not null,
+    near integer not null,
+    game integer not null references games(id),
+    turn integer not null
+);
+-- covering, and already in the order lookups want, so even a position that's in
+-- every game (like the first turn) only reads as many entries as asked for
+create index if not exists positions_exact on positions(exact, game, turn);
+create index if not exists positions_near on positions(near, game, turn);
+"""
+
+
+def cell(state: PieceState, step: float, angle_step: float) -> bytes:
+    """the grid cell a piece's in (rounding to the nearest grid point), packed"""
+    return CELL.pack(
+        KIND_IDX[state.piece_name],
+        state.side.value,
+        math.floor((state.x - GRID_ORIGIN) / step + 0.5),
+        math.floor((state.y - GRID_ORIGIN) / step + 0.5),
+        math.floor(math.degrees(state.angle) / angle_step + 0.5)
+        % round(360 / angle_step),
+    )
+
+
+def position_key(
+    board: Board, grid: tuple[float, float], cells: dict | None = None
+) -> int:
+    """
+    the key of a board at a grid's resolution, as a signed 64 bit int (for sqlite).
+    cells, if given, caches each piece's cell; boards share most of their pieces.
+
+    >>> from rotating_chess.pieces import Side
+    >>> a = (PieceState(25, 75, math.pi, Side.BLACK, "pawn"),)
+    >>> b = (PieceState(25.3, 74.9, math.pi + 0.001, Side.BLACK, "pawn"),)
+    >>> position_key(a, EXACT) == position_key(b, EXACT)
+    True
+    >>> c = (PieceState(45, 75, math.pi, Side.BLACK, "pawn"),)
+    >>> position_key(a, EXACT) == position_key(c, EXACT), position_key(a, NEAR) == position_key(c, NEAR)
+    (False, True)
+    """
+    if cells is None:
+        cells = {}
+    pieces = []
+    for state in board:
+        packed = cells.get(state)
+        if packed is None:
+            packed = cells[state] = cell(state, *grid)
+        pieces.append(packed)
+    pieces.sort()
+    digest = hashlib.blake2b(b"".join(pieces), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class PositionIndex:
+    """an sqlite file of every turn of every game ingested, keyed by position."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def ingest(self, games: Iterable[tuple[str, list[Board]]]) -> int:
+        """
+        adds (source, boards) games, BATCH games per transaction.
+        returns how many turns were added.
+        """
+        added = 0
+        batch: list[tuple[int, int, int, int]] = []
+        games_left = BATCH
+        cursor = self.db.cursor()
+        for source, boards in games:
+            cursor.execute(
+                "insert into games (source, turns) values (?, ?)", (source, len(boards))
+            )
+            game = cursor.lastrowid
+            assert game is not None  # set by the insert
+            exact: dict = {}
+            near: dict = {}
+            for turn, board in enumerate(boards):
+                batch.append(
+                    (
+                        position_key(board, EXACT, exact),
+                        position_key(board, NEAR, near),
+                        game,
+                        turn,
+                    )
+                )
+            games_left -= 1
+            if games_left == 0:
+                added += self.__flush(batch)
+                games_left = BATCH
+        added += self.__flush(batch)
+        return added
+
+    def __flush(self, batch: list) -> int:
+        self.db.executemany("insert into positions values (?, ?, ?, ?)", batch)
+        self.db.commit()
+        added = len(batch)
+        batch.clear()
+        return added
+
+    def find(
+        self, board: Board, near: bool = False, limit: int = 100
+    ) -> list[tuple[str, int, int]]:
+        """(source, game id, turn) of up to limit turns at (or near) board's position"""
+        column = "near" if near else "exact"
+        key = position_key(board, NEAR if near else EXACT)
+        return self.db.execute(
+            f"select games.source, game, turn from positions join games on games.id = game "
+            f"where {column} = ? order by game, turn limit ?",
+            (key, limit),
+        ).fetchall()
+
+    def __len__(self) -> int:
+        """how many turns are indexed"""
+        return self.db.execute("select count(*) from positions").fetchone()[0]
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def save_files(paths: Iterable[Path]) -> Iterable[tuple[str, list[Board]]]:
+    for path in paths:
+        try:
+            yield str(path), parse_game_save(path.read_text())
+        except Exception as e:
+            print(f"skipping {path}: {e}")
+
+
+def archived(path: Path) -> Iterable[tuple[str, list[Board]]]:
+    with Archive(path) as archive:
+        for game in range(len(archive)):
+            yield f"{path}#{game}", archive.boards(game)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="indexes games by position")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = commands.add_parser("ingest", help="add games to an index")
+    ingest_parser.add_argument("db", type=Path)
+    ingest_parser.add_argument("saves", type=Path, nargs="*")
+    ingest_parser.add_argument("--archive", type=Path, action="append", default=[])
+    find_parser = commands.add_parser("find", help="find a save's position")
+    find_parser.add_argument("db", type=Path)
+    find_parser.add_argument("save", type=Path)
+    find_parser.add_argument("--turn", type=int, default=-1)
+    find_parser.add_argument("--near", action="store_true")
+    args = parser.parse_args()
+
+    index = PositionIndex(args.db)
+    if args.command == "ingest":
+        added = index.ingest(save_files(args.saves))
+        for path in args.archive:
+            added += index.ingest(archived(path))
+        print(f"added {added} turns, {len(index)} in all")
+    else:
+        board = parse_game_save(args.save.read_text())[args.turn]
+        for source, game, turn in index.find(board, args.near):
+            print(f"{source} turn {turn}")
+    index.close()
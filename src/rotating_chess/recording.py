@@ -0,0 +1,160 @@
+"""
+records the input a game's frames consumed, and replays it headlessly.
+
+Recorder hooks into frame.update, writing down each frame's events and mouse position
+as it handles them. replay feeds them back through headless.run_frame (so through the
+very same widget handle_event paths) as fast as they'll go, timing each frame, each
+phase and each event, so a real session can be rerun as a UI performance test.
+
+recordings are gzipped json lines. the first is a header, then one line per frame:
+    [x, y, [[type, {attribute: value, ...}], ...]]    a frame with events
+    n                                                 n frames without any
+frames without events don't depend on the mouse, so long idle stretches cost a few
+bytes. attributes that don't fit in json (e.g. pygame's window objects) are dropped.
+
+events the game posts to itself from other threads (SAVE_IO_DONE) aren't recorded:
+replaying the save import or export that posted them posts them again. a replay is
+deterministic as long as the session was, so recordings start from a new game (main.py
+doesn't recover its journal while recording), and paste whatever's on the clipboard
+when they're replayed.
+
+    uv run python main.py --record session.rec.gz
+    uv run python -m rotating_chess.recording session.rec.gz --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+from pygame.event import Event
+
+from rotating_chess import headless
+from rotating_chess.gamestate import GameState
+from rotating_chess.widgets import SAVE_IO_DONE
+
+FORMAT = 1
+# posted by the game's own workers, see above
+NOT_RECORDED = {SAVE_IO_DONE}
+
+# a frame's input: events, and where the mouse is
+Frame = tuple[list[Event], tuple[int, int]]
+
+
+def jsonable(value: object) -> bool:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, (tuple, list)):
+        return all(jsonable(item) for item in value)
+    return False
+
+
+def encode_event(event: Event) -> list:
+    return [
+        event.type,
+        {key: value for key, value in event.dict.items() if jsonable(value)},
+    ]
+
+
+def decode_event(data: list) -> Event:
+    type, attributes = data
+    # json has no tuples, and pygame's positions are
+    return Event(
+        type,
+        {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in attributes.items()
+        },
+    )
+
+
+class Recorder:
+    """writes a recording of frames' input to path, as they're handled"""
+
+    def __init__(self, path: Path | str) -> None:
+        self.__file = gzip.open(path, "wt", encoding="utf-8")
+        self.__file.write(json.dumps({"format": FORMAT}) + "\n")
+        self.__idle = 0
+        self.frames = 0
+
+    def record(self, events: list[Event], x: int, y: int) -> None:
+        events = [event for event in events if event.type not in NOT_RECORDED]
+        self.frames += 1
+        if not events:
+            self.__idle += 1
+            return
+        self.__flush_idle()
+        line = [x, y, [encode_event(event) for event in events]]
+        self.__file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+    def __flush_idle(self) -> None:
+        if self.__idle:
+            self.__file.write(f"{self.__idle}\n")
+            self.__idle = 0
+
+    def close(self) -> None:
+        self.__flush_idle()
+        self.__file.close()
+
+    def __enter__(self) -> Recorder:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_frames(path: Path | str) -> Iterator[Frame]:
+    """a recording's frames, in order"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"unknown recording format {header.get('format')}")
+        x, y = 0, 0
+        for line in f:
+            frame = json.loads(line)
+            if isinstance(frame, int):
+                # idle frames. the mouse stays where it was last seen
+                for _ in range(frame):
+                    yield [], (x, y)
+                continue
+            x, y, events = frame
+            yield [decode_event(event) for event in events], (x, y)
+
+
+def replay(
+    path: Path | str,
+    screen: pygame.Surface,
+    gs: GameState | None = None,
+    timer: headless.FrameTimer | None = None,
+) -> GameState:
+    """
+    replays a recording onto gs (a new game by default) as fast as it'll go, with
+    timer timing it. headless.init() first. returns gs.
+    """
+    if gs is None:
+        gs = headless.game_state()
+    for events, (x, y) in read_frames(path):
+        headless.run_frame(screen, gs, events, x, y, timer)
+    return gs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="replays a recorded session headlessly, timing it"
+    )
+    parser.add_argument("recording", type=Path)
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="times to replay it, each on a new game"
+    )
+    args = parser.parse_args()
+
+    screen = headless.init()
+    timer = headless.FrameTimer()
+    for _ in range(args.repeat):
+        gs = replay(args.recording, screen, timer=timer)
+    print(timer.report())
+    print(f"  ended on turn {gs.nav.get_curr_turn_idx() + 1} of {len(gs.nav)}")
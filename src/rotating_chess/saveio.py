@@ -0,0 +1,158 @@
+"""
+exports and imports game saves off the frame loop.
+
+encoding or decoding every turn of a long game takes long enough to drop frames, so
+it runs on a worker thread. the game only ever hands the worker immutable boards
+(TurnNavigation.get_line_boards), and only swaps a loaded history in once the worker is
+done with it (TurnNavigation.load_boards), so the frame loop never waits on it and
+never sees half a history. the browser has no threads; there, the work runs inline.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from rotating_chess.debug import dprint
+from rotating_chess.history import (
+    READ_CHUNK,
+    encode_game_save,
+    parse_game_save,
+    parse_game_save_stream,
+)
+from rotating_chess.notation import is_position, parse_position
+from rotating_chess.pieces import Board
+
+THREADED = sys.platform not in ["emscripten", "wasi"]
+
+T = TypeVar("T")
+
+
+class SaveTask(Generic[T]):
+    """
+    some save work running on a worker thread.
+    progress, done, result and error may be read from any thread at any time.
+    """
+
+    def __init__(
+        self,
+        work: Callable[[Callable[[float], None]], T],
+        on_done: Callable[[SaveTask[T]], None] | None = None,
+    ) -> None:
+        """
+        work(progress) does the work, calling progress with the fraction done as it goes.
+        on_done(task) is called from the worker thread once it's finished, either way.
+        """
+        self.__work = work
+        self.__on_done = on_done
+        self.__thread: threading.Thread | None = None
+        self.progress: float = 0.0
+        self.done: bool = False
+        self.result: T | None = None
+        self.error: Exception | None = None
+
+    def start(self, threaded: bool = THREADED) -> SaveTask[T]:
+        if threaded:
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+        else:
+            self.__run()
+        return self
+
+    def __run(self) -> None:
+        try:
+            self.result = self.__work(self.__report)
+            self.progress = 1.0
+        except Exception as e:
+            dprint(f"save task failed: {e!r}")
+            self.error = e
+        self.done = True
+        if self.__on_done is not None:
+            self.__on_done(self)
+
+    def __report(self, progress: float) -> None:
+        self.progress = progress
+
+    def join(self, timeout: float | None = None) -> None:
+        """waits for the task to finish"""
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def succeeded(self) -> bool:
+        return self.done and self.error is None
+
+
+def export_save(
+    boards: list[Board],
+    path: Path,
+    on_done: Callable[[SaveTask], None] | None = None,
+) -> SaveTask:
+    """encodes boards as a game save and writes it to path. the result is the save."""
+
+    def work(progress: Callable[[float], None]) -> str:
+        save = encode_game_save(boards, progress)
+        progress(0.9)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(save)
+        tmp.replace(path)
+        return save
+
+    return SaveTask(work, on_done).start()
+
+
+def import_save(
+    read: Callable[[], str],
+    on_done: Callable[[SaveTask], None] | None = None,
+) -> SaveTask:
+    """
+    decodes the game save read() returns (e.g. the clipboard's contents), or a single
+    board in notation (see notation.py), as a game of just that board.
+    the result is its boards, ready for TurnNavigation.load_boards.
+    """
+
+    def work(progress: Callable[[float], None]) -> list[Board]:
+        save = read()
+        if is_position(save):
+            return [parse_position(save)]
+        boards = parse_game_save(save, progress)
+        if len(boards) == 0:
+            raise ValueError("save has no turns")
+        return boards
+
+    return SaveTask(work, on_done).start()
+
+
+def import_save_file(
+    path: Path,
+    on_done: Callable[[SaveTask], None] | None = None,
+) -> SaveTask:
+    """import_save for a save file (e.g. one dropped on the window), see read_save_file"""
+    return SaveTask(lambda progress: read_save_file(path, progress), on_done).start()
+
+
+def read_save_file(
+    path: Path, progress: Callable[[float], None] | None = None
+) -> list[Board]:
+    """
+    the boards of a save file, streamed so even huge saves only ever have a chunk of
+    their text in memory. raises on an invalid (or empty) save.
+    """
+    size = max(path.stat().st_size, 1)
+    with open(path, "rb") as f:
+
+        def chunks() -> Iterator[str]:
+            while chunk := f.read(READ_CHUNK):
+                if progress is not None:
+                    progress(f.tell() / size)
+                # saves are base64. anything else is skipped like whitespace
+                yield chunk.decode("ascii", errors="replace")
+
+        boards = parse_game_save_stream(chunks())
+    if len(boards) == 0:
+        raise ValueError("save has no turns")
+    return boards
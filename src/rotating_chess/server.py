@@ -0,0 +1,228 @@
+"""
+hosts games over tcp so players (and their clients) can play from different machines.
+
+messages are compact json objects, one per line. clients only ever send actions,
+and the server only ever broadcasts the actions it accepted (deltas), so a turn costs
+a few dozen bytes on the wire no matter how long the game is. full saves are only
+sent when someone joins or falls out of sync.
+
+client -> server:
+    {"op": "join", "game": str, "side": 1 | 2 | null}   (null: not playing a side)
+    {"op": "watch", "game": str}                        (spectate, see spectate.py)
+    {"op": "act", "turn": int, "action": [...]}         (turn: the turn it's played from)
+    {"op": "sync"}
+
+server -> client:
+    {"op": "welcome", "game": str, "turn": int, "save": str}
+    {"op": "delta", "turn": int, "action": [...]}       (turn: the turn it results in)
+    {"op": "deltas", "turn": int, "actions": [[...], ...]}   (batched, to spectators)
+    {"op": "reject", "reason": str}
+
+each side can only be joined once, and sides take turns as in the readme: the side to
+move moves, then may rotate. players without a side get every turn but can't act.
+
+run a server with `python -m rotating_chess.server --port 8765`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+
+from rotating_chess.debug import dprint
+from rotating_chess.game import Game
+from rotating_chess.pieces import Move, Side, Action, action_from_JSON, action_to_JSON
+from rotating_chess.plies import to_move
+from rotating_chess.spectate import SpectatorChannel, Subscriber, encode
+
+DEFAULT_PORT = 8765
+# how long spectators' turns are batched up for, in seconds
+SPECTATOR_INTERVAL = 0.1
+
+
+class Connection:
+    """one client of the server. it's in at most one game at a time."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.game: HostedGame | None = None
+        self.side: Side | None = None
+        # set while spectating
+        self.subscriber: Subscriber | None = None
+        self.pump: asyncio.Task | None = None
+
+    def leave(self) -> None:
+        if self.game is not None:
+            self.game.conns.discard(self)
+            if self.subscriber is not None:
+                self.game.spectators.unsubscribe(self.subscriber)
+        if self.pump is not None:
+            self.pump.cancel()
+        self.game = self.subscriber = self.pump = None
+
+    async def pump_spectated(self) -> None:
+        """writes spectator batches as fast as this client reads them, and no faster"""
+        assert self.subscriber is not None
+        while True:
+            self.writer.write(await self.subscriber.get())
+            await self.writer.drain()
+
+    def send(self, msg: dict) -> None:
+        """queues msg without waiting for it to be written."""
+        self.writer.write(encode(msg))
+
+
+class HostedGame:
+    """a Game plus everyone connected to it."""
+
+    def __init__(self, game_id: str) -> None:
+        self.game_id = game_id
+        self.game = Game()
+        # players. spectators are only in the channel
+        self.conns: set[Connection] = set()
+        self.spectators = SpectatorChannel(
+            self.game.nav, interval=SPECTATOR_INTERVAL, snapshot=self.welcome
+        )
+
+    def tip(self) -> int:
+        """index of the latest turn. hosted games only ever grow at the end."""
+        return len(self.game.nav) - 1
+
+    def welcome(self) -> dict:
+        return {
+            "op": "welcome",
+            "game": self.game_id,
+            "turn": self.tip(),
+            "save": self.game.nav.get_game_save(),
+        }
+
+    def play(self, conn: Connection, turn: int, action: Action) -> str | None:
+        """
+        validates and plays action for conn, broadcasting it if it's accepted.
+        returns the reason it was rejected, if it was.
+        """
+        if turn != self.tip():
+            return f"stale turn {turn}, game is at {self.tip()}"
+
+        board = self.game.pieces.pieces
+        indices = (
+            [action.piece]
+            if isinstance(action, Move)
+            else [i for i, _ in action.rotations]
+        )
+        if not all(0 <= i < len(board) for i in indices):
+            return "no such piece"
+        if conn.side is None:
+            return "not playing a side"
+        if any(board[i].get_side() != conn.side for i in indices):
+            return "not your piece"
+        # the side to move moves, then may rotate (see the readme's rules)
+        last = self.game.nav.get_curr_node()
+        if isinstance(action, Move):
+            if to_move(last) != conn.side:
+                return "not your turn"
+        elif not isinstance(last.action, Move) or to_move(last) == conn.side:
+            return "not your turn"
+
+        if not self.game.apply(action):
+            return "illegal move"
+
+        # as recorded, e.g. snapped to the movable point
+        played = self.game.nav.get_curr_action()
+        assert played is not None
+        self.broadcast(
+            {"op": "delta", "turn": self.tip(), "action": action_to_JSON(played)}
+        )
+        return None
+
+    def broadcast(self, msg: dict) -> None:
+        data = encode(msg)
+        for conn in self.conns:
+            conn.writer.write(data)
+
+
+class GameServer:
+    """hosts any number of games, each made on first join."""
+
+    def __init__(self) -> None:
+        self.games: dict[str, HostedGame] = {}
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+    ) -> asyncio.Server:
+        """starts listening. use port 0 to pick any free port."""
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        conn = Connection(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    self.handle_message(conn, json.loads(line))
+                except (ValueError, KeyError, TypeError, IndexError) as e:
+                    conn.send({"op": "reject", "reason": f"bad message: {e}"})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            conn.leave()
+            writer.close()
+
+    def handle_message(self, conn: Connection, msg: dict) -> None:
+        op = msg["op"]
+        if op in ("join", "watch"):
+            conn.leave()
+            game_id = str(msg["game"])
+            if game_id not in self.games:
+                self.games[game_id] = HostedGame(game_id)
+            conn.game = self.games[game_id]
+            if op == "watch":
+                # the channel sends the welcome
+                conn.subscriber = conn.game.spectators.subscribe()
+                conn.pump = asyncio.create_task(conn.pump_spectated())
+                return
+            side = None if msg.get("side") is None else Side(msg["side"])
+            if side is not None and any(c.side == side for c in conn.game.conns):
+                conn.game = None
+                conn.send({"op": "reject", "reason": f"{side.name.lower()} is taken"})
+                return
+            conn.side = side
+            conn.game.conns.add(conn)
+            conn.send(conn.game.welcome())
+        elif conn.subscriber is not None and op == "sync":
+            # the channel sends the welcome, in order with its batches
+            assert conn.game is not None
+            conn.game.spectators.resync(conn.subscriber)
+        elif conn.subscriber is not None:
+            conn.send({"op": "reject", "reason": "spectators can't do that"})
+        elif conn.game is None:
+            conn.send({"op": "reject", "reason": "join a game first"})
+        elif op == "act":
+            reason = conn.game.play(
+                conn, int(msg["turn"]), action_from_JSON(msg["action"])
+            )
+            if reason is not None:
+                dprint(f"rejected {msg}: {reason}")
+                conn.send({"op": "reject", "reason": reason})
+        elif op == "sync":
+            conn.send(conn.game.welcome())
+        else:
+            conn.send({"op": "reject", "reason": f"unknown op {op!r}"})
+
+
+async def serve(host: str, port: int) -> None:
+    server = await GameServer().start(host, port)
+    print(f"serving on {', '.join(str(s.getsockname()) for s in server.sockets)}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="hosts rotating chess games")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
@@ -1,5 +1,7 @@
 from enum import Enum
 
+from rotating_chess.geometry import BoardGeometry
+
 # gray on black
 # BACKGROUND_COLOR = (150, 150, 150)
 # BOARD_COLOR = (0, 0, 0)
@@ -12,9 +14,14 @@ SELECTED_PIECE_COLOR = (255, 255, 153)  # yellowish
 MOVE_POINT_COLOR = (173, 255, 244)  # cyanish
 CAPTURE_POINT_COLOR = (255, 0, 0)  # red
 HITCIRCLE_COLOR = (0, 255, 127)  # springgreen
+HINT_COLOR = (255, 165, 0)  # orange
 
 HITCIRCLE_RADIUS: int = 17
 
+# how many files and ranks the board has (see geometry.py). bigger boards than the
+# normal 8 by 8 are for stress testing, and need a wider window (see main.py)
+BOARD = BoardGeometry(8, 8)
+
 
 # THESE ARE SKIN OPTIONS. DO NOT EDIT
 class PieceSkin(Enum):
@@ -29,3 +36,16 @@ SKIN = PieceSkin.b
 
 # whether a player may select and rotate multiple pieces at once
 CAN_SELECT_MULTIPLE = False
+
+# whether to autosave the game as it's played and pick it back up on the next launch.
+# only on desktop; the browser has nowhere to keep it.
+AUTOSAVE = True
+AUTOSAVE_DIR = "autosave"
+
+# whether piece positions and angles are kept on a fixed-point grid (see fixed.py), so
+# that equal positions are exactly equal however they were reached
+FIXED_POINT = False
+
+# whether to show hints (the best ply a search finds, see hints.py) from the start.
+# h toggles them either way. desktop only; the browser can't search off the frame loop.
+HINTS = False
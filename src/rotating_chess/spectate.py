@@ -0,0 +1,185 @@
+"""
+fans a game's turns out to any number of spectators without stalling the game.
+
+the game side only ever appends to a batch (SpectatorChannel.on_turn, hooked into
+TurnNavigation.record_turn). flush() encodes the batch once and offers the same bytes
+to every subscriber's bounded queue; each subscriber drains its queue at its own pace
+(e.g. a task writing to its socket). a subscriber that falls more than max_queue
+batches behind has its queue thrown away and gets a snapshot (a full game save) to
+resync from instead, so slow consumers cost a bounded amount of memory and never
+block anyone else.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from collections.abc import Callable
+
+from rotating_chess.history import TurnNavigation, TurnNode
+from rotating_chess.pieces import action_to_JSON
+
+
+def encode(msg: dict) -> bytes:
+    """one message of the server protocol: compact json on one line"""
+    return (json.dumps(msg, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class Subscriber:
+    """one spectator's bounded queue of encoded messages"""
+
+    def __init__(self, max_queue: int) -> None:
+        self.max_queue = max_queue
+        self.__queue: deque[bytes] = deque()
+        self.__ready = asyncio.Event()
+        # new subscribers start from a snapshot
+        self.needs_snapshot = True
+        # how many times we fell too far behind and were resynced
+        self.resyncs = 0
+
+    def depth(self) -> int:
+        return len(self.__queue)
+
+    def offer(self, data: bytes) -> bool:
+        """queues data, unless we're full. returns whether it was queued."""
+        if len(self.__queue) >= self.max_queue:
+            return False
+        self.__queue.append(data)
+        self.__ready.set()
+        return True
+
+    def reset(self, snapshot: bytes) -> None:
+        """throws away everything queued in favour of snapshot"""
+        self.__queue.clear()
+        self.__queue.append(snapshot)
+        self.needs_snapshot = False
+        self.__ready.set()
+
+    def get_nowait(self) -> bytes | None:
+        if not self.__queue:
+            return None
+        data = self.__queue.popleft()
+        if not self.__queue:
+            self.__ready.clear()
+        return data
+
+    async def get(self) -> bytes:
+        while not self.__queue:
+            await self.__ready.wait()
+        data = self.get_nowait()
+        assert data is not None
+        return data
+
+
+class SpectatorChannel:
+    """
+    batches the turns recorded in nav and fans them out to subscribers.
+
+    batches look like {"op": "deltas", "turn": int, "actions": [[...], ...]}, where turn
+    is the turn the first action results in. snapshots are whatever snapshot() returns;
+    by default {"op": "welcome", "turn": int, "save": str}.
+    """
+
+    def __init__(
+        self,
+        nav: TurnNavigation,
+        max_queue: int = 64,
+        interval: float | None = None,
+        snapshot: Callable[[], dict] | None = None,
+    ) -> None:
+        """
+        if interval is given (in seconds), flushes itself that long after a batch is started,
+        using the running asyncio loop. otherwise call flush() yourself, e.g. once per tick.
+        """
+        self.__nav = nav
+        self.max_queue = max_queue
+        self.interval = interval
+        self.__snapshot = snapshot
+        self.subscribers: set[Subscriber] = set()
+        self.__pending: list[list] = []
+        self.__pending_turn = 0
+        self.__scheduled = False
+        nav.subscribe(self.on_turn, self.on_load)
+
+    def subscribe(self) -> Subscriber:
+        sub = Subscriber(self.max_queue)
+        self.subscribers.add(sub)
+        if self.interval is not None:
+            self.__schedule()
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self.subscribers.discard(sub)
+
+    def resync(self, sub: Subscriber) -> None:
+        """sends sub a snapshot on the next flush, e.g. when it asks for one"""
+        sub.needs_snapshot = True
+        if self.interval is not None:
+            self.__schedule()
+
+    def on_turn(self, node: TurnNode) -> None:
+        if node.action is None or (
+            self.__pending and node.depth != self.__pending_turn + len(self.__pending)
+        ):
+            # not something deltas can describe. everyone resyncs
+            self.on_load()
+            return
+        if not self.__pending:
+            self.__pending_turn = node.depth
+        self.__pending.append(action_to_JSON(node.action))
+        if self.interval is not None:
+            self.__schedule()
+
+    def on_load(self) -> None:
+        self.__pending.clear()
+        for sub in self.subscribers:
+            sub.needs_snapshot = True
+
+    def __schedule(self) -> None:
+        if not self.__scheduled:
+            self.__scheduled = True
+            assert self.interval is not None
+            asyncio.get_running_loop().call_later(self.interval, self.flush)
+
+    def snapshot(self) -> dict:
+        if self.__snapshot is not None:
+            return self.__snapshot()
+        return {
+            "op": "welcome",
+            "turn": len(self.__nav) - 1,
+            "save": self.__nav.get_game_save(),
+        }
+
+    def flush(self) -> None:
+        """sends the pending batch to everyone, and snapshots to whoever needs one"""
+        self.__scheduled = False
+        batch = None
+        if self.__pending:
+            batch = encode(
+                {"op": "deltas", "turn": self.__pending_turn, "actions": self.__pending}
+            )
+            self.__pending = []
+
+        # made at most once per flush, however many subscribers need it
+        snapshot: bytes | None = None
+        for sub in self.subscribers:
+            if not sub.needs_snapshot and (batch is None or sub.offer(batch)):
+                continue
+            if not sub.needs_snapshot:
+                # fell too far behind
+                sub.resyncs += 1
+            if snapshot is None:
+                snapshot = encode(self.snapshot())
+            sub.reset(snapshot)
+
+    def depths(self) -> dict[str, float]:
+        """queue depth stats, for monitoring"""
+        depths = [sub.depth() for sub in self.subscribers]
+        return {
+            "subscribers": len(depths),
+            "queued": sum(depths),
+            "max_depth": max(depths, default=0),
+            "mean_depth": sum(depths) / len(depths) if depths else 0,
+            "resyncs": sum(sub.resyncs for sub in self.subscribers),
+        }
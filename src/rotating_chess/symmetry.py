@@ -0,0 +1,196 @@
+"""
+positions that are the same up to the board's symmetries, and their canonical form.
+
+the board has two:
+    mirror  left to right. (x, y, angle) -> (width - x, y, -angle)
+    flip    top to bottom, swapping sides. (x, y, angle, side) ->
+            (x, height - y, pi - angle, the other side)
+(width and height are settings.BOARD's, see geometry.py.)
+(every piece's moves are symmetric under both, so a mirrored or flipped position plays
+exactly like the original, mirrored or flipped.) with both, and neither, that's four
+symmetries, each its own inverse.
+
+a position's canonical key is the smallest of its four transformed positions' hashes
+(see zobrist.py), so the same for all four; use it instead of zobrist hashes to key a
+cache (transposition tables, opening books, ...) and store each position once instead
+of up to four times. a flip swaps sides, so if whose turn it is matters to the cache,
+use canonical(board, flip=False), or key on it too, or canonical_to_move.
+
+the hashes are of positions in fixed-point units (see fixed.py), transformed exactly
+there, so a position and its transforms always get the very same key.
+
+>>> from rotating_chess.game import Game
+>>> board = Game().nav.get_curr_board()
+>>> canonical_key(board) == canonical_key(transform(board, Symmetry.MIRROR))
+True
+>>> canonical_key(board) == canonical_key(transform(board, Symmetry.FLIP))
+True
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from enum import Enum
+
+from rotating_chess import fixed, settings, zobrist
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.pieces import Board, Move, Rotate, Action, PieceState, Side
+
+HALF_TURN = fixed.ANGLE_UNITS // 2
+OTHER_SIDE = {Side.BLACK: Side.WHITE, Side.WHITE: Side.BLACK}
+
+
+class Symmetry(Enum):
+    # (mirror, flip)
+    IDENTITY = (False, False)
+    MIRROR = (True, False)
+    FLIP = (False, True)
+    MIRROR_FLIP = (True, True)
+
+
+def transform_point(x: float, y: float, symmetry: Symmetry) -> tuple[float, float]:
+    mirror, flip = symmetry.value
+    geometry = settings.BOARD
+    return (geometry.width - x if mirror else x), (geometry.height - y if flip else y)
+
+
+def transform_angle(angle: float, symmetry: Symmetry) -> float:
+    mirror, flip = symmetry.value
+    if flip:
+        angle = math.pi - angle
+    if mirror:
+        angle = -angle
+    return math.remainder(angle, 2 * math.pi)
+
+
+def transform_state(state: PieceState, symmetry: Symmetry) -> PieceState:
+    x, y = transform_point(state.x, state.y, symmetry)
+    return PieceState(
+        x,
+        y,
+        transform_angle(state.angle, symmetry),
+        OTHER_SIDE[state.side] if symmetry.value[1] else state.side,
+        state.piece_name,
+    )
+
+
+def transform(board: Board, symmetry: Symmetry) -> Board:
+    """board, transformed. pieces keep their indices"""
+    if symmetry is Symmetry.IDENTITY:
+        return board
+    return tuple(transform_state(state, symmetry) for state in board)
+
+
+def transform_action(action: Action, symmetry: Symmetry) -> Action:
+    """the action that does to transform(board) what action does to board"""
+    if isinstance(action, Move):
+        return Move(action.piece, *transform_point(action.x, action.y, symmetry))
+    return Rotate(
+        tuple(
+            (idx, transform_angle(angle, symmetry)) for idx, angle in action.rotations
+        )
+    )
+
+
+def transform_units(
+    state: PieceState, symmetry: Symmetry, geometry: BoardGeometry | None = None
+) -> tuple[str, int, int, int, int]:
+    """state, transformed, in units: (piece name, side value, x, y, angle)"""
+    x, y, angle = transform_unit_values(
+        fixed.to_units(state.x),
+        fixed.to_units(state.y),
+        fixed.angle_to_units(state.angle),
+        symmetry,
+        geometry,
+    )
+    side = OTHER_SIDE[state.side] if symmetry.value[1] else state.side
+    return state.piece_name, side.value, x, y, angle
+
+
+def transform_unit_values(
+    x: int,
+    y: int,
+    angle: int,
+    symmetry: Symmetry,
+    geometry: BoardGeometry | None = None,
+) -> tuple[int, int, int]:
+    """a point and angle in units, transformed. geometry: settings.BOARD's by default"""
+    mirror, flip = symmetry.value
+    geometry = geometry or settings.BOARD
+    if flip:
+        y, angle = geometry.height * fixed.SUBPIXELS - y, HALF_TURN - angle
+    if mirror:
+        x, angle = geometry.width * fixed.SUBPIXELS - x, -angle
+    return x, y, angle % fixed.ANGLE_UNITS
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def symmetric_hashes(
+    state: PieceState, geometry: BoardGeometry
+) -> tuple[int, int, int, int]:
+    """a piece's hash under each symmetry on a geometry's board, in Symmetry's order"""
+    return tuple(  # type: ignore
+        zobrist.units_hash(*transform_units(state, symmetry, geometry))
+        for symmetry in Symmetry
+    )
+
+
+def canonical(board: Board, flip: bool = True) -> tuple[int, Symmetry]:
+    """
+    board's canonical key, and the symmetry that takes it to its canonical form.
+    flip=False only considers mirroring.
+    """
+    identity = mirror = flipped = mirror_flipped = 0
+    geometry = settings.BOARD
+    for state in board:
+        a, b, c, d = symmetric_hashes(state, geometry)
+        identity ^= a
+        mirror ^= b
+        flipped ^= c
+        mirror_flipped ^= d
+    keys = [(identity, Symmetry.IDENTITY), (mirror, Symmetry.MIRROR)]
+    if flip:
+        keys += [(flipped, Symmetry.FLIP), (mirror_flipped, Symmetry.MIRROR_FLIP)]
+    return min(keys, key=lambda key: key[0])
+
+
+def canonical_to_move(board: Board, side: Side) -> tuple[int, Symmetry]:
+    """
+    canonical, for board with side to move: a flip swaps sides, so flipping black's
+    turns to white's makes the key the same for all four symmetries of the position
+    and whose turn it is, and different for the other side's turn
+    """
+    hashes = [0, 0, 0, 0]
+    geometry = settings.BOARD
+    for state in board:
+        for n, h in enumerate(symmetric_hashes(state, geometry)):
+            hashes[n] ^= h
+    if side == Side.WHITE:
+        keys = [(hashes[0], Symmetry.IDENTITY), (hashes[1], Symmetry.MIRROR)]
+    else:
+        keys = [(hashes[2], Symmetry.FLIP), (hashes[3], Symmetry.MIRROR_FLIP)]
+    return min(keys, key=lambda key: key[0])
+
+
+def canonical_key(board: Board, flip: bool = True) -> int:
+    return canonical(board, flip)[0]
+
+
+def canonical_board(board: Board, flip: bool = True) -> Board:
+    """
+    the canonical form of board: transformed, on the fixed-point grid, and with its
+    pieces in a canonical order, so the same board for all four symmetries
+    """
+    _, symmetry = canonical(board, flip)
+    pieces = sorted(transform_units(state, symmetry) for state in board)
+    return tuple(
+        PieceState(
+            fixed.from_units(x),
+            fixed.from_units(y),
+            fixed.angle_from_units(angle),
+            Side(side),
+            piece_name,
+        )
+        for piece_name, side, x, y, angle in pieces
+    )
@@ -0,0 +1,353 @@
+"""
+plays engine variants against each other, headlessly, to tell which plays better.
+
+a variant is a name, then optionally the Weights (see engine.py) and search depth it
+changes from the defaults:
+    base                            the defaults
+    mob:mobility=0.05               also counts plies
+    deep:depth=3,centre=0.2         searches deeper, and likes the centre more
+every pair of variants plays every opening twice, once as each side. openings are
+chess 960 boards (see plies.start_board), one per seed. a game ends when a king is
+taken, or in a draw when the side to move has no plies or after --max-plies. each game
+is played on a headless Game, which checks every ply, and written as a save (named
+rotchess_save_<seed>_<white>_<black>.txt, so analysis.py picks them up).
+
+games are handed to a process pool one at a time, so every core plays a game until
+they run out. with exactly two variants, --sprt stops as soon as a sequential
+probability ratio test is sure enough whether the first is elo1 better than the second
+(H1) or only elo0 (H0): the log likelihood ratio of the two, from the first's wins,
+draws and losses (see llr), ends the tournament once it leaves sprt_bounds.
+
+    uv run python -m rotating_chess.tournament base mob:mobility=0.05 --games 200
+    uv run python -m rotating_chess.tournament base deep:depth=3 --sprt 0 50 -o tourney/
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import math
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from rotating_chess.book import Book
+from rotating_chess.engine import Engine, Weights, has_king
+from rotating_chess.game import Game
+from rotating_chess.pieces import Piece, Side
+from rotating_chess.plies import other, start_board
+
+DEFAULT_DEPTH = 2
+
+
+class Variant(NamedTuple):
+    name: str
+    weights: Weights = Weights()
+    depth: int = DEFAULT_DEPTH
+
+    @staticmethod
+    def parse(spec: str) -> Variant:
+        """
+        e.g. "mob:mobility=0.05,depth=1". raises ValueError on an unknown setting
+
+        >>> Variant.parse("mob:mobility=0.05,depth=1")[1:]
+        (Weights(pawn=1.0, knight=3.0, bishop=3.0, rook=5.0, queen=9.0, centre=0.1, mobility=0.05), 1)
+        """
+        name, _, changes = spec.partition(":")
+        weights: dict[str, float] = {}
+        depth = DEFAULT_DEPTH
+        for change in filter(None, changes.split(",")):
+            key, _, value = change.partition("=")
+            if key == "depth":
+                depth = int(value)
+            elif key in Weights._fields:
+                weights[key] = float(value)
+            else:
+                raise ValueError(f"unknown setting {key!r} in {spec!r}")
+        if not name:
+            raise ValueError(f"no name in {spec!r}")
+        return Variant(name, Weights(**weights), depth)
+
+
+class Job(NamedTuple):
+    seed: int
+    white: Variant
+    black: Variant
+    angles: int
+    max_plies: int
+    # where to write the save, if anywhere
+    output: Path | None
+    # an opening book (see book.py) both engines play from, if any
+    book: Path | None = None
+
+
+class Result(NamedTuple):
+    seed: int
+    white: str
+    black: str
+    # for white: 1 a win, 0.5 a draw, 0 a loss
+    score: float
+    plies: int
+    # "king taken", "no plies" or "max plies"
+    reason: str
+    seconds: float
+
+
+@functools.lru_cache(maxsize=None)
+def engine_for(variant: Variant, angles: int, book: Path | None = None) -> Engine:
+    """one engine per worker (and variant), reused for every game it plays"""
+    return Engine(
+        variant.weights,
+        angles,
+        variant.depth,
+        book=None if book is None else Book(book),
+    )
+
+
+def play_game(job: Job) -> Result:
+    """plays job's game to the end, writing its save if job has an output"""
+    start = time.perf_counter()
+    board = start_board(job.seed)
+    game = Game([Piece.from_state(state, None, None) for state in board])
+    engines = {
+        Side.WHITE: engine_for(job.white, job.angles, job.book),
+        Side.BLACK: engine_for(job.black, job.angles, job.book),
+    }
+    side = Side.WHITE
+    score, reason, plies = 0.5, "max plies", 0
+    while plies < job.max_plies:
+        suggestion = engines[side].best(board, side)
+        if suggestion is None:
+            reason = "no plies"
+            break
+        for action in suggestion.ply.actions():
+            if not game.apply(action):
+                raise RuntimeError(f"illegal ply {suggestion.ply} from {board}")
+        board = tuple(piece.to_state() for piece in game.pieces.pieces)
+        plies += 1
+        if not has_king(board, other(side)):
+            score, reason = (1.0 if side == Side.WHITE else 0.0), "king taken"
+            break
+        side = other(side)
+
+    if job.output is not None:
+        name = f"rotchess_save_{job.seed}_{job.white.name}_{job.black.name}.txt"
+        (job.output / name).write_text(game.nav.get_game_save())
+    return Result(
+        job.seed,
+        job.white.name,
+        job.black.name,
+        score,
+        plies,
+        reason,
+        time.perf_counter() - start,
+    )
+
+
+def expected_score(elo: float) -> float:
+    """the score a side elo stronger expects, per game"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """
+    the log likelihood ratio of being elo1 better (H1) over elo0 (H0), from a game
+    record. approximated, treating the mean score as normal (as fishtest does)
+
+    >>> llr(60, 20, 20, 0, 50) > 0 > llr(20, 20, 60, 0, 50)
+    True
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0
+    score = (wins + draws / 2) / games
+    variance = (wins + draws / 4) / games - score**2
+    if variance <= 0:
+        # every game the same: no telling yet
+        return 0.0
+    s0, s1 = expected_score(elo0), expected_score(elo1)
+    return games * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+
+def sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    """
+    the llr below which H0's accepted, and above which H1's, with false positive
+    and false negative rates alpha and beta
+
+    >>> [round(bound, 3) for bound in sprt_bounds(0.05, 0.05)]
+    [-2.944, 2.944]
+    """
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+class Sprt(NamedTuple):
+    elo0: float
+    elo1: float
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    def decide(self, wins: int, draws: int, losses: int) -> str | None:
+        """H0 or H1, once the games so far are sure enough of one, or else None"""
+        lower, upper = sprt_bounds(self.alpha, self.beta)
+        ratio = llr(wins, draws, losses, self.elo0, self.elo1)
+        if ratio <= lower:
+            return "H0"
+        if ratio >= upper:
+            return "H1"
+        return None
+
+
+class Standings:
+    """wins, draws and losses of every variant against every other"""
+
+    def __init__(self) -> None:
+        self.__wdl: dict[tuple[str, str], list[int]] = {}
+
+    def add(self, result: Result) -> None:
+        for us, them, score in (
+            (result.white, result.black, result.score),
+            (result.black, result.white, 1 - result.score),
+        ):
+            wdl = self.__wdl.setdefault((us, them), [0, 0, 0])
+            wdl[0 if score == 1 else 1 if score == 0.5 else 2] += 1
+
+    def wdl(self, us: str, them: str) -> tuple[int, int, int]:
+        """us's wins, draws and losses against them"""
+        wins, draws, losses = self.__wdl.get((us, them), (0, 0, 0))
+        return wins, draws, losses
+
+    def lines(self) -> list[str]:
+        return [
+            f"{us} vs {them}: +{wins} ={draws} -{losses}"
+            for (us, them), (wins, draws, losses) in sorted(self.__wdl.items())
+        ]
+
+
+def jobs(
+    variants: list[Variant],
+    seeds: range,
+    angles: int,
+    max_plies: int,
+    output: Path | None,
+    book: Path | None = None,
+) -> Iterator[Job]:
+    """every pairing of every opening, both ways round, an opening at a time"""
+    for seed in seeds:
+        for n, first in enumerate(variants):
+            for second in variants[n + 1 :]:
+                yield Job(seed, first, second, angles, max_plies, output, book)
+                yield Job(seed, second, first, angles, max_plies, output, book)
+
+
+def run_tournament(
+    variants: list[Variant],
+    seeds: range,
+    angles: int = 0,
+    max_plies: int = 200,
+    output: Path | None = None,
+    workers: int | None = None,
+    sprt: Sprt | None = None,
+    book: Path | None = None,
+) -> tuple[Standings, str | None]:
+    """
+    plays every job, or until sprt (only with two variants) decides. workers=1 plays in
+    this process. returns the standings, and sprt's decision if it made one
+    """
+    if sprt is not None and len(variants) != 2:
+        raise ValueError("an sprt needs exactly two variants")
+    if len({variant.name for variant in variants}) != len(variants):
+        raise ValueError("variants need different names")
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+    todo = list(jobs(variants, seeds, angles, max_plies, output, book))
+    standings = Standings()
+    decision = None
+    start = time.perf_counter()
+    pool = None if workers == 1 else multiprocessing.Pool(workers)
+    try:
+        results = (
+            map(play_game, todo)
+            if pool is None
+            # games take seconds to minutes each: hand them out one at a time
+            else pool.imap_unordered(play_game, todo, chunksize=1)
+        )
+        for count, result in enumerate(results, 1):
+            standings.add(result)
+            minutes = (time.perf_counter() - start) / 60
+            line = (
+                f"{count}/{len(todo)} seed {result.seed}: {result.white} vs "
+                f"{result.black} {result.score:g} ({result.reason}, {result.plies} "
+                f"plies, {result.seconds:.1f}s), {count / minutes:,.1f} games/min"
+            )
+            if sprt is not None:
+                wdl = standings.wdl(variants[0].name, variants[1].name)
+                line += f", llr {llr(*wdl, sprt.elo0, sprt.elo1):.2f}"
+                decision = sprt.decide(*wdl)
+            print(line)
+            if decision is not None:
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return standings, decision
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="plays engine variants against each other"
+    )
+    parser.add_argument(
+        "variants",
+        nargs="+",
+        type=Variant.parse,
+        help="name[:key=value,...], keys being depth and Weights' fields",
+    )
+    parser.add_argument(
+        "--games", type=int, default=100, help="openings, each played both ways round"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="the first opening")
+    parser.add_argument(
+        "--angles", type=int, default=0, help="rotation angles the engines try"
+    )
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument(
+        "-o", "--output", type=Path, help="directory to write every game's save to"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="1: no process pool"
+    )
+    parser.add_argument(
+        "--sprt",
+        nargs=2,
+        type=float,
+        metavar=("ELO0", "ELO1"),
+        help="stop once the first variant's sure to be elo0 or elo1 better",
+    )
+    parser.add_argument(
+        "--book", type=Path, help="an opening book (see book.py) for both engines"
+    )
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    sprt = None
+    if args.sprt is not None:
+        elo0, elo1 = args.sprt
+        sprt = Sprt(elo0, elo1, args.alpha, args.beta)
+    standings, decision = run_tournament(
+        args.variants,
+        range(args.seed, args.seed + args.games),
+        args.angles,
+        args.max_plies,
+        args.output,
+        args.workers,
+        sprt,
+        args.book,
+    )
+    for line in standings.lines():
+        print(line)
+    if sprt is not None:
+        print(f"sprt: {decision or 'undecided'}")
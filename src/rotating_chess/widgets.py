@@ -9,8 +9,13 @@ from datetime import datetime
 import os
 
 from rotating_chess.debug import dprint
-from rotating_chess import settings
-from rotating_chess.pieces import Piece, Side
+from rotating_chess import settings, fixed, zobrist
+from rotating_chess.pieces import Piece, Side, Move, Rotate, Board, piece_image
+from rotating_chess.saveio import SaveTask, export_save, import_save, import_save_file
+from rotating_chess.canmove import HAVE_NUMPY, canmove_points
+
+if HAVE_NUMPY:
+    import numpy as np
 
 # gamestate is a circular import
 # this block and __future__'s annotations fixes type checking
@@ -25,8 +30,29 @@ except ImportError:
 
 if TYPE_CHECKING:
     from rotating_chess.gamestate import GameState
+    from rotating_chess.hints import HintService
+    from rotating_chess.history import TurnNavigation
 
 MOUSE_HELD = pygame.USEREVENT + 1
+# posted (from a worker thread) when a save export or import finishes. has a `task` attribute
+SAVE_IO_DONE = pygame.USEREVENT + 2
+
+
+def post_save_io_done(task: SaveTask) -> None:
+    pygame.event.post(pygame.Event(SAVE_IO_DONE, task=task))
+
+
+def draw_task_progress(
+    screen: pygame.Surface, task: SaveTask | None, rect: pygame.Rect
+) -> None:
+    """a thin bar under rect showing how far along a running task is"""
+    if task is None or task.done:
+        return
+    pygame.draw.rect(
+        screen,
+        (255, 255, 255),
+        (rect.left, rect.bottom + 2, rect.width * task.progress, 3),
+    )
 
 
 class Widget:
@@ -95,14 +121,58 @@ def scalar_comp(
     return (u[0] * v[0] + u[1] * v[1]) / math.sqrt(u[0] ** 2 + u[1] ** 2)
 
 
+# the overlay's transparent color. nothing's drawn in magenta
+OVERLAY_COLORKEY = (255, 0, 255)
+
+
 class Pieces(Widget):
-    def __init__(self, pieces: list[Piece] = []) -> None:
+    def __init__(self, pieces: list[Piece] | None = None) -> None:
+        super().__init__()
         self.skin = settings.SKIN
-        self.pieces: list[Piece] = pieces
+        # see centres(). set before self.pieces, whose setter resets it
+        self.__centres: tuple[np.ndarray, np.ndarray] | None = None
+        # a fresh list per board: a shared default would leak pieces between games
+        self.pieces: list[Piece] = [] if pieces is None else pieces
         # invariant: forall Piece in selected_pieces, Piece.selected
         # invariant: forall Piece not in selected_pieces, not Piece.selected
         # checked every time we MOUSEBUTTONDOWN
         self.selected_pieces: list[Piece] = []
+        # see overlay()
+        self.__overlay: pygame.Surface | None = None
+        self.__overlay_key: tuple | None = None
+
+    @property
+    def pieces(self) -> list[Piece]:
+        return self.__pieces
+
+    @pieces.setter
+    def pieces(self, pieces: list[Piece]) -> None:
+        self.__pieces = pieces
+        self.rehash()
+
+    def centres(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        every piece's centre, as an (n, 2) array, and its side's value, in self.pieces'
+        order. built when first needed after the pieces change. needs numpy.
+        """
+        if self.__centres is None:
+            self.__centres = (
+                np.array([(p.get_x(), p.get_y()) for p in self.__pieces], dtype=float),
+                np.array([p.get_side().value for p in self.__pieces]),
+            )
+        return self.__centres
+
+    def zobrist(self) -> int:
+        """
+        the hash of the board (see zobrist.py). kept up to date by move, promote,
+        rotate and confirm_preview, in O(1).
+        """
+        return self.__zobrist
+
+    def rehash(self) -> None:
+        """recomputes the board's hash. call after changing self.pieces in place"""
+        self.__zobrist = zobrist.combine(p.get_zobrist() for p in self.__pieces)
+        self.__centres = None
 
     def handle_event(self, e: pygame.Event, gs: GameState, x: int, y: int) -> None:
         if e.type == pygame.MOUSEBUTTONDOWN:
@@ -120,13 +190,18 @@ class Pieces(Widget):
                             ((x - point_x) ** 2 + (y - point_y) ** 2)
                             < settings.HITCIRCLE_RADIUS**2
                         ) and self.canmove(only_selected, point_x, point_y):
+                            action = Move(
+                                self.pieces.index(only_selected), point_x, point_y
+                            )
                             self.move(only_selected, point_x, point_y, gs)
                             # note: self.move() already removes the piece from selected, but we still have the pointer.
                             moved_piece = True
                             break
 
             if moved_piece:
-                gs.nav.record_turn(gs.widgets.pieces.pieces)
+                gs.nav.record_turn(
+                    gs.widgets.pieces.pieces, action, gs.widgets.pieces.zobrist()
+                )
                 return
 
             # check if we've clicked a piece
@@ -168,17 +243,43 @@ class Pieces(Widget):
         # draw pieces
         for piece in self.pieces:
             piece.draw(screen)
-            if len(self.selected_pieces) == 1:
-                piece.draw_hitcircle(screen)
 
         if len(self.selected_pieces) == 1:
-            self.selected_pieces[0].draw_move_points(screen)
-            self.selected_pieces[0].draw_capture_points(screen)
-            self.selected_pieces[0].draw_guide_lines(screen)
+            screen.blit(self.overlay(screen.get_size()), (0, 0))
+
+    def overlay(self, size: tuple[int, int]) -> pygame.Surface:
+        """
+        what's drawn over the board while only one piece is selected: every piece's
+        hit circle, and the selected piece's move and capture points and guide lines.
+        drawn once, and only redrawn when the selection, its points or angle (see
+        Piece.overlay_version) or the board change, so a frame with a piece selected
+        costs one blit more than one without
+        """
+        selected = self.selected_pieces[0]
+        key = (selected, selected.overlay_version(), self.__zobrist, size)
+        if key == self.__overlay_key:
+            assert self.__overlay is not None
+            return self.__overlay
+
+        if self.__overlay is None or self.__overlay.get_size() != size:
+            self.__overlay = pygame.Surface(size)
+            # not RLEACCEL: while rotating, it's redrawn every frame, and re-encoding it
+            # costs far more than the blits it speeds up
+            self.__overlay.set_colorkey(OVERLAY_COLORKEY)
+        self.__overlay.fill(OVERLAY_COLORKEY)
+        for piece in self.pieces:
+            piece.draw_hitcircle(self.__overlay)
+        selected.draw_move_points(self.__overlay)
+        selected.draw_capture_points(self.__overlay)
+        selected.draw_guide_lines(self.__overlay)
+        self.__overlay_key = key
+        return self.__overlay
 
     def canmove(self, only_selected: Piece, point_x: float, point_y: float) -> bool:
         """checks if we can move the only selected piece to point_x, point_y"""
         assert len(self.selected_pieces) == 1
+        if settings.FIXED_POINT:
+            return self.__canmove_fixed(only_selected, point_x, point_y)
 
         pieces_overlapping_endpoint = set()
 
@@ -243,6 +344,77 @@ class Pieces(Widget):
 
         return True
 
+    def canmove_many(
+        self, only_selected: Piece, points: list[tuple[float, float]]
+    ) -> list[bool]:
+        """
+        canmove, for each of points. vectorized (see canmove.py) when numpy's around,
+        except with settings.FIXED_POINT, whose exact checks stay scalar.
+        """
+        if not HAVE_NUMPY or settings.FIXED_POINT or len(points) == 0:
+            return [self.canmove(only_selected, *point) for point in points]
+        assert len(self.selected_pieces) == 1
+        assert not only_selected.needs_init
+        centres, sides = self.centres()
+        others = np.arange(len(self.__pieces)) != self.__pieces.index(only_selected)
+        return canmove_points(
+            (only_selected.get_x(), only_selected.get_y()),
+            only_selected.can_jump,
+            sides[others] == only_selected.get_side().value,
+            centres[others],
+            np.array(points, dtype=float),
+            settings.HITCIRCLE_RADIUS,
+        ).tolist()
+
+    def __canmove_fixed(
+        self, only_selected: Piece, point_x: float, point_y: float
+    ) -> bool:
+        """
+        canmove, for settings.FIXED_POINT: the same checks, squared so they're all
+        integer math in sub-pixels (see fixed.py), and so exact.
+        """
+        start_x, start_y = only_selected.get_units()
+        end_x, end_y = fixed.to_units(point_x), fixed.to_units(point_y)
+        radius = settings.HITCIRCLE_RADIUS * fixed.SUBPIXELS
+        # (2 * radius) ** 2
+        collide_sq = 4 * radius * radius
+
+        others = []
+        pieces_overlapping_endpoint = set()
+        for piece in self.pieces:
+            if piece == only_selected:
+                assert not only_selected.needs_init
+                continue
+            x, y = piece.get_units()
+            if (x - end_x) ** 2 + (y - end_y) ** 2 < collide_sq:
+                if piece.get_side() == only_selected.get_side():
+                    return False
+                pieces_overlapping_endpoint.add(piece)
+            else:
+                others.append((x, y))
+
+        if only_selected.can_jump:
+            return True
+
+        # u is the move, v a piece, both from the start
+        u_x, u_y = end_x - start_x, end_y - start_y
+        uu = u_x * u_x + u_y * u_y
+        for x, y in others:
+            v_x, v_y = x - start_x, y - start_y
+            dot = u_x * v_x + u_y * v_y
+            # 0 < scalar_comp < max_hit_distance, i.e. 0 < dot < uu + radius * |u|
+            if dot <= 0:
+                continue
+            past = dot - uu
+            if past >= 0 and past * past >= radius * radius * uu:
+                continue
+            # distance to the line < 2 * radius
+            cross = u_x * v_y - v_x * u_y
+            if cross * cross < collide_sq * uu:
+                dprint(f"inway: ({x}, {y})")
+                return False
+        return True
+
     def move(
         self, only_selected: Piece, point_x: float, point_y: float, gs: GameState | None
     ):  # TODO: add two fields for passing in if we have capture/move perms. use this to disallow, eg, moving pawn to capture circle.
@@ -255,7 +427,10 @@ class Pieces(Widget):
         assert self.selected_pieces[0] is only_selected
 
         # move
+        self.__centres = None
+        before = only_selected.get_zobrist()
         only_selected.move(point_x, point_y)
+        self.__zobrist ^= before ^ only_selected.get_zobrist()
 
         # capture overlapping pieces
         to_remove = []  # avoid mutating list while iterating through it.
@@ -268,6 +443,7 @@ class Pieces(Widget):
 
         for piece in to_remove:
             self.pieces.remove(piece)
+            self.__zobrist ^= piece.get_zobrist()
 
         # after moving, automatically deselect the piece and spinner
         only_selected.selected = False
@@ -296,11 +472,21 @@ class Pieces(Widget):
             piece.get_side(),
         )
         self.pieces.remove(piece)
-        if side == Side.BLACK:
-            side_str = "B"
-        elif side == Side.WHITE:
-            side_str = "W"
-        self.pieces.append(Piece(x, y, rad, side, None if assets is None or piece_skin is None else assets[f"piece_queen{side_str}{piece_skin.value}"], "queen"))  # fmt: skip
+        self.pieces.append(Piece(x, y, rad, side, piece_image(assets, piece_skin, side, "queen"), "queen"))  # fmt: skip
+        self.__zobrist ^= piece.get_zobrist() ^ self.pieces[-1].get_zobrist()
+        self.__centres = None
+
+    def rotate(self, piece: Piece, angle: float) -> None:
+        """Piece.rotate, keeping the board's hash up to date"""
+        before = piece.get_zobrist()
+        piece.rotate(angle)
+        self.__zobrist ^= before ^ piece.get_zobrist()
+
+    def confirm_preview(self, piece: Piece) -> None:
+        """Piece.confirm_preview, keeping the board's hash up to date"""
+        before = piece.get_zobrist()
+        piece.confirm_preview()
+        self.__zobrist ^= before ^ piece.get_zobrist()
 
     # fmt: off
     def load_normal_board(self, assets: dict[str, pygame.Surface] | None, piece_skin: settings.PieceSkin | None) -> None:
@@ -308,14 +494,16 @@ class Pieces(Widget):
         in place. use with None params in testing when we don't care about visual
         """
         self.pieces.clear()
-        for x_pos in range(25, 50*8, 50):
-            self.pieces.append(Piece(x_pos, 75, math.radians(180), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_pawnB{piece_skin.value}"], "pawn"))
-            self.pieces.append(Piece(x_pos, 75 + 250, 0, Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_pawnW{piece_skin.value}"], "pawn"))
-
-        order = ["rook", "knight", "bishop", "queen", "king", "bishop", "knight", "rook"]
-        for orderidx, x_pos in enumerate(range(25, 50*8, 50)):
-            self.pieces.append(Piece(x_pos, 25, math.radians(180), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}B{piece_skin.value}"], order[orderidx]))
-            self.pieces.append(Piece(x_pos, 25 + 350, 0, Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}W{piece_skin.value}"], order[orderidx]))
+        board = settings.BOARD
+        for x_pos in map(board.file_x, range(board.files)):
+            self.pieces.append(Piece(x_pos, board.rank_y(board.ranks - 1), math.radians(180), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_pawnB{piece_skin.value}"], "pawn"))
+            self.pieces.append(Piece(x_pos, board.rank_y(2), 0, Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_pawnW{piece_skin.value}"], "pawn"))
+
+        order = board.back_rank()
+        for orderidx, x_pos in enumerate(map(board.file_x, range(board.files))):
+            self.pieces.append(Piece(x_pos, board.rank_y(board.ranks), math.radians(180), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}B{piece_skin.value}"], order[orderidx]))
+            self.pieces.append(Piece(x_pos, board.rank_y(1), 0, Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}W{piece_skin.value}"], order[orderidx]))
+        self.rehash()
     # fmt: on
 
     # fmt: off
@@ -324,15 +512,17 @@ class Pieces(Widget):
         in place. use with None params in testing when we don't care about visual
         """
         self.pieces.clear()
-        for x_pos in range(25, 50*8, 50):
-            self.pieces.append(Piece(x_pos, 75, math.radians(random.randint(-180, 180)), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_pawnB{piece_skin.value}"], "pawn"))
-            self.pieces.append(Piece(x_pos, 75 + 250, math.radians(random.randint(-180, 180)), Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_pawnW{piece_skin.value}"], "pawn"))
+        board = settings.BOARD
+        for x_pos in map(board.file_x, range(board.files)):
+            self.pieces.append(Piece(x_pos, board.rank_y(board.ranks - 1), math.radians(random.randint(-180, 180)), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_pawnB{piece_skin.value}"], "pawn"))
+            self.pieces.append(Piece(x_pos, board.rank_y(2), math.radians(random.randint(-180, 180)), Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_pawnW{piece_skin.value}"], "pawn"))
 
-        order = ["rook", "knight", "bishop", "queen", "king", "bishop", "knight", "rook"]
+        order = board.back_rank()
         random.shuffle(order)
-        for orderidx, x_pos in enumerate(range(25, 50*8, 50)):
-            self.pieces.append(Piece(x_pos, 25, math.radians(random.randint(-180, 180)), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}B{piece_skin.value}"], order[orderidx]))
-            self.pieces.append(Piece(x_pos, 25 + 350, math.radians(random.randint(-180, 180)), Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}W{piece_skin.value}"], order[orderidx]))
+        for orderidx, x_pos in enumerate(map(board.file_x, range(board.files))):
+            self.pieces.append(Piece(x_pos, board.rank_y(board.ranks), math.radians(random.randint(-180, 180)), Side.BLACK, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}B{piece_skin.value}"], order[orderidx]))
+            self.pieces.append(Piece(x_pos, board.rank_y(1), math.radians(random.randint(-180, 180)), Side.WHITE, None if assets is None or piece_skin is None else assets[f"piece_{order[orderidx]}W{piece_skin.value}"], order[orderidx]))
+        self.rehash()
     # fmt: on
 
 
@@ -424,7 +614,7 @@ class MoveSelector(Widget):
 
 class Button(Widget):
     # if one button is clicked, we should prevent buttons "under" it from being clicked.
-    one_clicked: bool = False
+    # that's tracked per game in gs.one_clicked, reset every frame.
 
     def __init__(self, surface: pygame.Surface, x: int, y: int) -> None:
         super().__init__()
@@ -434,17 +624,17 @@ class Button(Widget):
         self._rect = surface.get_rect(left=x, top=y)
         self.hovered: bool = False
 
-    def check_clicked(self, x: int, y: int) -> bool:
+    def check_clicked(self, x: int, y: int, gs: GameState) -> bool:
         """
         should be run whenever we check if a button is clicked.
-        this lets us manipulate Button.one_clicked.
+        this lets us manipulate gs.one_clicked.
         returns whether a click at x, y has clicked this button
         """
-        if Button.one_clicked:
+        if gs.one_clicked:
             return False
 
         if self.check_hovered(x, y):
-            Button.one_clicked = True
+            gs.one_clicked = True
             return True
 
         return False
@@ -455,6 +645,9 @@ class Button(Widget):
         """
         return self._rect.collidepoint(x, y)
 
+    def get_rect(self) -> pygame.Rect:
+        return self._rect
+
     def draw(self, screen: pygame.Surface, gs: GameState):
         if self.is_visible():
             screen.blit(self._surface, self._rect)
@@ -473,7 +666,7 @@ class CancelRot(Button):
             if not gs.widgets.cancel_rot.is_visible():
                 return
 
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
                 return
 
             gs.widgets.movesel.hide(gs)
@@ -495,7 +688,7 @@ class ConfirmRot(Button):
             if not gs.widgets.confirm_rot.is_visible():
                 return
 
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
                 return
 
             gs.widgets.movesel.hide(gs)
@@ -503,10 +696,18 @@ class ConfirmRot(Button):
                 # according to invariant, this should set all to false.
                 # setting not piece.selected is sorta like verifying invariant
                 piece.selected = not piece.selected
-                piece.confirm_preview()
+                gs.widgets.pieces.confirm_preview(piece)
+            action = Rotate(
+                tuple(
+                    (gs.widgets.pieces.pieces.index(p), p.get_angle())
+                    for p in gs.widgets.pieces.selected_pieces
+                )
+            )
             gs.widgets.pieces.selected_pieces.clear()
 
-            gs.nav.record_turn(gs.widgets.pieces.pieces)
+            gs.nav.record_turn(
+                gs.widgets.pieces.pieces, action, gs.widgets.pieces.zobrist()
+            )
 
 
 # TODO: these Nav* stuff can be in their own super object? idk.
@@ -519,7 +720,7 @@ class NavFirst(Button):
             if gs.widgets.cancel_rot.is_visible():
                 return
 
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
                 return
 
             gs.nav.first()
@@ -539,7 +740,7 @@ class NavPrev(Button):
             if gs.widgets.cancel_rot.is_visible():
                 return
 
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
                 return
 
             gs.nav.prev()
@@ -559,7 +760,7 @@ class NavNext(Button):
             if gs.widgets.cancel_rot.is_visible():
                 return
 
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
                 return
 
             gs.nav.next()
@@ -579,7 +780,7 @@ class NavLast(Button):
             if gs.widgets.cancel_rot.is_visible():
                 return
 
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
                 return
 
             gs.nav.last()
@@ -598,6 +799,15 @@ class NavProgressBar(Widget):
         self.__width = width
         self.__height = height
 
+    def handle_event(self, e: pygame.Event, gs: GameState, x: int, y: int) -> None:
+        # up and down arrows cycle through variations of the current turn
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_UP, pygame.K_DOWN):
+            if gs.widgets.cancel_rot.is_visible():
+                return
+
+            gs.nav.switch_variation(1 if e.key == pygame.K_DOWN else -1)
+            gs.nav.update_state(gs)
+
     def draw(self, screen: pygame.Surface, gs: GameState):
         curr_len = gs.nav.get_curr_turn_idx() + 1
         max_len = len(gs.nav)
@@ -634,25 +844,31 @@ class ExportSave(Button):
         self.hover_text_visible = False
         self.hover_x = 0
         self.hover_y = 0
-
-    def download_save(self, s: str):
-        savedir = Path("game_saves")
-        savedir.mkdir(parents=True, exist_ok=True)
-
-        savepath = f"game_saves/rotchess_save_{datetime.now().isoformat().replace(':', '').split('.')[0]}.txt"
-
-        with open(savepath, "w") as f:
-            f.write(s)
-        if sys.platform == "emscripten":
-            platform.window.MM.download(savepath)
+        # the export in progress (or the last one)
+        self.task: SaveTask[str] | None = None
+        self.__savepath: Path | None = None
+
+    def download_save(self, boards: list[Board]):
+        """writes boards to a new save file in the background. see SAVE_IO_DONE"""
+        self.__savepath = Path(
+            f"game_saves/rotchess_save_{datetime.now().isoformat().replace(':', '').split('.')[0]}.txt"
+        )
+        self.task = export_save(boards, self.__savepath, post_save_io_done)
 
     def handle_event(self, e: pygame.Event, gs: GameState, x: int, y: int) -> None:
         if e.type == pygame.MOUSEBUTTONDOWN:
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
+                return
+            if self.task is not None and not self.task.done:
+                dprint("still exporting the last save")
                 return
 
-            save = gs.nav.get_game_save()
-            self.download_save(save)
+            self.download_save(gs.nav.get_line_boards())
+        elif e.type == SAVE_IO_DONE and e.task is self.task:
+            if not self.task.succeeded():
+                print(f"couldn't export save: {self.task.error}")
+            elif sys.platform == "emscripten":
+                platform.window.MM.download(str(self.__savepath))
         elif e.type == pygame.MOUSEMOTION:
             if self.check_hovered(x, y):
                 self.hover_text_visible = True
@@ -662,6 +878,7 @@ class ExportSave(Button):
 
     def draw(self, screen: pygame.Surface, gs: GameState):
         super().draw(screen, gs)
+        draw_task_progress(screen, self.task, self._rect)
         if self.hover_text_visible:
             screen.blit(
                 self.hover_text, (self.hover_x - self.hover_rect.width, self.hover_y)
@@ -683,21 +900,50 @@ class ImportSave(Button):
         self.hover_text_visible = False
         self.hover_x = 0
         self.hover_y = 0
+        # the import in progress (or the last one)
+        self.task: SaveTask[list[Board]] | None = None
 
     def handle_event(self, e: pygame.Event, gs: GameState, x: int, y: int) -> None:
         if e.type == pygame.MOUSEBUTTONDOWN:
-            if not self.check_clicked(x, y):
+            if not self.check_clicked(x, y, gs):
+                return
+            if self.task is not None and not self.task.done:
+                dprint("still importing the last save")
                 return
 
+            # decoded in the background, and only swapped in once it's done (SAVE_IO_DONE),
+            # so the game stays playable in the meantime
             if sys.platform == "emscripten":
-                save = platform.window.prompt("paste game save")
-                if save is not None and gs.nav.load_game_save(save, gs) is None:
-                    platform.window.alert("invalid save")
+                save = platform.window.prompt("paste game save or position")
+                if save is not None:
+                    self.task = import_save(lambda: save, post_save_io_done)
             else:
-                if gs.nav.load_game_save(copykitten.paste(), gs) is None:
-                    print(
-                        "clipboard contents is invalid save. drag save file to screen or copy save to clipboard before clicking button."
-                    )
+                self.task = import_save(copykitten.paste, post_save_io_done)
+
+        elif e.type == pygame.DROPFILE:
+            if self.task is not None and not self.task.done:
+                dprint("still importing the last save")
+                return
+            self.task = import_save_file(Path(e.file), post_save_io_done)
+
+        elif e.type == SAVE_IO_DONE and e.task is self.task:
+            if self.task.succeeded():
+                # the selection is of pieces about to be replaced, as in Game.sync
+                gs.widgets.movesel.hide(gs)
+                for piece in gs.widgets.pieces.selected_pieces:
+                    piece.selected = False
+                    piece.stop_previewing()
+                gs.widgets.pieces.selected_pieces.clear()
+                assert self.task.result is not None
+                gs.nav.load_boards(self.task.result)
+                gs.nav.update_state(gs)
+                dprint(f"loaded {len(gs.nav)} turns")
+            elif sys.platform == "emscripten":
+                platform.window.alert("invalid save")
+            else:
+                print(
+                    "clipboard contents (or dropped file) is invalid save. drag save file to screen or copy save (or a position) to clipboard before clicking button."
+                )
 
         elif e.type == pygame.MOUSEMOTION:
             if self.check_hovered(x, y):
@@ -708,12 +954,84 @@ class ImportSave(Button):
 
     def draw(self, screen: pygame.Surface, gs: GameState):
         super().draw(screen, gs)
+        draw_task_progress(screen, self.task, self._rect)
         if self.hover_text_visible:
             screen.blit(
                 self.hover_text, (self.hover_x - self.hover_rect.width, self.hover_y)
             )
 
 
+class HintOverlay(Widget):
+    """
+    the hint service's best ply for the current board (see hints.py), drawn over it:
+    a line from the piece to where it should move and, if it should then rotate, a
+    tick the way it should face. h toggles it.
+    """
+
+    def __init__(self, nav: TurnNavigation) -> None:
+        super().__init__()
+        self._visible = settings.HINTS
+        self.__service: HintService | None = None
+        # the board the service is thinking about
+        self.__board: Board | None = None
+        # a new turn makes whatever we were thinking about stale
+        nav.subscribe(lambda node: self.__drop(), self.__drop)
+
+    def __drop(self) -> None:
+        if self.__service is not None:
+            self.__service.cancel()
+        self.__board = None
+
+    def handle_event(self, e: pygame.Event, gs: GameState, x: int, y: int) -> None:
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_h:
+            if self._visible:
+                self.hide(gs)
+            else:
+                self.reveal()
+
+    def hide(self, gs: GameState):
+        super().hide(gs)
+        self.__drop()
+
+    def close(self) -> None:
+        if self.__service is not None:
+            self.__service.close()
+            self.__service = None
+
+    def draw(self, screen: pygame.Surface, gs: GameState):
+        # hints imports this module (through the engine), so not at the top
+        from rotating_chess.hints import AVAILABLE, HintService, to_move
+
+        if not self._visible or not AVAILABLE:
+            return
+        if self.__service is None:
+            self.__service = HintService()
+
+        board = gs.nav.get_curr_board()
+        if board is not self.__board:
+            self.__service.submit(board, to_move(gs.nav.get_curr_node()))
+            self.__board = board
+        best = self.__service.poll()
+        if best is None:
+            return
+
+        ply = best.ply
+        start = board[ply.piece].x, board[ply.piece].y
+        pygame.draw.line(screen, settings.HINT_COLOR, start, (ply.x, ply.y), width=2)
+        pygame.draw.circle(
+            screen, settings.HINT_COLOR, (ply.x, ply.y), settings.HITCIRCLE_RADIUS, 2
+        )
+        if ply.angle is not None:
+            # angle 0 faces up, and turns anticlockwise
+            facing = (
+                ply.x - 2 * settings.HITCIRCLE_RADIUS * math.sin(ply.angle),
+                ply.y - 2 * settings.HITCIRCLE_RADIUS * math.cos(ply.angle),
+            )
+            pygame.draw.line(
+                screen, settings.HINT_COLOR, (ply.x, ply.y), facing, width=2
+            )
+
+
 if __name__ == "__main__":
     print(f"d={distance(0,0, 10,0, 4,3)}")
     print(f"d={distance(2,0, 0,2, 0,0)}")
@@ -0,0 +1,559 @@
+"""
+preset dictionaries (zlib's zdict) for compressing game saves, by version.
+
+a save compressed with a dictionary starts out already knowing what saves look like:
+the key names, the usual angles, and the pieces of the starting boards. that's most of
+a short save, so short saves come out several times smaller.
+
+a compressed save names the dictionary it needs by its adler32 (zlib does that), so
+readers can pick it without knowing the save's version. which dictionary new saves are
+written with is up to history.SAVE_VERSION.
+
+never change a shipped dictionary: saves made with it can only be read with exactly
+the same bytes. to make a better one, train a new version with
+`python -m rotating_chess.zdicts` and add it below.
+"""
+
+import collections
+import json
+import zlib
+from collections.abc import Iterable
+
+# the zlib window. anything in a dictionary before its last 32KiB is never used
+MAX_ZDICT_SIZE = 1 << 15
+
+
+def train_zdict(
+    saves: Iterable[str], save_head: str, size: int = MAX_ZDICT_SIZE
+) -> bytes:
+    """
+    a dictionary for saves like the (decompressed) saves given.
+    it's the most widespread piece entries (whole, and from "y" or "angle" on, so they
+    match the same piece on other squares), most valuable last since zlib can reach
+    closer matches more cheaply. then the normal starting board, and then save_head,
+    which every save starts with.
+    """
+    # in how many saves each entry appears. (not how often: a piece that sits still
+    # for a whole game is common in that game, but tells us nothing about others)
+    counts: collections.Counter[str] = collections.Counter()
+    first: collections.Counter[str] = collections.Counter()
+    for save in saves:
+        turns = json.loads(save)["save"]
+        first[json.dumps(turns[0])[1:-1]] += 1
+        entries = set()
+        for turn in turns:
+            for piece in turn:
+                entry = json.dumps(piece)
+                entries.add(entry)
+                entries.add(entry[entry.index(', "y"') :])
+                entries.add(entry[entry.index(', "angle"') :])
+        counts.update(entries)
+
+    start = first.most_common(1)[0][0]
+    budget = size - len(start) - len(save_head) - 2
+    chosen: list[tuple[int, str]] = []
+    for entry, count in sorted(
+        counts.items(), key=lambda kv: (kv[1] * len(kv[0]), kv[0]), reverse=True
+    ):
+        if count < 2:
+            break
+        if entry in start or len(entry) + 2 > budget:
+            continue
+        chosen.append((count * len(entry), entry))
+        budget -= len(entry) + 2
+    chosen.sort()
+    return ", ".join([entry for _, entry in chosen] + [start, save_head]).encode()
+
+
+def by_id(zdicts: Iterable[bytes]) -> dict[int, bytes]:
+    """zdicts, keyed by the id zlib writes in the header of data compressed with them"""
+    return {zlib.adler32(zdict): zdict for zdict in zdicts}
+
+
+# fmt: off
+ZDICTS: dict[int, bytes] = {
+    1: (
+        b', "angle": -0.5585053606381855, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.6981317007977318, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.7504915783575618, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.8377580409572782, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.8901179185171081, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.9773843811168246, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.0122909661567112, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.0471975511965976, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.1344640137963142, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.1693705988362009, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.2740903539558606, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.3264502315156905, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.4835298641951802, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.5707963267948966, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.5882496193148399, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.6231562043547265, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.6406094968746698, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.8500490071139892, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.9373154697137058, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.1467549799530254, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.2863813201125716, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.4609142453120048, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.4958208303518914, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.4958208303518914, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.5656340004316642, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.7401669256310974, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.8099800957108707, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.8797932657906435, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.9670597283903604, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.9845130209103035, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -3.0543261909900767, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 0.17453292519943295, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.22689280275926285, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 25, "y": 75, "angle": 2.0420352248333655, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 75, "y": 75, "angle": 1.6755160819145565, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 75, "y": 75, "angle": 2.0420352248333655, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.10471975511965978, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.15707963267948966, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.24434609527920614, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 225, "y": 75, "angle": -2.8448866807507573, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 24.999999999999993, "y": 275.0, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b'{"x": 375, "y": 325, "angle": 1.7453292519943295, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 74.99999999999999, "y": 275.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b'{"x": 175, "y": 325, "angle": -1.1344640137963142, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b'{"x": 175.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b'{"x": 25.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.0, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 225.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 325.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b'{"x": 125.0, "y": 175.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 175.0, "y": 375.0, "angle": 0, "side": 2, "piece_name": "king"}, '
+        b'{"x": 275.0, "y": 175.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 175.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 225.00000000000003, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b', "y": 175.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b', "y": 325, "angle": 3.12413936106985, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.059488517353309, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.356194490192345, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.897246558310587, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 325.0, "angle": 0, "side": 2, "piece_name": "bishop"}, '
+        b', "y": 224.99999999999997, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "y": 24.999999999999986, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "y": 325, "angle": -1.53588974175501, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.356194490192345, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.530727415391778, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.670353755551324, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.722713633111154, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.897246558310587, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 3.036872898470133, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.361356816555577, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.251474735072685, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.321287905152458, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.426007660272118, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.548180707911721, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.7504915783575618, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.9948376736367679, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.1693705988362009, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.2566370614359172, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.2740903539558606, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.4486232791552935, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.5533430342749532, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.6057029118347832, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.6580627893946132, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.7453292519943295, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.9024088846738192, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.9198621771937625, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.9722220547535925, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.2863813201125716, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.3387411976724017, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.3911010752322315, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.413716694115407, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.059488517353309, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.111848394913139, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.129301687433082, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.303834612632515, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.478367537831948, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.949606435870417, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.4537856055185257, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.6283185307179586, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.1344640137963142, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.5009831567151235, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.8849555921538759, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.1642082724729685, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 375, "angle": 2.2689280275926285, "side": 2, "piece_name": "rook"}, '
+        b', "y": 75, "angle": -0.2792526803190927, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.3839724354387525, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.5585053606381855, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.9773843811168246, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.0122909661567112, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.1344640137963142, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.1693705988362009, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.2740903539558606, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.4835298641951802, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.5882496193148399, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.8500490071139892, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.1467549799530254, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.2863813201125716, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.4609142453120048, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.4958208303518914, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.5656340004316642, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.9670597283903604, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.17453292519943295, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.22689280275926285, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.6981317007977318, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.7504915783575618, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.8377580409572782, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.8901179185171081, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.0471975511965976, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.3264502315156905, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.5707963267948966, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.6231562043547265, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.6406094968746698, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.9373154697137058, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.4958208303518914, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.7401669256310974, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.8099800957108707, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.8797932657906435, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.9845130209103035, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -3.0543261909900767, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.91469985083053, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -3.01941960595019, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 2.792526803190927, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b', "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b', "y": 325, "angle": -0.10471975511965978, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.15707963267948966, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.24434609527920614, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "angle": -2.949606435870417, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.3665191429188092, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 0.5585053606381855, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.5759586531581288, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 0.6806784082777885, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 0.9424777960769379, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.9773843811168246, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.0471975511965976, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.1693705988362009, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.1868238913561442, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.2042771838760873, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.3439035240356338, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.4311699866353502, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.4486232791552935, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.4835298641951802, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.5707963267948966, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.6057029118347832, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.6755160819145565, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 2.1642082724729685, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 3.0543261909900767, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b', "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b', "angle": -0.2617993877991494, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.3665191429188092, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.4537856055185257, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.5759586531581288, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.9250245035569946, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.4660765716752369, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.6580627893946132, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.6755160819145565, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.4085543677521746, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.6354471705114375, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 0.12217304763960307, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 74.99999999999997, "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.03490658503988659, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.05235987755982989, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.06981317007977318, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.017453292519943295, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 224.99999999999997, "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 74.99999999999997, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b'{"x": 174.99999999999997, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b', "y": 75.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b', "y": 125.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b'{"x": 175.0, "y": 175.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 375, "y": 325, "angle": -2.9321531433504737, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "king"}, '
+        b', "y": 325, "angle": -2.91469985083053, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -3.01941960595019, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.792526803190927, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.949606435870417, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.5585053606381855, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.9424777960769379, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.2042771838760873, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.3439035240356338, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.4311699866353502, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.4835298641951802, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.6755160819145565, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.1642082724729685, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 3.0543261909900767, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 2.670353755551324, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 25.0, "angle": 3.141592653589793, "side": 1, "piece_name": "king"}, '
+        b', "y": 325, "angle": 0.3665191429188092, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.5759586531581288, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.6806784082777885, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.9773843811168246, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.0471975511965976, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.1693705988362009, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.1868238913561442, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.4486232791552935, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.5707963267948966, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.6057029118347832, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.2617993877991494, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.4537856055185257, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.6755160819145565, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.4085543677521746, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.600540585471551, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.792526803190927, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -3.001966313430247, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.4886921905584123, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 0.8203047484373349, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.8726646259971648, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.2740903539558606, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.5707963267948966, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.7453292519943295, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.7976891295541595, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 1.8325957145940461, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 275.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.3665191429188092, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.5759586531581288, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.9250245035569946, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.4660765716752369, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.6580627893946132, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.6354471705114375, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.12217304763960307, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325.0, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b', "y": 75, "angle": -0.05235987755982989, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.06981317007977318, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b', "angle": -0.5934119456780721, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.5934119456780721, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -0.6457718232379019, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.9599310885968813, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.0821041362364843, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.0821041362364843, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.4311699866353502, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -1.8151424220741028, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.0943951023931953, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.3387411976724017, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -2.8448866807507573, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -0.03490658503988659, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.017453292519943295, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 224.99999999999997, "y": 224.99999999999997, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "angle": -0.12217304763960307, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.12217304763960307, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b', "y": 325.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b'{"x": 24.999999999999996, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b'{"x": 174.99999999999997, "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 2.670353755551324, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.9075712110370514, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 1.3439035240356338, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 2.7401669256310974, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.792526803190927, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -3.001966313430247, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.8203047484373349, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.8726646259971648, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.5707963267948966, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.7976891295541595, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 1.8325957145940461, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 175.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "king"}, '
+        b'{"x": 225.0, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "king"}, '
+        b'{"x": 325.0, "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.600540585471551, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 0.4886921905584123, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.2740903539558606, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.7453292519943295, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.5934119456780721, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.6457718232379019, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.9599310885968813, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.0821041362364843, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.4311699866353502, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -1.8151424220741028, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.0943951023931953, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.3387411976724017, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.8448866807507573, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": -0.8726646259971648, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.1344640137963142, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -1.4835298641951802, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": -2.3736477827122884, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b', "y": 325, "angle": -0.5934119456780721, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.0821041362364843, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -0.12217304763960307, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 125.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 25.000000000000007, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b', "y": 375.0, "angle": 0, "side": 2, "piece_name": "king"}, '
+        b', "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b', "y": 325, "angle": -0.12217304763960307, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 175.00000000000003, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b', "y": 275.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b', "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 175.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 225.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 225.0, "y": 325.0, "angle": 0, "side": 2, "piece_name": "king"}, '
+        b'{"x": 325.0, "y": 375.0, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b', "angle": 2.059488517353309, "side": 2, "piece_name": "pawn"}, '
+        b', "angle": 2.478367537831948, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 0.9250245035569946, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 24.999999999999996, "y": 325.0, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b', "angle": -2.9321531433504737, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325.0, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b'{"x": 75.0, "y": 25.000000000000007, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b', "y": 325, "angle": 0.9075712110370514, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 1.3439035240356338, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.7401669256310974, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": -2.3736477827122884, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b'{"x": 24.999999999999986, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 74.99999999999999, "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b', "y": 325, "angle": -0.8726646259971648, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.1344640137963142, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -1.4835298641951802, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 175.00000000000003, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b', "y": 175.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b', "y": 225.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b', "y": 325.0, "angle": 0, "side": 2, "piece_name": "bishop"}, '
+        b', "y": 375.0, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b', "y": 75, "angle": 2.478367537831948, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": 2.059488517353309, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75, "angle": 0.9250245035569946, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325, "angle": -2.9321531433504737, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b'{"x": 25.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 225.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 24.999999999999982, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 125.0, "y": 325.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b'{"x": 75.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 325.0, "angle": 0, "side": 2, "piece_name": "king"}, '
+        b'{"x": 124.99999999999999, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 25.000000000000004, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 24.99999999999999, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 74.99999999999999, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "angle": 2.0420352248333655, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 325.0, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b'{"x": 275.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 75.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 125.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 224.99999999999997, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 25.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b'{"x": 125.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b'{"x": 375.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b', "y": 75, "angle": 2.0420352248333655, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 125.0, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b'{"x": 124.99999999999999, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 175.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 175.0, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 25.000000000000007, "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b'{"x": 24.99999999999998, "y": 124.99999999999999, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "y": 75.0, "angle": 3.141592653589793, "side": 1, "piece_name": "king"}, '
+        b'{"x": 74.99999999999999, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 174.99999999999997, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 375.0, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 175.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 124.99999999999999, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 225.0, "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 225.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 275.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 75.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 325.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 125.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 175.0, "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 225.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 124.99999999999999, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 124.99999999999999, "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b', "y": 275.0, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b', "y": 225.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b', "y": 125.00000000000001, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 175.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 125.0, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b', "y": 275.0, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 25, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 25, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 75, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 75, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 125, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 125, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 175, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 175, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 225, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 225, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 275, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 275, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 325, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 325, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 375, "y": 75, "angle": 3.141592653589793, "side": 1, "piece_name": "pawn"}, '
+        b'{"x": 375, "y": 325, "angle": 0, "side": 2, "piece_name": "pawn"}, '
+        b'{"x": 25, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b'{"x": 25, "y": 375, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b'{"x": 75, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 75, "y": 375, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b'{"x": 125, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b'{"x": 125, "y": 375, "angle": 0, "side": 2, "piece_name": "bishop"}, '
+        b'{"x": 175, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "queen"}, '
+        b'{"x": 175, "y": 375, "angle": 0, "side": 2, "piece_name": "queen"}, '
+        b'{"x": 225, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "king"}, '
+        b'{"x": 225, "y": 375, "angle": 0, "side": 2, "piece_name": "king"}, '
+        b'{"x": 275, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "bishop"}, '
+        b'{"x": 275, "y": 375, "angle": 0, "side": 2, "piece_name": "bishop"}, '
+        b'{"x": 325, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "knight"}, '
+        b'{"x": 325, "y": 375, "angle": 0, "side": 2, "piece_name": "knight"}, '
+        b'{"x": 375, "y": 25, "angle": 3.141592653589793, "side": 1, "piece_name": "rook"}, '
+        b'{"x": 375, "y": 375, "angle": 0, "side": 2, "piece_name": "rook"}, '
+        b'{"save_version": "1.1.0", "save": [['
+    ),
+}
+# fmt: on
+
+
+def random_saves(count: int, seed: int = 0) -> list[str]:
+    """(decompressed) saves of count random games, half of them chess960, to train on"""
+    import random
+
+    from rotating_chess.compressjson import text_decompress
+    from rotating_chess.game import Game
+
+    rng = random.Random(seed)
+    saves = []
+    for i in range(count):
+        game = Game()
+        if i % 2:
+            # load_chess_960 shuffles with the global generator
+            random.seed(i)
+            game.pieces.load_chess_960(None, None)
+            game.nav.load_boards([tuple(p.to_state() for p in game.pieces.pieces)])
+            game.sync()
+        for _ in range(rng.choice([0, 1, 2, 4, 8, 16, 32])):
+            move = game.random_move(rng)
+            if move is None:
+                break
+            game.apply(move)
+        saves.append(text_decompress(game.nav.get_game_save()))
+    return saves
+
+
+if __name__ == "__main__":
+    # retrains from random games. the seed's fixed so this is reproducible
+    from rotating_chess.history import SAVE_VERSION
+
+    zdict = train_zdict(
+        random_saves(300), '{"save_version": "%s", "save": [[' % SAVE_VERSION
+    )
+    print(f"    {max(ZDICTS) + 1}: (")
+    lines = zdict.split(b"}, ")
+    for line in lines[:-1]:
+        print(f"        {line + b'}, '!r}")
+    print(f"        {lines[-1]!r}")
+    print("    ),")
@@ -0,0 +1,98 @@
+"""
+64 bit position hashes that are updated, not recomputed, as pieces change.
+
+a board's hash is the xor of its pieces' hashes, so moving a piece is two xors (its
+old hash out, its new one in), a capture one, and so on, however many pieces there
+are. Pieces keeps its board's hash up to date that way, and TurnNavigation keeps every
+turn's, for repetition detection and as a key for caches (transposition tables,
+memoized legality, ...).
+
+a piece's hash is over its kind, side, and position and angle quantized to the
+fixed-point grid (see fixed.py), so float noise well under a sub-pixel doesn't change
+it. pieces can be anywhere, so there's no table of a random key per square like in
+chess: a piece's key is a (keyed) blake2b of its fields instead, cached. it has to mix
+them all together: with a key per field xor'd, two pieces trading places along an axis
+would keep the board's hash the same. keys are the same in every process, so they can
+be stored.
+
+>>> from rotating_chess.pieces import Side
+>>> a = piece_hash(25, 75, 0, Side.WHITE, "pawn")
+>>> a == piece_hash(25.0000001, 75, 0, Side.WHITE, "pawn")
+True
+>>> a == piece_hash(25, 75, 0, Side.BLACK, "pawn")
+False
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import struct
+from collections.abc import Iterable
+
+from rotating_chess import fixed
+
+# pieces uses this module. this block and __future__'s annotations fixes type checking
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rotating_chess.pieces import Board, Side
+
+# hashes are keyed, so they're the same in every process but not just any blake2b
+KEY = b"rotating_chess.zobrist"
+# piece name, side, x, y (in sub-pixels), angle (in units)
+PACKED = struct.Struct("<6sBiiH")
+
+
+def units_hash(piece_name: str, side: int, x: int, y: int, angle: int) -> int:
+    """the hash of a piece, given its side's value and its position and angle in units"""
+    packed = PACKED.pack(piece_name.encode(), side, x, y, angle % fixed.ANGLE_UNITS)
+    digest = hashlib.blake2b(packed, digest_size=8, key=KEY).digest()
+    return int.from_bytes(digest, "little")
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def piece_hash(x: float, y: float, angle: float, side: Side, piece_name: str) -> int:
+    """the hash of a piece. takes a PieceState's fields, i.e. piece_hash(*state)"""
+    return units_hash(
+        piece_name,
+        side.value,
+        fixed.to_units(x),
+        fixed.to_units(y),
+        fixed.angle_to_units(angle),
+    )
+
+
+def combine(hashes: Iterable[int]) -> int:
+    h = 0
+    for piece in hashes:
+        h ^= piece
+    return h
+
+
+def board_hash(board: Board) -> int:
+    """the hash of a whole board, from scratch"""
+    return combine(piece_hash(*state) for state in board)
+
+
+def update(h: int, prev: Board, board: Board) -> int:
+    """
+    the hash of board, given h, the hash of prev. only hashes what changed, so it's
+    cheap for boards that share their unchanged pieces (see share_board).
+    """
+    if len(prev) == len(board):
+        # usually pieces only change in place. (if they were shuffled, equal pieces
+        # still cancel out, it just takes more hashing.)
+        for before, after in zip(prev, board):
+            if before is not after:
+                h ^= piece_hash(*before) ^ piece_hash(*after)
+        return h
+    prev_ids = {id(state) for state in prev}
+    ids = {id(state) for state in board}
+    for state in prev:
+        if id(state) not in ids:
+            h ^= piece_hash(*state)
+    for state in board:
+        if id(state) not in prev_ids:
+            h ^= piece_hash(*state)
+    return h
@@ -0,0 +1,41 @@
+import math
+import random
+
+import pygame
+import pytest
+from pygame.event import Event
+
+from rotating_chess import headless
+from rotating_chess.game import Game, random_script
+from rotating_chess.pieces import PieceState, Side
+
+
+def played(plies: int, seed: int, rotate_chance: float = 0.5) -> Game:
+    """a random game (see game.random_script), played out"""
+    game = Game()
+    for action in random_script(plies, random.Random(seed), rotate_chance):
+        assert game.apply(action)
+    return game
+
+
+def state(x: float, y: float, side: Side, name: str) -> PieceState:
+    return PieceState(x, y, 0 if side == Side.WHITE else math.pi, side, name)
+
+
+# white's rook (a4) can take black's queen (e4), and the queen the rook
+HANGING_QUEEN = (
+    state(25, 375, Side.WHITE, "king"),
+    state(25, 225, Side.WHITE, "rook"),
+    state(375, 25, Side.BLACK, "king"),
+    state(225, 225, Side.BLACK, "queen"),
+)
+
+
+@pytest.fixture(scope="module")
+def screen():
+    yield headless.init()
+    pygame.quit()
+
+
+def click(x: int, y: int) -> list[Event]:
+    return [Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1)]
@@ -0,0 +1,88 @@
+import json
+
+from rotating_chess import analysis
+from rotating_chess.engine import Engine
+from rotating_chess.pieces import Side
+from tests.conftest import HANGING_QUEEN, played
+
+
+def write_saves(directory, games: int) -> None:
+    for seed in range(games):
+        save = played(6, seed).nav.get_game_save()
+        (directory / f"rotchess_save_{seed}.txt").write_text(save)
+
+
+class TestPlies:
+    def test_move_then_rotation(self):
+        start = HANGING_QUEEN
+        moved = (start[0], start[1]._replace(y=175), *start[2:])
+        turned = (start[0], moved[1]._replace(angle=1.0), *start[2:])
+        replied = (*turned[:3], turned[3]._replace(x=275))
+        assert list(analysis.plies_of([start, moved, turned, replied])) == [
+            (0, 2, Side.WHITE),
+            (2, 3, Side.BLACK),
+        ]
+
+    def test_skips_nothing_turns(self):
+        start = HANGING_QUEEN
+        moved = (start[0], start[1]._replace(y=175), *start[2:])
+        assert list(analysis.plies_of([start, start, moved])) == [(1, 2, Side.WHITE)]
+
+
+class TestAnalyseGame:
+    def test_missed_capture(self):
+        moved = (HANGING_QUEEN[0], HANGING_QUEEN[1]._replace(y=175), *HANGING_QUEEN[2:])
+        result = analysis.analyse_game(
+            [HANGING_QUEEN, moved], Engine(angles=0, max_depth=2), 2
+        )
+        (ply,) = result["plies"]
+        assert ply["side"] == "white" and ply["best"] > ply["played"]
+        assert ply["blunder"] and ply["missed_capture"]
+        assert result["blunders"] == result["missed_captures"] == 1
+        assert len(result["evals"]) == result["turns"] == 2
+
+    def test_taking_is_no_blunder(self):
+        taken = (HANGING_QUEEN[0], HANGING_QUEEN[1]._replace(x=225), HANGING_QUEEN[2])
+        result = analysis.analyse_game(
+            [HANGING_QUEEN, taken], Engine(angles=0, max_depth=2), 2
+        )
+        (ply,) = result["plies"]
+        assert ply["loss"] == 0 and not ply["missed_capture"]
+
+
+class TestAnalyseDirectory:
+    def test_analyses_and_resumes(self, tmp_path):
+        saves = tmp_path / "saves"
+        saves.mkdir()
+        write_saves(saves, 3)
+        (saves / "rotchess_save_bad.txt").write_text("not a save")
+        output = tmp_path / "analysis.jsonl"
+
+        assert analysis.analyse_directory(saves, output, workers=1, depth=1) == 4
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        by_save = {line["save"]: line for line in lines}
+        assert len(by_save) == 4
+        assert "error" in by_save["rotchess_save_bad.txt"]
+        assert all(
+            len(by_save[f"rotchess_save_{n}.txt"]["plies"]) > 0 for n in range(3)
+        )
+
+        # everything's done already
+        assert analysis.analyse_directory(saves, output, workers=1, depth=1) == 0
+        assert len(output.read_text().splitlines()) == 4
+
+    def test_drops_a_cut_short_line(self, tmp_path):
+        saves = tmp_path / "saves"
+        saves.mkdir()
+        write_saves(saves, 2)
+        output = tmp_path / "analysis.jsonl"
+        analysis.analyse_directory(saves, output, workers=1, depth=1)
+        data = output.read_bytes()
+        output.write_bytes(data[: data.index(b"\n") + 10])
+
+        assert analysis.analyse_directory(saves, output, workers=1, depth=1) == 1
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert sorted(line["save"] for line in lines) == [
+            "rotchess_save_0.txt",
+            "rotchess_save_1.txt",
+        ]
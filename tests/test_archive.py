@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from rotating_chess.archive import KEYFRAME_EVERY, Archive, ArchiveWriter
+from rotating_chess.game import Game, random_script
+from rotating_chess.history import parse_game_save
+from tests.conftest import played
+
+
+class TestArchive:
+    def test_round_trip(self, tmp_path):
+        # long enough for captures, and for more than one keyframe
+        games = [played(40, seed).nav.get_line_boards() for seed in range(3)]
+        assert any(len(g[-1]) < len(g[0]) for g in games)
+        assert any(len(g) > KEYFRAME_EVERY for g in games)
+        with ArchiveWriter(tmp_path / "a.rca") as writer:
+            for i, boards in enumerate(games):
+                writer.add(boards, {"seed": i})
+
+        with Archive(tmp_path / "a.rca") as archive:
+            assert len(archive) == len(games)
+            for i, boards in enumerate(games):
+                assert archive.metadata(i) == {"seed": i}
+                assert archive.turns(i) == len(boards)
+                assert archive.boards(i) == boards
+                for turn in (0, 1, KEYFRAME_EVERY - 1, len(boards) - 1):
+                    if turn < len(boards):
+                        assert archive.board(i, turn) == boards[turn]
+
+    def test_game_save(self, tmp_path):
+        game = Game()
+        for action in random_script(6, random.Random(7)):
+            game.apply(action)
+        with ArchiveWriter(tmp_path / "a.rca") as writer:
+            writer.add_save(game.nav.get_game_save())
+        with Archive(tmp_path / "a.rca") as archive:
+            # coordinates come back as floats, so compare boards, not text
+            saved = parse_game_save(archive.game_save(0))
+            assert saved == game.nav.get_line_boards()
+            with pytest.raises(IndexError):
+                archive.board(0, len(game.nav))
+            with pytest.raises(IndexError):
+                archive.turns(1)
+
+    def test_not_an_archive(self, tmp_path):
+        (tmp_path / "a.rca").write_bytes(b"hello, this is not an archive at all")
+        with pytest.raises(ValueError):
+            Archive(tmp_path / "a.rca")
@@ -0,0 +1,60 @@
+import pytest
+
+from rotating_chess.engine import WIN, Weights, evaluate
+from rotating_chess.pieces import Piece, Side
+from tests.conftest import HANGING_QUEEN, played
+
+pytest.importorskip("numpy")
+
+from rotating_chess import batcheval  # noqa: E402
+
+
+def midgame_boards(games: int, plies: int) -> list:
+    boards = []
+    for seed in range(games):
+        boards += played(plies, seed).nav.get_line_boards()
+    return boards
+
+
+class TestBatchEval:
+    def test_material_matches_engine(self):
+        boards = midgame_boards(3, 30) + [HANGING_QUEEN, HANGING_QUEEN[1:]]
+        scores = batcheval.material(batcheval.pack(boards))
+        for board, score in zip(boards, scores):
+            assert score == pytest.approx(evaluate(board, Side.WHITE))
+        assert scores[-1] == -WIN
+
+    def test_mobility_counts_piece_points(self):
+        boards = midgame_boards(2, 30)
+        # boards with captures are narrower than the batch
+        mobility = batcheval.piece_mobility(batcheval.pack(boards))
+        for board, counts in zip(boards, mobility):
+            for state, count in zip(board, counts):
+                piece = Piece.from_state(state, None, None)
+                piece.init()
+                # the king's list has two of its points twice, a hair apart
+                points = {
+                    (round(x, 6), round(y, 6)) for x, y in piece.get_movable_points()
+                }
+                assert count == len(points)
+            assert (counts[len(board) :] == 0).all()
+
+    def test_threats(self):
+        batch = batcheval.pack([HANGING_QUEEN])
+        assert batcheval.threatened(batch).tolist() == [[False, True, False, True]]
+        # the queen's 9 under threat, vs the rook's 5
+        assert batcheval.terms(batch).threats.tolist() == [4.0]
+
+    def test_evaluate(self):
+        no_black_king = HANGING_QUEEN[:2] + HANGING_QUEEN[3:]
+        batch = batcheval.pack([HANGING_QUEEN, no_black_king])
+        terms = batcheval.terms(batch)
+        scores = batcheval.evaluate(batch, Weights(mobility=0.1), threat=0.5)
+        assert scores[0] == pytest.approx(
+            terms.material[0] + 0.1 * terms.mobility[0] + 0.5 * terms.threats[0]
+        )
+        assert scores[1] == WIN
+
+    def test_empty(self):
+        batch = batcheval.pack([])
+        assert len(batch) == 0 and batcheval.evaluate(batch).shape == (0,)
@@ -0,0 +1,89 @@
+import pytest
+
+from rotating_chess import fixed
+from rotating_chess.book import Book, build
+from rotating_chess.engine import Engine
+from rotating_chess.pieces import Move, Side
+from rotating_chess.plies import PlyGenerator, angle_set, reference, start_board
+from rotating_chess.symmetry import Symmetry, canonical_to_move, transform
+from tests.conftest import played
+
+
+def moves(plies: int, seed: int) -> tuple[list, list]:
+    """a game's moves (it doesn't rotate) and the boards they lead to"""
+    nav = played(plies, seed, rotate_chance=0).nav
+    return [nav.get_action(turn) for turn in range(1, len(nav))], nav.get_line_boards()
+
+
+class TestKeys:
+    def test_symmetric_positions_share_a_key(self):
+        _, boards = moves(1, 0)
+        board = boards[1]
+        key = canonical_to_move(board, Side.BLACK)[0]
+        assert (
+            canonical_to_move(transform(board, Symmetry.MIRROR), Side.BLACK)[0] == key
+        )
+        assert canonical_to_move(transform(board, Symmetry.FLIP), Side.WHITE)[0] == key
+        assert canonical_to_move(board, Side.WHITE)[0] != key
+
+
+class TestBook:
+    def test_probe_finds_the_played_move(self, tmp_path):
+        script, boards = moves(4, 1)
+        path = tmp_path / "book.rcb"
+        assert build([boards], path, turns=4) == 4
+        plies = PlyGenerator(reference, angle_set(0))
+        with Book(path) as book:
+            side = Side.WHITE
+            for turn, action in enumerate(script):
+                (move,) = book.probe(boards[turn], side)
+                assert (move.to_x, move.to_y) == (
+                    fixed.to_units(action.x),
+                    fixed.to_units(action.y),
+                )
+                ply, child = book.choose(boards[turn], side, plies)
+                assert ply.actions() == [action] and child == boards[turn + 1]
+                side = Side.BLACK if side == Side.WHITE else Side.WHITE
+            assert book.probe(boards[4], side) == []
+
+    def test_mirrored_game(self, tmp_path):
+        script, boards = moves(1, 2)
+        path = tmp_path / "book.rcb"
+        build([boards], path)
+        mirrored = transform(boards[0], Symmetry.MIRROR)
+        with Book(path) as book:
+            (move,) = book.probe(mirrored, Side.WHITE)
+        assert fixed.from_units(move.to_x) == pytest.approx(400 - script[0].x)
+
+    def test_most_played_first(self, tmp_path):
+        board = start_board()
+        # a2 -> a3 and e2 -> e4
+        a3 = board[:1] + (board[1]._replace(y=275),) + board[2:]
+        e4 = board[:9] + (board[9]._replace(y=225),) + board[10:]
+        path = tmp_path / "book.rcb"
+        build([[board, e4], [board, a3], [board, a3]], path)
+        with Book(path) as book:
+            moves = book.probe(board, Side.WHITE)
+        assert [(move.games, fixed.from_units(move.to_y)) for move in moves] == [
+            (2, 275),
+            (1, 225),
+        ]
+
+    def test_not_a_book(self, tmp_path):
+        (tmp_path / "book.rcb").write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            Book(tmp_path / "book.rcb")
+
+
+class TestEngineBook:
+    def test_plays_from_the_book(self, tmp_path):
+        script, boards = moves(1, 5)
+        path = tmp_path / "book.rcb"
+        build([boards], path)
+        with Book(path) as book:
+            engine = Engine(angles=0, max_depth=2, book=book)
+            (suggestion,) = engine.search(start_board(), Side.WHITE)
+            assert suggestion.depth == 0 and suggestion.complete
+            assert suggestion.ply.actions() == script
+            # out of the book, it searches
+            assert engine.best(boards[1], Side.BLACK).depth == 2
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from rotating_chess import widgets
+from rotating_chess.game import Game, random_script
+from tests.conftest import played
+
+pytest.importorskip("numpy")
+
+
+def positions(games: int, plies: int):
+    for seed in range(games):
+        game = played(plies, seed)
+        for turn in range(1, len(game.nav)):
+            game.nav.go_to_node(game.nav.get_node_at(turn))
+            game.sync()
+            yield game
+
+
+class TestKernel:
+    def test_matches_reference(self):
+        checked = 0
+        for game in positions(2, 25):
+            for idx, piece in enumerate(game.pieces.pieces):
+                game.select(idx)
+                points = piece.get_movable_points()
+                reference = [game.pieces.canmove(piece, *point) for point in points]
+                assert game.pieces.canmove_many(piece, points) == reference
+                checked += len(points)
+                game.deselect()
+        assert checked > 5000
+
+    def test_centres_follow_the_board(self):
+        game = Game()
+        for action in random_script(20, random.Random(7)):
+            game.apply(action)
+            centres, sides = game.pieces.centres()
+            assert centres.tolist() == [
+                [p.get_x(), p.get_y()] for p in game.pieces.pieces
+            ]
+            assert sides.tolist() == [p.get_side().value for p in game.pieces.pieces]
+
+    def test_without_numpy(self, monkeypatch):
+        game = Game()
+        for action in random_script(20, random.Random(8)):
+            game.apply(action)
+        vectorized = list(game.legal_moves())
+        monkeypatch.setattr(widgets, "HAVE_NUMPY", False)
+        assert list(game.legal_moves()) == vectorized
@@ -0,0 +1,37 @@
+import random
+import zlib
+
+import pytest
+
+from rotating_chess.compressjson import text_compress, text_decompress
+from rotating_chess.game import Game, random_script
+from rotating_chess.history import SAVE_ZDICTS, encode_game_save, parse_game_save
+from rotating_chess.zdicts import ZDICTS
+
+
+class TestPresetDictionaries:
+    def test_shipped_dictionaries_never_change(self):
+        # saves made with them can't be read without the exact same bytes
+        assert zlib.adler32(ZDICTS[1]) == 0x5828C822
+
+    def test_every_version_round_trips(self):
+        game = Game()
+        for action in random_script(6, random.Random(0)):
+            game.apply(action)
+        boards = game.nav.get_line_boards()
+        for version in SAVE_ZDICTS:
+            assert (
+                parse_game_save(encode_game_save(boards, save_version=version))
+                == boards
+            )
+
+    def test_dictionary_makes_short_saves_shorter(self):
+        boards = Game().nav.get_line_boards()
+        old = encode_game_save(boards, save_version="1.0.0")
+        new = encode_game_save(boards)
+        assert len(new) * 4 < len(old)
+
+    def test_unknown_dictionary(self):
+        s = text_compress('{"hello": "world!"}', b"not a shipped dictionary")
+        with pytest.raises(ValueError):
+            text_decompress(s)
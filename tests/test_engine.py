@@ -0,0 +1,61 @@
+from rotating_chess.engine import WIN, Engine, Weights, evaluate
+from rotating_chess.game import Game
+from rotating_chess.pieces import Side
+from rotating_chess.plies import reference, start_board
+from tests.conftest import HANGING_QUEEN, state
+
+
+class TestEvaluate:
+    def test_start_is_even(self):
+        board = start_board()
+        assert evaluate(board, Side.WHITE) == evaluate(board, Side.BLACK) == 0
+
+    def test_material(self):
+        assert evaluate(HANGING_QUEEN, Side.BLACK, Weights(centre=0)) == 4
+        assert evaluate(HANGING_QUEEN, Side.WHITE, Weights(queen=3, centre=0)) == 2
+
+    def test_kings(self):
+        assert evaluate(HANGING_QUEEN[1:], Side.WHITE) == -WIN
+        assert evaluate(HANGING_QUEEN[1:], Side.BLACK) == WIN
+
+    def test_mobility(self):
+        weights = Weights(centre=0, mobility=1)
+        engine = Engine(weights, angles=0)
+        # same material, but the queen has far more moves than the rook
+        assert engine.evaluate(HANGING_QUEEN, Side.BLACK) > 4
+
+
+class TestSearch:
+    def test_takes_the_queen(self):
+        engine = Engine(angles=0, max_depth=2, generator=reference)
+        best = engine.best(HANGING_QUEEN, Side.WHITE)
+        assert best is not None and best.complete and best.depth == 2
+        assert (best.ply.piece, best.ply.x, best.ply.y) == (1, 225, 225)
+        assert best.score > 4
+
+    def test_takes_the_king(self):
+        board = HANGING_QUEEN[:2] + (state(225, 225, Side.BLACK, "king"),)
+        best = Engine(angles=0).best(board, Side.WHITE)
+        assert best is not None and best.score >= WIN
+        # no need to look any deeper than that
+        assert best.depth == 1
+
+    def test_suggestions_are_legal(self):
+        game = Game()
+        suggestions = list(Engine(max_depth=1).search(start_board(), Side.WHITE))
+        assert suggestions[-1].complete
+        assert [s.complete for s in suggestions[:-1]] == [False] * (
+            len(suggestions) - 1
+        )
+        for action in suggestions[-1].ply.actions():
+            assert game.apply(action)
+
+    def test_stops(self):
+        engine = Engine(max_depth=3)
+        suggestions = list(engine.search(start_board(), Side.WHITE, lambda: True))
+        # stopped on the first check, partway through depth 1
+        assert all(s.depth == 1 and not s.complete for s in suggestions)
+        assert engine.nodes < 100
+
+    def test_no_plies(self):
+        assert Engine().best((state(25, 375, Side.WHITE, "king"),), Side.BLACK) is None
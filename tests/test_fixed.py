@@ -0,0 +1,82 @@
+import math
+import random
+
+import pytest
+
+from rotating_chess import fixed, settings
+from rotating_chess.archive import Archive, ArchiveWriter, encode_turn
+from rotating_chess.game import Game
+from rotating_chess.history import parse_game_save
+from rotating_chess.pieces import Side
+from tests.conftest import played
+
+
+@pytest.fixture
+def fixed_point(monkeypatch):
+    monkeypatch.setattr(settings, "FIXED_POINT", True)
+
+
+class TestUnits:
+    def test_round_trip(self):
+        rng = random.Random(0)
+        for _ in range(1000):
+            v = rng.uniform(-1000, 1000)
+            assert fixed.from_units(fixed.to_units(fixed.snap(v))) == fixed.snap(v)
+            assert abs(fixed.snap(v) - v) <= 0.5 / fixed.SUBPIXELS
+            a = rng.uniform(-10, 10)
+            snapped = fixed.snap_angle(a)
+            assert fixed.snap_angle(snapped) == snapped
+            assert -math.pi < snapped <= math.pi
+            assert abs(math.remainder(snapped - a, 2 * math.pi)) <= fixed.ANGLE_UNIT
+
+    def test_normal_board_is_snapped(self):
+        assert all(map(fixed.is_snapped, Game().nav.get_curr_board()))
+
+
+class TestFixedPoint:
+    def test_states_stay_on_the_grid(self, fixed_point):
+        game = played(40, 1)
+        for board in game.nav.get_line_boards():
+            assert all(map(fixed.is_snapped, board))
+
+    def test_same_position_same_board(self, fixed_point):
+        # the same rotation, reached from angles that differ by float noise
+        a, b = Game(), Game()
+        rook = a.find(25, 375)
+        assert a.rotate(((rook, 0.1 + 0.2),))
+        assert b.rotate(((rook, 0.3),))
+        assert a.nav.get_curr_board() == b.nav.get_curr_board()
+        assert hash(a.nav.get_curr_board()) == hash(b.nav.get_curr_board())
+
+    def test_canmove_matches_float(self, fixed_point, monkeypatch):
+        checked = 0
+        for seed in range(3):
+            game = played(30, seed)
+            for idx, piece in enumerate(game.pieces.pieces):
+                game.select(idx)
+                for point in piece.get_movable_points():
+                    exact = game.pieces.canmove(piece, *point)
+                    monkeypatch.setattr(settings, "FIXED_POINT", False)
+                    assert game.pieces.canmove(piece, *point) == exact
+                    monkeypatch.setattr(settings, "FIXED_POINT", True)
+                    checked += 1
+                game.deselect()
+        assert checked > 1000
+
+    def test_loaded_saves_are_snapped(self, fixed_point, monkeypatch):
+        monkeypatch.setattr(settings, "FIXED_POINT", False)
+        save = played(20, 2).nav.get_game_save()
+        monkeypatch.setattr(settings, "FIXED_POINT", True)
+        for board in parse_game_save(save):
+            assert all(map(fixed.is_snapped, board))
+
+
+class TestArchive:
+    def test_fixed_turns_are_smaller(self, fixed_point, tmp_path):
+        boards = played(30, 3).nav.get_line_boards()
+        with ArchiveWriter(tmp_path / "games.rca") as w:
+            w.add(boards)
+        with Archive(tmp_path / "games.rca") as a:
+            assert a.boards(0) == boards
+        nudged = (boards[0][0]._replace(x=boards[0][0].x + 1e-9),) + boards[0][1:]
+        assert len(encode_turn(boards[0], None)) * 2 < len(encode_turn(nudged, None))
@@ -0,0 +1,67 @@
+import math
+
+from rotating_chess import widgets
+from rotating_chess.game import Game
+from rotating_chess.locations import at
+from rotating_chess.pieces import Move, Rotate, Side
+
+
+class TestIsolation:
+    def test_boards_are_not_shared(self):
+        a, b = widgets.Pieces(), widgets.Pieces()
+        a.load_normal_board(None, None)
+        assert len(a.pieces) == 32
+        assert len(b.pieces) == 0
+
+    def test_games_are_independent(self):
+        a, b = Game(), Game()
+        assert a.move(a.find(*at("e2")), *at("e4"))
+        assert len(a.nav) == 2
+        assert len(b.nav) == 1
+        assert b.find(*at("e2")) is not None
+
+
+class TestActions:
+    def test_illegal_move(self):
+        g = Game()
+        assert not g.move(g.find(*at("h1")), *at("h5"))
+        assert not g.move(g.find(*at("e2")), *at("e5"))
+        assert not g.move(100, *at("e4"))
+        assert len(g.nav) == 1
+        assert g.pieces.selected_pieces == []
+
+    def test_non_finite_numbers(self):
+        g = Game()
+        board = g.nav.get_curr_board()
+        assert not g.rotate(((0, 0.5), (1, math.inf)))
+        assert not g.rotate(((0, math.nan),))
+        assert not g.move(g.find(*at("e2")), math.nan, 225)
+        assert len(g.nav) == 1
+        assert g.pieces.pieces[0].to_state() == board[0]
+
+    def test_headless_rotation(self):
+        g = Game()
+        rook = g.find(*at("a1"))
+        assert g.rotate(((rook, math.pi / 4),))
+        assert g.nav.get_curr_action() == Rotate(((rook, math.pi / 4),))
+        # a rook turned 45 degrees moves diagonally (though b2 is in the way)
+        step = 50 * math.sqrt(2) / 2
+        piece = g.select(rook)
+        assert g.movable_point(piece, 25 + 2 * step, 375 - 2 * step) is not None
+        assert not g.can_move(rook, 25 + 2 * step, 375 - 2 * step)
+
+    def test_replay_stays_in_sync(self):
+        a, b = Game(), Game()
+        for start, end in [("e2", "e4"), ("d7", "d5"), ("e4", "d5")]:
+            assert a.move(a.find(*at(start)), *at(end))
+            assert b.apply(a.nav.get_curr_action())
+        assert a.nav.get_curr_board() == b.nav.get_curr_board()
+        assert len(b.pieces.pieces) == 31
+
+    def test_legal_moves(self):
+        g = Game()
+        moves = list(g.legal_moves(Side.WHITE))
+        assert Move(g.find(*at("b1")), *at("c3")) in [
+            Move(m.piece, round(m.x, 6), round(m.y, 6)) for m in moves
+        ]
+        assert all(g.pieces.pieces[m.piece].get_side() == Side.WHITE for m in moves)
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from rotating_chess import settings
+from rotating_chess.canmove import HAVE_NUMPY
+from rotating_chess.game import Game, random_script
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.history import parse_game_save
+from rotating_chess.locations import at
+from rotating_chess.notation import encode_position, parse_position
+from rotating_chess.perft import check, perft
+from rotating_chess.pieces import Piece, Side
+from rotating_chess.plies import board_geometry, start_board
+from rotating_chess.symmetry import Symmetry, canonical_key, transform
+
+BIG = BoardGeometry(16, 16)
+
+
+class TestGeometry:
+    def test_normal_board(self):
+        assert settings.BOARD == BoardGeometry()
+        board = start_board()
+        assert len(board) == 32
+        assert (board[0].x, board[0].y, board[0].side) == (25, 75, Side.BLACK)
+        assert (board[-1].x, board[-1].y, board[-1].piece_name) == (375, 375, "rook")
+        back_rank = [s.piece_name for s in board if s.y == 375]
+        assert back_rank == BoardGeometry().back_rank()
+
+    def test_big_board(self):
+        with board_geometry(BIG):
+            board = start_board()
+            assert at("p16") == (775, 25) and at("a1") == (25, 775)
+            assert len(board) == 4 * 16
+            back_rank = [s.piece_name for s in board if s.y == 775]
+            assert back_rank == BIG.back_rank()
+            assert back_rank.count("king") == 1 and back_rank[::-1] != back_rank
+            assert max(s.x for s in board) == 775 and max(s.y for s in board) == 775
+        assert settings.BOARD == BoardGeometry()
+
+    def test_promotion(self):
+        with board_geometry(BIG):
+            for y, promotes in [(375, False), (725, False), (775, True)]:
+                pawn = Piece(25, y, 0, Side.BLACK, None, "pawn")
+                assert pawn.should_promote() == promotes
+
+    def test_points_reach_the_edge(self):
+        rook = Piece(25, 775, 0, Side.WHITE, None, "rook")
+        with board_geometry(BIG):
+            rook.init()
+            points = rook.get_movable_points()
+        assert max(x for x, _ in points) == pytest.approx(775)
+        assert min(y for _, y in points) == pytest.approx(25)
+
+    def test_rules_and_history(self):
+        with board_geometry(BIG):
+            assert perft(start_board(), 1, angles=0) == 70
+            assert check(start_board(), 1, 2, "numpy" if HAVE_NUMPY else "fixed") == []
+            game = Game()
+            for action in random_script(20, random.Random(0)):
+                assert game.apply(action)
+            boards = parse_game_save(game.nav.get_game_save())
+            assert boards == game.nav.get_line_boards()
+
+    def test_symmetry_and_notation(self):
+        with board_geometry(BIG):
+            board = start_board()
+            mirrored = transform(board, Symmetry.MIRROR)
+            assert {(s.x, s.y) for s in mirrored} == {(s.x, s.y) for s in board}
+            assert canonical_key(board) == canonical_key(mirrored)
+            text = encode_position(board)
+            assert "p16" in text and parse_position(text) == board
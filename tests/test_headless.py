@@ -0,0 +1,80 @@
+import pygame
+from pygame.event import Event
+
+from rotating_chess import headless
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.pieces import Piece
+from rotating_chess.plies import board_geometry
+from rotating_chess.saveio import import_save
+from rotating_chess.widgets import MOUSE_HELD, SAVE_IO_DONE
+from tests.conftest import click
+
+
+class TestFrames:
+    def test_scripted_move(self, screen):
+        gs = headless.game_state()
+        # e2, then e4
+        headless.run_frame(screen, gs, click(225, 325), 225, 325)
+        assert len(gs.widgets.pieces.selected_pieces) == 1
+        headless.run_frame(screen, gs, click(225, 225), 225, 225)
+        assert len(gs.nav) == 2
+
+    def test_import_deselects(self, screen):
+        gs = headless.game_state()
+        save = gs.nav.get_game_save()
+        headless.run_frame(screen, gs, click(225, 325), 225, 325)
+        pawn = gs.widgets.pieces.selected_pieces[0]
+
+        task = gs.widgets.imp_save.task = import_save(lambda: save)
+        task.join()
+        headless.run_frame(screen, gs, [Event(SAVE_IO_DONE, task=task)], 0, 0)
+        assert not gs.widgets.pieces.selected_pieces and not pawn.selected
+        assert not gs.widgets.movesel.is_visible()
+        # and the board is playable, not stuck on the old pawn
+        headless.run_frame(screen, gs, click(225, 325), 225, 325)
+        headless.run_frame(screen, gs, click(225, 225), 225, 225)
+        assert len(gs.nav) == 2
+
+    def test_panel_follows_board_size(self, screen):
+        with board_geometry(BoardGeometry(16, 16)):
+            gs = headless.game_state()
+            surface = pygame.Surface((1000, 800))
+            gs.widgets.nav_prog.draw(surface, gs)
+        # a one-turn game's bar is full, along the bottom of the panel
+        assert surface.get_at((999, 799)) == (255, 255, 255)
+        assert surface.get_at((999, 399)) != (255, 255, 255)
+
+    def test_rotation_drag(self, screen):
+        gs = headless.game_state()
+        timer = headless.FrameTimer()
+        headless.run_frame(screen, gs, click(175, 375), 175, 375, timer)
+        headless.run_frame(screen, gs, click(500, 140), 500, 140, timer)
+        headless.run_frame(screen, gs, [Event(MOUSE_HELD)], 560, 200, timer)
+        queen = gs.widgets.pieces.selected_pieces[0]
+        assert queen.previewing_rot()
+        assert len(timer.frames) == 3
+        assert {"events", "board", "pieces", "present"} <= set(timer.frames[0])
+        assert "3 frames" in timer.report()
+
+    def test_overlay_is_cached(self, screen, monkeypatch):
+        drawn = []
+        draw_guide_lines = Piece.draw_guide_lines
+
+        def counted(piece, surface):
+            drawn.append(piece)
+            draw_guide_lines(piece, surface)
+
+        monkeypatch.setattr(Piece, "draw_guide_lines", counted)
+        gs = headless.game_state()
+        headless.run_frame(screen, gs, click(175, 375), 175, 375)
+        for _ in range(3):
+            headless.run_frame(screen, gs, [], 300, 200)
+        assert len(drawn) == 1
+        # rotating the queen changes its points and guide lines
+        headless.run_frame(screen, gs, click(500, 140), 500, 140)
+        headless.run_frame(screen, gs, [Event(MOUSE_HELD)], 560, 200)
+        headless.run_frame(screen, gs, [], 560, 200)
+        assert len(drawn) == 3
+        # and so does selecting another piece
+        headless.run_frame(screen, gs, click(225, 325), 225, 325)
+        assert len(drawn) == 4 and drawn[-1] is not drawn[0]
@@ -0,0 +1,82 @@
+import time
+
+from rotating_chess.game import Game
+from rotating_chess.geometry import BoardGeometry
+from rotating_chess.hints import HintService, to_move
+from rotating_chess.pieces import Side
+from rotating_chess.plies import board_geometry
+
+
+def wait_for(service: HintService, complete: bool = False, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        best = service.poll()
+        if best is not None and (best.complete or not complete):
+            return best
+        time.sleep(0.01)
+    raise TimeoutError
+
+
+class TestToMove:
+    def test_alternates(self):
+        game = Game()
+        assert to_move(game.nav.get_curr_node()) == Side.WHITE
+        game.move(game.find(225, 325), 225, 225)
+        assert to_move(game.nav.get_curr_node()) == Side.BLACK
+        # white may still rotate after moving. it's black's turn after that too
+        game.rotate(((game.find(225, 225), 0.5),))
+        assert to_move(game.nav.get_curr_node()) == Side.BLACK
+        game.move(game.find(225, 75), 225, 175)
+        assert to_move(game.nav.get_curr_node()) == Side.WHITE
+
+
+class TestHintService:
+    def test_suggests(self):
+        service = HintService(process=False, max_depth=1)
+        try:
+            game = Game()
+            service.submit(game.nav.get_curr_board(), Side.WHITE)
+            best = wait_for(service, complete=True)
+            for action in best.ply.actions():
+                assert game.apply(action)
+        finally:
+            service.close()
+
+    def test_drops_stale_work(self):
+        service = HintService(process=False, max_depth=2)
+        try:
+            game = Game()
+            service.submit(game.nav.get_curr_board(), Side.WHITE)
+            wait_for(service)
+            service.cancel()
+            assert service.poll() is None
+
+            game.move(game.find(225, 325), 225, 225)
+            service.submit(game.nav.get_curr_board(), Side.BLACK)
+            best = wait_for(service)
+            # black's, from the new board
+            assert game.nav.get_curr_board()[best.ply.piece].side == Side.BLACK
+        finally:
+            service.close()
+
+    def test_process(self):
+        service = HintService(max_depth=1)
+        try:
+            service.submit(Game().nav.get_curr_board(), Side.WHITE)
+            assert wait_for(service, complete=True).depth == 1
+        finally:
+            service.close()
+
+    def test_process_uses_the_board(self):
+        with board_geometry(BoardGeometry(16, 16)):
+            service = HintService(max_depth=1)
+            try:
+                game = Game()
+                service.submit(game.nav.get_curr_board(), Side.WHITE)
+                best = wait_for(service, complete=True)
+                # white's pawns start on rank 2, i.e. y 725, off the default board
+                assert game.nav.get_curr_board()[best.ply.piece].y > 400
+                for action in best.ply.actions():
+                    assert game.apply(action)
+            finally:
+                service.close()
@@ -0,0 +1,89 @@
+from rotating_chess import widgets
+from rotating_chess.history import TurnNavigation, parse_game_save
+from rotating_chess.locations import at
+
+
+def play(ps: widgets.Pieces, start: str, end: str) -> None:
+    """moves the piece at start to end (no legality checks) on a headless board."""
+    (p,) = [q for q in ps.pieces if (q.get_x(), q.get_y()) == tuple(at(start))]
+    p.selected = True
+    ps.selected_pieces.append(p)
+    ps.move(p, *at(end), None)
+
+
+def standard_nav() -> tuple[widgets.Pieces, TurnNavigation]:
+    ps = widgets.Pieces()
+    ps.load_normal_board(None, None)
+    return ps, TurnNavigation(ps.pieces)
+
+
+class TestVariations:
+    def test_unchanged_pieces_are_shared(self):
+        ps, nav = standard_nav()
+        before = nav.get_curr_board()
+        play(ps, "e2", "e4")
+        nav.record_turn(ps.pieces)
+        after = nav.get_curr_board()
+
+        assert len(nav) == 2
+        shared = sum(a is b for a, b in zip(before, after))
+        assert shared == len(before) - 1
+
+    def test_branching_keeps_old_line(self):
+        ps, nav = standard_nav()
+        play(ps, "e2", "e4")
+        nav.record_turn(ps.pieces)
+        e4 = nav.get_curr_board()
+
+        nav.first()
+        ps.pieces = nav.get_curr_turn()
+        play(ps, "d2", "d4")
+        nav.record_turn(ps.pieces)
+        d4 = nav.get_curr_board()
+
+        assert len(nav) == 2
+        assert nav.variation_count() == 2
+        assert nav.variation_idx() == 1
+
+        nav.switch_variation()
+        assert nav.get_curr_board() is e4
+        nav.switch_variation()
+        assert nav.get_curr_board() is d4
+
+    def test_switch_follows_side_line(self):
+        ps, nav = standard_nav()
+        for start, end in [("e2", "e4"), ("e7", "e5"), ("g1", "f3")]:
+            play(ps, start, end)
+            nav.record_turn(ps.pieces)
+
+        nav.go_to(1)
+        ps.pieces = nav.get_curr_turn()
+        play(ps, "c7", "c5")
+        nav.record_turn(ps.pieces)
+        assert len(nav) == 3
+
+        nav.switch_variation()
+        assert nav.get_curr_turn_idx() == 2
+        assert len(nav) == 4  # the old line, through Nf3
+
+    def test_same_turn_is_revisited(self):
+        ps, nav = standard_nav()
+        play(ps, "e2", "e4")
+        nav.record_turn(ps.pieces)
+
+        nav.first()
+        ps.pieces = nav.get_curr_turn()
+        play(ps, "e2", "e4")
+        nav.record_turn(ps.pieces)
+        assert nav.variation_count() == 1
+
+    def test_save_roundtrip(self):
+        ps, nav = standard_nav()
+        play(ps, "e2", "e4")
+        nav.record_turn(ps.pieces)
+
+        boards = parse_game_save(nav.get_game_save())
+        assert len(boards) == 2
+        assert boards[1] == nav.get_curr_board()
+        # consecutive turns loaded from a save share pieces too
+        assert sum(a is b for a, b in zip(boards[0], boards[1])) == 31
@@ -0,0 +1,75 @@
+import random
+
+from rotating_chess.game import Game, random_script
+from rotating_chess.journal import Journal
+
+
+def play(tmp_path, actions, **kwargs) -> tuple[Game, Journal]:
+    """plays actions with a journal. 'crash' by syncing it and never closing it."""
+    game = Game()
+    journal = Journal(game, tmp_path, **kwargs)
+    journal.start()
+    for action in actions:
+        assert game.apply(action)
+    journal.sync()
+    return game, journal
+
+
+def recovered(tmp_path) -> Game:
+    game = Game()
+    assert Journal(game, tmp_path).recover()
+    return game
+
+
+class TestJournal:
+    def test_recovers_after_crash(self, tmp_path):
+        script = random_script(20, random.Random(1))
+        game, _ = play(tmp_path, script, compact_every=1000)
+        assert recovered(tmp_path).nav.get_game_save() == game.nav.get_game_save()
+
+    def test_compaction_keeps_everything(self, tmp_path):
+        script = random_script(20, random.Random(2))
+        game, _ = play(tmp_path, script, compact_every=7)
+        assert recovered(tmp_path).nav.get_game_save() == game.nav.get_game_save()
+        # the journal only has what came after the last compaction
+        lines = (tmp_path / "autosave.journal").read_text().splitlines()
+        assert len(lines) - 1 == len(script) % 7
+
+    def test_turns_are_flushed(self, tmp_path):
+        # no sync, but killing the process now still leaves the turn in the journal
+        game = Game()
+        Journal(game, tmp_path, fsync_every=1000, fsync_interval=1000).start()
+        assert game.apply(random_script(1, random.Random(4))[0])
+        assert recovered(tmp_path).nav.get_game_save() == game.nav.get_game_save()
+
+    def test_torn_line_is_ignored(self, tmp_path):
+        script = random_script(6, random.Random(3), rotate_chance=0)
+        game, _ = play(tmp_path, script, compact_every=1000)
+        with open(tmp_path / "autosave.journal", "a") as f:
+            f.write('[6,["m",3,')
+        assert recovered(tmp_path).nav.get_game_save() == game.nav.get_game_save()
+
+    def test_stale_journal_is_ignored(self, tmp_path):
+        # as if we crashed compacting, after the new base was written
+        script = random_script(6, random.Random(4), rotate_chance=0)
+        game, _ = play(tmp_path, script, compact_every=1000)
+        (tmp_path / "autosave.txt").write_text(game.nav.get_game_save())
+        assert recovered(tmp_path).nav.get_game_save() == game.nav.get_game_save()
+
+    def test_variations(self, tmp_path):
+        script = random_script(6, random.Random(5), rotate_chance=0)
+        game, journal = play(tmp_path, script, compact_every=1000)
+        # go back a turn and play something else
+        game.nav.go_to(len(script) - 1)
+        game.sync()
+        move = game.random_move(random.Random(6))
+        assert move is not None and game.apply(move)
+        journal.sync()
+
+        restored = recovered(tmp_path)
+        assert restored.nav.get_game_save() == game.nav.get_game_save()
+        # the old line is still there
+        assert restored.nav.variation_count() == 2
+
+    def test_nothing_to_recover(self, tmp_path):
+        assert not Journal(Game(), tmp_path).recover()
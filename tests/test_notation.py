@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from rotating_chess import fixed
+from rotating_chess.locations import at
+from rotating_chess.notation import (
+    encode_position,
+    is_position,
+    parse_piece,
+    parse_position,
+)
+from rotating_chess.pieces import Side
+from rotating_chess.plies import start_board
+from rotating_chess.saveio import import_save
+from tests.conftest import played
+
+
+def snapped(board) -> tuple:
+    return tuple(fixed.snap_state(state) for state in board)
+
+
+class TestNotation:
+    def test_start_board(self):
+        text = encode_position(start_board())
+        assert text.startswith("pa7 Pa2 pb7 Pb2")
+        assert "+" not in text and "@" not in text
+        assert parse_position(text) == start_board()
+
+    def test_round_trip(self):
+        for seed in range(5):
+            for board in played(40, seed).nav.get_line_boards():
+                board = snapped(board)
+                assert parse_position(encode_position(board)) == board
+
+    def test_anchors_match_locations(self):
+        for anchor in ["a1", "h8", "e4", "a1/b2", "d4/e5/f6"]:
+            state = parse_piece(f"Q{anchor}")
+            assert (state.x, state.y) == tuple(at(anchor))
+
+    def test_pieces(self):
+        state = parse_piece("nb8-10+0@-90")
+        assert (state.x, state.y) == (65.0, 25.0)
+        assert state.side == Side.BLACK and state.piece_name == "knight"
+        assert state.angle == fixed.snap_angle(math.radians(-90))
+        assert parse_piece("Kc3").angle == 0
+        assert parse_piece("kc3").angle == math.pi
+
+    @pytest.mark.parametrize("text", ["xa1", "Ka", "Ka1+3", "Ka1@", "ka1 +1+1"])
+    def test_invalid(self, text):
+        assert not is_position(text)
+        with pytest.raises(ValueError):
+            parse_position(text)
+
+    def test_import(self):
+        save = played(10, 0).nav.get_game_save()
+        assert not is_position(save) and not is_position("")
+
+        task = import_save(lambda: "Ke1 Qd4@45 ke8 pe7")
+        task.join()
+        assert task.succeeded()
+        assert task.result == [parse_position("Ke1 Qd4@45 ke8 pe7")]
@@ -0,0 +1,41 @@
+import pytest
+
+from rotating_chess import perft, settings
+
+
+class TestPerft:
+    def test_normal_board(self):
+        board = perft.start_board()
+        assert perft.perft(board, 1, angles=0) == 34
+        assert perft.perft(board, 2, angles=0) == 1156
+
+    def test_rotations(self):
+        board = perft.start_board()
+        # white's pieces face straight ahead, so one angle is no rotation at all
+        assert perft.perft(board, 1, angles=1) == 34
+        assert perft.perft(board, 1, angles=4) == 34 * 4
+        counts = perft.divide(board, 1, angles=4)
+        assert len(counts) == 34 * 4
+        assert all(name.split("@")[0] in counts for name in counts)
+
+    def test_960_seed(self):
+        assert perft.start_board(3) == perft.start_board(3)
+        assert perft.start_board(3) != perft.start_board()
+
+    def test_fixed_point_matches(self):
+        board = perft.start_board(3)
+        assert perft.check(board, 2, 2, "fixed") == []
+        assert not settings.FIXED_POINT
+
+    def test_numpy_matches(self):
+        pytest.importorskip("numpy")
+        for seed in (None, 3, 7):
+            assert perft.check(perft.start_board(seed), 2, 2, "numpy") == []
+
+    def test_mismatches(self):
+        assert perft.mismatches(
+            {"0/0": 3, "1/0": 2}, {"0/0": 3, "1/0": 1, "2/0": 1}
+        ) == [
+            ("1/0", 2, 1),
+            ("2/0", None, 1),
+        ]
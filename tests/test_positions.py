@@ -0,0 +1,48 @@
+import math
+
+from rotating_chess.positions import PositionIndex
+from tests.conftest import played
+
+
+def line(plies: int, seed: int) -> list:
+    return played(plies, seed, rotate_chance=0).nav.get_line_boards()
+
+
+class TestPositionIndex:
+    def test_exact_and_near(self, tmp_path):
+        games = [line(6, seed) for seed in range(3)]
+        index = PositionIndex(tmp_path / "p.db")
+        assert index.ingest((f"g{i}", boards) for i, boards in enumerate(games)) == sum(
+            map(len, games)
+        )
+
+        # every game starts from the normal board
+        assert [(s, t) for s, _, t in index.find(games[0][0])] == [
+            ("g0", 0),
+            ("g1", 0),
+            ("g2", 0),
+        ]
+        assert ("g1", 4) in [(s, t) for s, _, t in index.find(games[1][4])]
+
+        # nudged a little: not the exact position any more, but near it
+        last = games[2][-1]
+        nudged = (last[0]._replace(x=last[0].x + 10, angle=last[0].angle + 0.2),)
+        nudged += last[1:]
+        assert ("g2", len(games[2]) - 1) not in [
+            (s, t) for s, _, t in index.find(nudged)
+        ]
+        assert ("g2", len(games[2]) - 1) in [
+            (s, t) for s, _, t in index.find(nudged, near=True)
+        ]
+        index.close()
+
+    def test_persists(self, tmp_path):
+        index = PositionIndex(tmp_path / "p.db")
+        index.ingest([("g", line(2, 0))])
+        index.close()
+        index = PositionIndex(tmp_path / "p.db")
+        assert len(index) == 3
+        # turned around: nowhere near anything indexed
+        board = tuple(s._replace(angle=s.angle + math.pi) for s in line(0, 0)[0])
+        assert index.find(board, near=True) == []
+        index.close()
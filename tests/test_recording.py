@@ -0,0 +1,65 @@
+import gzip
+
+import pygame
+import pytest
+from pygame.event import Event
+
+from rotating_chess import headless, recording
+from rotating_chess.widgets import MOUSE_HELD
+from tests.conftest import click
+
+# e2-e4, then the queen selected and its rotation selector dragged a bit
+SCRIPT = [
+    (click(225, 325), (225, 325)),
+    ([], (0, 0)),
+    ([], (0, 0)),
+    (click(225, 225), (225, 225)),
+    (click(175, 375), (175, 375)),
+    (click(500, 140), (500, 140)),
+    ([Event(MOUSE_HELD)], (560, 200)),
+    ([Event(pygame.MOUSEBUTTONUP, pos=(560, 200), button=1)], (560, 200)),
+    ([], (560, 200)),
+]
+
+
+class TestRecording:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "session.rec.gz"
+        with recording.Recorder(path) as recorder:
+            for events, (x, y) in SCRIPT:
+                recorder.record(events, x, y)
+        assert recorder.frames == len(SCRIPT)
+
+        frames = list(recording.read_frames(path))
+        assert len(frames) == len(SCRIPT)
+        for (events, pos), (recorded, recorded_pos) in zip(SCRIPT, frames):
+            assert [(e.type, e.dict) for e in events] == [
+                (e.type, e.dict) for e in recorded
+            ]
+            if events:
+                assert pos == recorded_pos
+
+    def test_replay_matches(self, screen, tmp_path):
+        live = headless.game_state()
+        path = tmp_path / "session.rec.gz"
+        with recording.Recorder(path) as recorder:
+            for events, (x, y) in SCRIPT:
+                recorder.record(events, x, y)
+                headless.run_frame(screen, live, events, x, y)
+
+        timer = headless.FrameTimer()
+        replayed = recording.replay(path, screen, timer=timer)
+        assert len(replayed.nav) == len(live.nav) == 2
+        assert replayed.nav.get_curr_board() == live.nav.get_curr_board()
+        queen = replayed.widgets.pieces.selected_pieces[0]
+        assert queen.get_angle() == live.widgets.pieces.selected_pieces[0].get_angle()
+        assert len(timer.frames) == len(SCRIPT)
+        assert len(timer.events["MouseButtonDown"]) == 4
+        assert "MouseHeld" in timer.report()
+
+    def test_unknown_format(self, tmp_path):
+        path = tmp_path / "session.rec.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"format": 99}\n')
+        with pytest.raises(ValueError):
+            list(recording.read_frames(path))
@@ -0,0 +1,74 @@
+import random
+
+from rotating_chess.compressjson import json_compress, json_decompress
+from rotating_chess.game import Game
+from rotating_chess.history import parse_game_save
+from rotating_chess import compressjson, history, saveio
+from rotating_chess.saveio import export_save, import_save, import_save_file
+from tests.conftest import played
+
+
+class TestSaveIO:
+    def test_export_then_import(self, tmp_path):
+        game = played(10, 0)
+        done = []
+        task = export_save(game.nav.get_line_boards(), tmp_path / "s.txt", done.append)
+        task.join()
+        assert task.succeeded() and done == [task] and task.progress == 1.0
+        assert (tmp_path / "s.txt").read_text() == game.nav.get_game_save()
+
+        task = import_save((tmp_path / "s.txt").read_text)
+        task.join()
+        assert task.succeeded()
+        other = Game()
+        other.nav.load_boards(task.result)
+        assert other.nav.get_game_save() == game.nav.get_game_save()
+
+    def test_export_is_a_snapshot(self, tmp_path):
+        # turns recorded after the export starts don't end up in it
+        game = played(4, 1)
+        before = game.nav.get_game_save()
+        task = export_save(game.nav.get_line_boards(), tmp_path / "s.txt")
+        game.apply(game.random_move(random.Random(2)))
+        task.join()
+        assert task.result == before
+
+    def test_invalid_import(self):
+        progress = []
+        task = import_save(lambda: "not a save", lambda t: progress.append(t.progress))
+        task.join()
+        assert task.done and not task.succeeded() and task.error is not None
+        assert progress == [0.0]
+
+    def test_import_any_key_order(self):
+        game = played(4, 3)
+        boards = game.nav.get_line_boards()
+        reordered = json_compress(
+            {
+                "save": json_decompress(game.nav.get_game_save())["save"],
+                "save_version": "1.0.0",
+            }
+        )
+        assert parse_game_save(reordered) == boards
+
+    def test_import_file_in_chunks(self, tmp_path, monkeypatch):
+        game = played(30, 4)
+        path = tmp_path / "s.txt"
+        # wrapped like some tools do, and read a few bytes at a time
+        save = game.nav.get_game_save()
+        path.write_text("\n".join(save[i : i + 76] for i in range(0, len(save), 76)))
+        monkeypatch.setattr(history, "READ_CHUNK", 7)
+        monkeypatch.setattr(saveio, "READ_CHUNK", 7)
+        monkeypatch.setattr(compressjson, "INFLATE_CHUNK", 13)
+
+        task = import_save_file(path)
+        task.join()
+        assert task.succeeded()
+        assert task.result == game.nav.get_line_boards()
+
+    def test_truncated_file(self, tmp_path):
+        save = played(10, 5).nav.get_game_save()
+        (tmp_path / "s.txt").write_text(save[: len(save) // 2])
+        task = import_save_file(tmp_path / "s.txt")
+        task.join()
+        assert task.done and not task.succeeded()
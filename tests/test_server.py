@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import pytest
+
+from rotating_chess.client import GameClient
+from rotating_chess.game import Game
+from rotating_chess.locations import at
+from rotating_chess.pieces import Side
+from rotating_chess.server import GameServer, encode
+
+
+async def settle(*clients: GameClient) -> None:
+    """gives the server and clients a moment, then applies what arrived"""
+    for _ in range(20):
+        await asyncio.sleep(0.005)
+        for client in clients:
+            client.poll()
+
+
+async def start() -> tuple[GameServer, asyncio.Server, int]:
+    server = GameServer()
+    listener = await server.start("127.0.0.1", 0)
+    return server, listener, listener.sockets[0].getsockname()[1]
+
+
+class TestServer:
+    def test_moves_are_broadcast(self):
+        async def run():
+            server, listener, port = await start()
+            white, black = Game(), Game()
+            w = await GameClient.connect("127.0.0.1", port)
+            b = await GameClient.connect("127.0.0.1", port)
+            await w.join(white, "g", Side.WHITE)
+            await b.join(black, "g", Side.BLACK)
+
+            assert white.move(white.find(*at("e2")), *at("e4"))
+            await settle(w, b)
+            assert black.move(black.find(*at("e7")), *at("e5"))
+            await settle(w, b)
+
+            assert len(white.nav) == len(black.nav) == 3
+            assert white.nav.get_curr_board() == black.nav.get_curr_board()
+            assert server.games["g"].game.nav.get_curr_board() == (
+                white.nav.get_curr_board()
+            )
+            await w.close()
+            await b.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_wrong_side_is_rejected_and_resynced(self):
+        async def run():
+            server, listener, port = await start()
+            black = Game()
+            b = await GameClient.connect("127.0.0.1", port)
+            await b.join(black, "g", Side.BLACK)
+
+            # black tries to move a white pawn. it's applied locally, then undone
+            assert black.move(black.find(*at("e2")), *at("e4"))
+            await settle(b)
+
+            assert b.rejections == 1
+            assert len(black.nav) == 1
+            assert len(server.games["g"].game.nav) == 1
+            await b.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_rotating_wrong_side_is_rejected(self):
+        async def run():
+            server, listener, port = await start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(encode({"op": "join", "game": "g", "side": Side.WHITE.value}))
+            assert json.loads(await reader.readline())["op"] == "welcome"
+
+            game = server.games["g"].game
+            rook, knight = game.find(*at("h1")), game.find(*at("g8"))
+            action = ["r", [[rook, 1.0], [knight, 1.0]]]
+            writer.write(encode({"op": "act", "turn": 0, "action": action}))
+            reply = json.loads(await reader.readline())
+            assert reply == {"op": "reject", "reason": "not your piece"}
+            assert len(game.nav) == 1
+
+            writer.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_non_finite_angle_is_rejected(self):
+        async def run():
+            server, listener, port = await start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(encode({"op": "join", "game": "g", "side": Side.WHITE.value}))
+            assert json.loads(await reader.readline())["op"] == "welcome"
+
+            game = server.games["g"].game
+            board = game.nav.get_curr_board()
+            action = ["r", [[game.find(*at("a1")), float("inf")]]]
+            writer.write(encode({"op": "act", "turn": 0, "action": action}))
+            assert json.loads(await reader.readline())["op"] == "reject"
+            assert tuple(p.to_state() for p in game.pieces.pieces) == board
+
+            writer.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_turns_and_sides_are_enforced(self):
+        async def run():
+            server, listener, port = await start()
+            white, black, other = Game(), Game(), Game()
+            w = await GameClient.connect("127.0.0.1", port)
+            b = await GameClient.connect("127.0.0.1", port)
+            o = await GameClient.connect("127.0.0.1", port)
+            await w.join(white, "g", Side.WHITE)
+            await b.join(black, "g", Side.BLACK)
+            with pytest.raises(RuntimeError, match="white is taken"):
+                await o.join(other, "g", Side.WHITE)
+            await o.join(other, "g", None)
+
+            # black can't go first, nor rotate after white's move
+            assert black.move(black.find(*at("e7")), *at("e5"))
+            await settle(w, b)
+            assert white.move(white.find(*at("e2")), *at("e4"))
+            await settle(w, b)
+            assert black.rotate(((black.find(*at("e7")), 1.0),))
+            await settle(w, b)
+            # nor can a player without a side do anything
+            assert other.move(other.find(*at("e7")), *at("e5"))
+            await settle(w, b, o)
+
+            assert (b.rejections, o.rejections) == (2, 1)
+            # white may still rotate after moving
+            assert white.rotate(((white.find(*at("e4")), 1.0),))
+            await settle(w, b, o)
+            assert len(server.games["g"].game.nav) == 3
+            assert black.nav.get_curr_board() == white.nav.get_curr_board()
+            for client in (w, b, o):
+                await client.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_illegal_action_is_rejected(self):
+        async def run():
+            server, listener, port = await start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(encode({"op": "join", "game": "g", "side": Side.WHITE.value}))
+            assert json.loads(await reader.readline())["op"] == "welcome"
+
+            rook = server.games["g"].game.find(*at("h1"))
+            h5 = list(at("h5"))
+            writer.write(encode({"op": "act", "turn": 0, "action": ["m", rook, *h5]}))
+            reply = json.loads(await reader.readline())
+            assert reply == {"op": "reject", "reason": "illegal move"}
+
+            writer.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_invalid_save_raises(self):
+        async def run():
+            async def handle(reader, writer):
+                await reader.readline()
+                writer.write(encode({"op": "welcome", "turn": 0, "save": "nope"}))
+
+            listener = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            client = await GameClient.connect("127.0.0.1", port)
+            with pytest.raises(RuntimeError, match="invalid save"):
+                await client.join(Game(), "g", Side.WHITE)
+            await client.close()
+            listener.close()
+
+        asyncio.run(run())
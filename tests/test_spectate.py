@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+from rotating_chess.client import GameClient
+from rotating_chess.game import Game
+from rotating_chess.locations import at
+from rotating_chess.pieces import Side
+from rotating_chess.spectate import SpectatorChannel
+from tests.test_server import start, settle
+
+
+def e4_e5(game: Game) -> None:
+    assert game.move(game.find(*at("e2")), *at("e4"))
+    assert game.move(game.find(*at("e7")), *at("e5"))
+
+
+class TestChannel:
+    def test_new_subscribers_get_a_snapshot(self):
+        game = Game()
+        channel = SpectatorChannel(game.nav)
+        sub = channel.subscribe()
+        channel.flush()
+        msg = json.loads(sub.get_nowait())
+        assert msg["op"] == "welcome" and msg["turn"] == 0
+        assert sub.get_nowait() is None
+
+    def test_resync(self):
+        game = Game()
+        channel = SpectatorChannel(game.nav)
+        sub = channel.subscribe()
+        channel.flush()
+        sub.get_nowait()
+
+        channel.resync(sub)
+        channel.flush()
+        assert json.loads(sub.get_nowait())["op"] == "welcome"
+        assert sub.resyncs == 0  # asked for, not fallen behind
+
+    def test_turns_are_batched(self):
+        game = Game()
+        channel = SpectatorChannel(game.nav)
+        sub = channel.subscribe()
+        channel.flush()
+        sub.get_nowait()
+
+        e4_e5(game)
+        assert sub.depth() == 0  # nothing is sent until we flush
+        channel.flush()
+        batch = json.loads(sub.get_nowait())
+        assert batch["op"] == "deltas"
+        assert batch["turn"] == 1
+        assert len(batch["actions"]) == 2
+
+    def test_slow_subscriber_is_resynced(self):
+        game = Game()
+        channel = SpectatorChannel(game.nav, max_queue=2)
+        slow, fast = channel.subscribe(), channel.subscribe()
+        channel.flush()
+        for _ in range(3):
+            e4_e5(game)
+            game.nav.first()
+            game.sync()
+            channel.flush()
+            while fast.get_nowait() is not None:
+                pass
+
+        assert channel.depths()["resyncs"] == 1
+        assert slow.depth() == 2  # the snapshot, then one more batch
+        assert json.loads(slow.get_nowait())["op"] == "welcome"
+        assert fast.resyncs == 0
+
+
+class TestSpectating:
+    def test_spectator_follows_game(self):
+        async def run():
+            server, listener, port = await start()
+            player, opponent, watched = Game(), Game(), Game()
+            p = await GameClient.connect("127.0.0.1", port)
+            o = await GameClient.connect("127.0.0.1", port)
+            w = await GameClient.connect("127.0.0.1", port)
+            await p.join(player, "g", Side.WHITE)
+            await o.join(opponent, "g", Side.BLACK)
+            assert player.move(player.find(*at("e2")), *at("e4"))
+            await settle(p, o)
+            assert opponent.move(opponent.find(*at("e7")), *at("e5"))
+            await settle(p, o)
+
+            await w.watch(watched, "g")
+            assert len(watched.nav) == 3
+            assert player.move(player.find(*at("g1")), *at("f3"))
+            await asyncio.sleep(0.2)  # longer than the batching interval
+            await settle(p, w)
+
+            assert watched.nav.get_curr_board() == player.nav.get_curr_board()
+            await p.close()
+            await o.close()
+            await w.close()
+            listener.close()
+
+        asyncio.run(run())
+
+    def test_spectator_moves_stay_local(self):
+        async def run():
+            server, listener, port = await start()
+            player, watched = Game(), Game()
+            p = await GameClient.connect("127.0.0.1", port)
+            w = await GameClient.connect("127.0.0.1", port)
+            await p.join(player, "g", Side.WHITE)
+            await w.watch(watched, "g")
+
+            # nothing is sent, so nothing is rejected
+            e4_e5(watched)
+            await settle(p, w)
+            assert w.rejections == 0
+            assert len(server.games["g"].game.nav) == 1
+
+            # the next batch doesn't fit, so the spectator asks for a snapshot
+            assert player.move(player.find(*at("g1")), *at("f3"))
+            await asyncio.sleep(0.2)  # longer than the batching interval
+            await settle(p, w)
+            await asyncio.sleep(0.2)
+            await settle(p, w)
+
+            assert w.rejections == 0
+            assert watched.nav.get_curr_board() == player.nav.get_curr_board()
+            await p.close()
+            await w.close()
+            listener.close()
+
+        asyncio.run(run())
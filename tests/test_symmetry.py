@@ -0,0 +1,66 @@
+import math
+import random
+
+import pytest
+
+from rotating_chess import zobrist
+from rotating_chess.game import Game, random_script
+from rotating_chess.symmetry import (
+    Symmetry,
+    canonical,
+    canonical_board,
+    canonical_key,
+    transform,
+    transform_action,
+)
+from tests.conftest import played
+
+
+class TestCanonical:
+    def test_same_for_every_symmetry(self):
+        for board in played(30, 0).nav.get_line_boards():
+            keys = {canonical_key(transform(board, s)) for s in Symmetry}
+            assert keys == {canonical_key(board)}
+            canon = canonical_board(board)
+            assert all(canonical_board(transform(board, s)) == canon for s in Symmetry)
+
+    def test_symmetry_takes_it_to_canonical_form(self):
+        board = played(20, 1).nav.get_curr_board()
+        key, symmetry = canonical(board)
+        assert zobrist.board_hash(transform(board, symmetry)) == key
+
+    def test_without_flip(self):
+        board = played(20, 2).nav.get_curr_board()
+        assert canonical_key(board, flip=False) == canonical_key(
+            transform(board, Symmetry.MIRROR), flip=False
+        )
+        assert canonical(board, flip=False)[1] in (Symmetry.IDENTITY, Symmetry.MIRROR)
+
+    def test_different_positions(self):
+        boards = played(30, 3).nav.get_line_boards()
+        assert len({canonical_key(b) for b in boards}) == len(set(boards))
+
+
+class TestTransform:
+    def test_involution(self):
+        board = played(20, 4).nav.get_curr_board()
+        for s in Symmetry:
+            back = transform(transform(board, s), s)
+            for a, b in zip(board, back):
+                assert a.x == pytest.approx(b.x) and a.y == pytest.approx(b.y)
+                assert math.remainder(a.angle - b.angle, 2 * math.pi) == pytest.approx(
+                    0, abs=1e-9
+                )
+
+    @pytest.mark.parametrize("symmetry", list(Symmetry))
+    def test_transformed_games_play_the_same(self, symmetry):
+        script = random_script(30, random.Random(5))
+        game, mirrored = Game(), Game()
+        mirrored.nav.load_boards([transform(game.nav.get_curr_board(), symmetry)])
+        mirrored.sync()
+        for action in script:
+            assert game.apply(action)
+            assert mirrored.apply(transform_action(action, symmetry))
+            assert canonical_key(game.nav.get_curr_board()) == canonical_key(
+                mirrored.nav.get_curr_board()
+            )
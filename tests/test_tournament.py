@@ -0,0 +1,78 @@
+import pytest
+
+from rotating_chess.history import parse_game_save
+from rotating_chess.plies import start_board
+from rotating_chess.tournament import (
+    Job,
+    Result,
+    Sprt,
+    Standings,
+    Variant,
+    llr,
+    play_game,
+    run_tournament,
+)
+
+FAST = Variant("fast", depth=1)
+
+
+class TestVariant:
+    def test_parse(self):
+        variant = Variant.parse("deep:depth=3,centre=0.2")
+        assert variant.name == "deep" and variant.depth == 3
+        assert variant.weights.centre == 0.2 and variant.weights.queen == 9.0
+        assert Variant.parse("base") == Variant("base")
+
+    def test_unknown_setting(self):
+        with pytest.raises(ValueError):
+            Variant.parse("x:speed=2")
+        with pytest.raises(ValueError):
+            Variant.parse(":depth=2")
+
+
+class TestPlayGame:
+    def test_writes_a_save(self, tmp_path):
+        job = Job(3, FAST, FAST._replace(name="other"), 0, 4, tmp_path)
+        result = play_game(job)
+        assert result.plies == 4 and result.reason == "max plies"
+        assert result.score == 0.5
+        boards = parse_game_save(
+            (tmp_path / "rotchess_save_3_fast_other.txt").read_text()
+        )
+        assert boards[0] == start_board(3) and len(boards) == 5
+
+
+class TestSprt:
+    def test_llr(self):
+        assert llr(0, 0, 0, 0, 50) == 0
+        # all draws says nothing either way
+        assert llr(0, 10, 0, 0, 50) == 0
+        assert llr(600, 200, 200, 0, 50) > llr(60, 20, 20, 0, 50) > 0
+
+    def test_decide(self):
+        sprt = Sprt(0, 50)
+        assert sprt.decide(10, 10, 10) is None
+        assert sprt.decide(300, 100, 100) == "H1"
+        assert sprt.decide(100, 100, 300) == "H0"
+
+
+class TestTournament:
+    def test_standings(self):
+        standings = Standings()
+        standings.add(Result(0, "a", "b", 1.0, 10, "king taken", 1.0))
+        standings.add(Result(0, "b", "a", 0.5, 10, "max plies", 1.0))
+        assert standings.wdl("a", "b") == (1, 1, 0)
+        assert standings.wdl("b", "a") == (0, 1, 1)
+
+    def test_both_ways_round(self, tmp_path):
+        other = FAST._replace(name="other")
+        standings, decision = run_tournament(
+            [FAST, other], range(2), max_plies=2, output=tmp_path, workers=1
+        )
+        assert decision is None
+        assert sum(standings.wdl("fast", "other")) == 4
+        assert len(list(tmp_path.glob("rotchess_save_*.txt"))) == 4
+
+    def test_sprt_needs_two(self):
+        with pytest.raises(ValueError):
+            run_tournament([FAST], range(1), workers=1, sprt=Sprt(0, 50))
@@ -0,0 +1,73 @@
+import math
+import random
+
+from rotating_chess import zobrist
+from rotating_chess.game import Game, random_script
+from rotating_chess.locations import at
+from rotating_chess.pieces import PieceState, Side
+
+
+def from_scratch(game: Game) -> int:
+    return zobrist.board_hash(game.nav.get_curr_board())
+
+
+class TestIncremental:
+    def test_matches_from_scratch(self):
+        for seed in range(3):
+            game = Game()
+            for action in random_script(60, random.Random(seed)):
+                assert game.apply(action)
+                assert game.pieces.zobrist() == from_scratch(game)
+                assert game.nav.get_zobrist() == from_scratch(game)
+
+    def test_loaded_turns(self):
+        game = Game()
+        for action in random_script(30, random.Random(4)):
+            game.apply(action)
+        loaded = Game()
+        assert loaded.load_game_save(game.nav.get_game_save())
+        assert loaded.pieces.zobrist() == game.pieces.zobrist()
+        for turn in range(len(loaded.nav)):
+            assert loaded.nav.get_zobrist(
+                loaded.nav.get_node_at(turn)
+            ) == zobrist.board_hash(loaded.nav.get_board(turn))
+
+    def test_order_doesnt_matter(self):
+        board = Game().nav.get_curr_board()
+        assert zobrist.board_hash(board) == zobrist.board_hash(board[::-1])
+
+    def test_pieces_trading_places(self):
+        # same squares and same pieces, just not on the same squares
+        board = Game().nav.get_curr_board()
+        swapped = tuple(
+            s._replace(x=400 - s.x) if s.piece_name in ("king", "queen") else s
+            for s in board
+        )
+        assert zobrist.board_hash(board) != zobrist.board_hash(swapped)
+
+    def test_any_field_trading_places(self):
+        # hashing each field on its own would make every one of these collide
+        rook = PieceState(*at("a1"), math.pi / 3, Side.WHITE, "rook")
+        knight = PieceState(*at("c6"), 0, Side.BLACK, "knight")
+        for field in ["x", "y", "angle", "side", "piece_name"]:
+            a, b = getattr(rook, field), getattr(knight, field)
+            traded = (rook._replace(**{field: b}), knight._replace(**{field: a}))
+            assert zobrist.board_hash((rook, knight)) != zobrist.board_hash(traded)
+
+
+class TestRepetition:
+    def test_knights_out_and_back(self):
+        g = Game()
+        for start, end in [("b1", "c3"), ("b8", "c6"), ("c3", "b1"), ("c6", "b8")]:
+            assert g.nav.repetitions() == 0
+            assert g.move(g.find(*at(start)), *at(end))
+        assert g.nav.repetitions() == 1
+        assert g.nav.get_zobrist() == g.nav.get_zobrist(g.nav.get_node_at(0))
+
+    def test_rotation_back(self):
+        g = Game()
+        rook = g.find(*at("a1"))
+        assert g.rotate(((rook, math.pi / 3),))
+        assert g.nav.repetitions() == 0
+        assert g.rotate(((rook, 0),))
+        assert g.nav.repetitions() == 1